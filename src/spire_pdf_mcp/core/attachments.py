@@ -1,14 +1,85 @@
+import datetime
+import fnmatch
+import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from spire.pdf import *
 
+from spire_pdf_mcp.core.documentcache import cached_document, load_document, save_document
 from spire_pdf_mcp.utils.exceptions import AttachmentsError
 from spire_pdf_mcp.utils.utils import *
 logger = logging.getLogger(__name__)
 
 
+def deleteallattachments_doc(doc: PdfDocument, options: Dict[str, Any] = None) -> None:
+    """Remove all attachments from a loaded document"""
+    doc.Attachments.Clear()
+
+def _name_patterns(names: Union[str, List[str], None]) -> Optional[List[str]]:
+    if names is None:
+        return None
+    return [names] if isinstance(names, str) else [str(name) for name in names]
+
+def _matches(name: str, patterns: Optional[List[str]]) -> bool:
+    """Whether an attachment name is selected by exact names or glob patterns (None selects all)"""
+    return patterns is None or any(name == p or fnmatch.fnmatchcase(name, p) for p in patterns)
+
+def _iso_date(value: Optional[DateTime]) -> Optional[str]:
+    if value is None:
+        return None
+    try:
+        return datetime.datetime(value.Year, value.Month, value.Day,
+                                 value.Hour, value.Minute, value.Second).isoformat()
+    except ValueError:
+        return None
+
+def attachment_info(attachment: PdfAttachment) -> Dict[str, Any]:
+    """Name, size in bytes, MIME type, description and dates of an attachment"""
+    data = attachment.Data
+    return {
+        "name": attachment.FileName,
+        "size": data.Length if data is not None else 0,
+        "mime_type": attachment.MimeType or None,
+        "description": attachment.Description or None,
+        "created": _iso_date(attachment.CreationDate),
+        "modified": _iso_date(attachment.ModificationDate)
+    }
+
+def read_attachments(filepath: str) -> List[Dict[str, Any]]:
+    """The document-level attachments of a Pdf file (see attachment_info)"""
+    # Borrow the parsed pdf document from the shared cache (read-only)
+    with cached_document(filepath) as doc:
+        attachments = doc.Attachments
+        return [attachment_info(attachments.get_Item(i)) for i in range(attachments.Count)]
+
+def deleteattachments_doc(doc: PdfDocument, names: Union[str, List[str]],
+                          options: Dict[str, Any] = None) -> List[str]:
+    """
+    Remove the attachments of a loaded document whose name is one of names
+    or matches one of them as a glob pattern (e.g. "*.xlsx").
+
+    Returns:
+        Names of the removed attachments
+
+    Raises:
+        ValueError: If no attachment matches
+    """
+    patterns = _name_patterns(names)
+    if not patterns:
+        raise ValueError("No attachment names given")
+    attachments = doc.Attachments
+    removed = []
+    # Walk backwards so removals do not shift the attachments still to visit
+    for i in reversed(range(attachments.Count)):
+        name = attachments.get_Item(i).FileName
+        if _matches(name, patterns):
+            attachments.RemoveAt(i)
+            removed.append(name)
+    if not removed:
+        raise ValueError(f"No attachment matches {', '.join(patterns)}")
+    return removed[::-1]
     
 def deleteallattachments (filepath: str,options: Dict[str, Any] = None) -> Dict[str, Any]:
     """Delete all attachments in PDF document"""
@@ -22,21 +93,148 @@ def deleteallattachments (filepath: str,options: Dict[str, Any] = None) -> Dict[
         deleteallattachments_output_path = os.path.join(output_dir, f"{base_name}-deleteallattachments.pdf")
         
         #Open pdf document
-        doc = PdfDocument()
-        doc.LoadFromFile(filepath)
-        #Get all attachments
-        attachments = doc.Attachments
-        #Delete all attachments
-        attachments.Clear()
-        #Save pdf document
-        doc.SaveToFile(deleteallattachments_output_path)
-        doc.Close()    
+        doc = load_document(filepath)
+        try:
+            #Delete all attachments
+            deleteallattachments_doc(doc, options)
+            #Save pdf document
+            save_document(doc, deleteallattachments_output_path)
+        finally:
+            doc.Close()
             
         return {
             "message": f"Delete all attachments to file: {deleteallattachments_output_path}"
         }
     except Exception as e:
         logger.error(f"Failed to Delete all attachments in PDF document: {e}")
-        raise AttachmentsError(f"Failed to Delete all attachments in PDF document: {e!s}")    
-    
- 
\ No newline at end of file
+        raise AttachmentsError(f"Failed to Delete all attachments in PDF document: {e!s}")
+
+def listattachments(filepath: str, options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """List the attachments in PDF document as JSON
+
+    Each attachment is a {"name", "size", "mime_type", "description",
+    "created", "modified"} object; options.names limits the list to some
+    names or glob patterns.
+    """
+    options = options or {}
+    try:
+        patterns = _name_patterns(options.get("names"))
+        attachments = [a for a in read_attachments(filepath) if _matches(a["name"], patterns)]
+        return {
+            "message": json.dumps(attachments, ensure_ascii=False, indent=2),
+            "attachments": attachments,
+            "total_size": sum(a["size"] for a in attachments)
+        }
+    except Exception as e:
+        logger.error(f"Failed to list attachments in PDF document: {e}")
+        raise AttachmentsError(f"Failed to list attachments in PDF document: {e!s}")
+
+def _unique_path(directory: str, name: str, taken: set) -> str:
+    stem, suffix = os.path.splitext(safe_file_name(name))
+    candidate, n = stem + suffix, 1
+    while candidate.lower() in taken:
+        n += 1
+        candidate = f"{stem}-{n}{suffix}"
+    taken.add(candidate.lower())
+    return os.path.join(directory, candidate)
+
+def extractattachments(filepath: str, options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Save the attachments in PDF document to files.
+
+    Attachments are written one at a time by the native library straight
+    from the embedded stream to disk, so only one of them is held in memory
+    and nothing is copied through Python. An attachment that would take the
+    total past the size cap is skipped; later ones are still extracted if
+    they fit.
+
+    Args:
+        filepath: Path to the PDF file
+        options:
+            names: Attachment names or glob patterns to extract (default: all)
+            output_dir: Directory for the files, relative to the PDF
+                (default: <name>-attachments)
+            max_total_mb: Cap on the total size extracted (default: 1024)
+
+    Returns:
+        Dictionary containing the operation result
+    """
+    options = options or {}
+    try:
+        patterns = _name_patterns(options.get("names"))
+        max_total = float(options.get("max_total_mb", 1024)) * 1024 * 1024
+        save_path = Path(filepath)
+        base_name = save_path.stem
+        output_dir = os.path.join(os.path.dirname(filepath), options.get("output_dir") or f"{base_name}-attachments")
+        os.makedirs(output_dir, exist_ok=True)
+
+        extracted, skipped, taken = [], [], set()
+        total = 0
+        with cached_document(filepath) as doc:
+            attachments = doc.Attachments
+            for i in range(attachments.Count):
+                attachment = attachments.get_Item(i)
+                name = attachment.FileName
+                if not _matches(name, patterns):
+                    continue
+                data = attachment.Data
+                size = data.Length if data is not None else 0
+                if total + size > max_total:
+                    skipped.append({"name": name, "size": size, "reason": "over the size cap"})
+                    continue
+                path = _unique_path(output_dir, name, taken)
+                # Write under a temporary name so a failure leaves no partial file
+                partial = path + ".part"
+                try:
+                    if data is not None:
+                        data.Save(partial)
+                    else:
+                        open(partial, "wb").close()
+                    os.replace(partial, path)
+                finally:
+                    if os.path.exists(partial):
+                        os.remove(partial)
+                total += size
+                extracted.append({"name": name, "size": size, "file": path})
+        if patterns is not None and not extracted and not skipped:
+            raise ValueError(f"No attachment matches {', '.join(patterns)}")
+
+        lines = [f"- {e['name']} -> {os.path.basename(e['file'])} ({e['size']} bytes)" for e in extracted]
+        lines += [f"- {s['name']}: skipped, {s['size']} bytes {s['reason']}" for s in skipped]
+        return {
+            "message": (f"Extracted {len(extracted)} attachments ({total} bytes) to: {output_dir}"
+                        + (f" ({len(skipped)} skipped)" if skipped else "") + "\n" + "\n".join(lines)).rstrip(),
+            "output_path": output_dir,
+            "extracted": extracted,
+            "skipped": skipped
+        }
+    except Exception as e:
+        logger.error(f"Failed to extract attachments in PDF document: {e}")
+        raise AttachmentsError(f"Failed to extract attachments in PDF document: {e!s}")
+
+def deleteattachments(filepath: str, names: Union[str, List[str]],
+                      options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Delete the attachments with the given names or glob patterns in PDF document"""
+    try:
+        output_dir = os.path.dirname(filepath)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        save_path = Path(filepath)
+        base_name = save_path.stem
+        deleteattachments_output_path = os.path.join(output_dir, f"{base_name}-deleteattachments.pdf")
+
+        doc = load_document(filepath)
+        try:
+            removed = deleteattachments_doc(doc, names, options)
+            save_document(doc, deleteattachments_output_path)
+        finally:
+            doc.Close()
+
+        return {
+            "message": f"Delete {len(removed)} attachments ({', '.join(removed)}) to file: {deleteattachments_output_path}",
+            "output_path": deleteattachments_output_path,
+            "removed": removed
+        }
+    except Exception as e:
+        logger.error(f"Failed to Delete attachments in PDF document: {e}")
+        raise AttachmentsError(f"Failed to Delete attachments in PDF document: {e!s}")
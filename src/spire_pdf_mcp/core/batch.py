@@ -0,0 +1,111 @@
+import glob
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from spire_pdf_mcp.utils.metrics import operation_scope
+from spire_pdf_mcp.utils.utils import short_error
+
+logger = logging.getLogger(__name__)
+
+
+def expand_inputs(root: str, inputs: Union[str, List[str]]) -> List[str]:
+    """Resolve a glob pattern or a list of files/patterns to existing files.
+
+    Relative paths and patterns are taken relative to root; "**" matches
+    subdirectories. Duplicates are dropped, order is kept.
+
+    Raises:
+        ValueError: If nothing matches
+    """
+    patterns = [inputs] if isinstance(inputs, str) else list(inputs or [])
+    files: List[str] = []
+    seen = set()
+    for pattern in patterns:
+        full = pattern if os.path.isabs(pattern) else os.path.join(root, pattern)
+        if glob.has_magic(full):
+            matches = sorted(p for p in glob.glob(full, recursive=True) if os.path.isfile(p))
+        else:
+            # Plain names are kept even if missing so the report shows them as failed
+            matches = [full]
+        for path in matches:
+            if path not in seen:
+                seen.add(path)
+                files.append(path)
+    if not files:
+        raise ValueError(f"No files match {inputs}")
+    return files
+
+
+def mirrored_path(filepath: str, root: str, output_dir: str, name: str) -> str:
+    """Path of a batch output called name for filepath.
+
+    Files below root keep their relative directory under output_dir, so equal
+    names in different folders do not collide.
+    """
+    relative = os.path.relpath(filepath, root)
+    subdir = os.path.dirname(relative) if not relative.startswith("..") else ""
+    return os.path.join(output_dir, subdir, name)
+
+
+def timed_call(func: Callable[..., Dict[str, Any]], *args: Any) -> Dict[str, Any]:
+    """Run one batch item, turning its outcome into a report entry.
+
+    Runs inside the worker so the timing excludes queueing. Never raises:
+    failures are reported with status "error".
+    """
+    started = time.perf_counter()
+    try:
+        with operation_scope(getattr(func, "__name__", "unknown")):
+            result = func(*args)
+        return {"status": "ok", "seconds": round(time.perf_counter() - started, 3), "result": result}
+    except Exception as e:
+        return {"status": "error", "seconds": round(time.perf_counter() - started, 3), "error": short_error(e)}
+
+
+def batch_report(root: str, action: str, files: List[str], entries: List[Any],
+                 outputs: List[str], seconds: float,
+                 describe: Optional[Callable[[Any], str]] = None) -> Dict[str, Any]:
+    """Summarize a batch into a per-file status/timing report.
+
+    Args:
+        root: Files directory; paths below it are shown relative to it
+        action: Past-tense summary of what was done, e.g. "Converted"
+        files: Input files, in order
+        entries: timed_call results (or exceptions) for each file
+        outputs: Output path for each file
+        seconds: Wall-clock time of the whole batch
+        describe: Gives extra detail shown for a succeeded file from its result
+    """
+    def display(path: str) -> str:
+        relative = os.path.relpath(path, root)
+        return path if relative.startswith("..") else relative
+
+    report = []
+    lines = []
+    for path, entry, output in zip(files, entries, outputs):
+        if isinstance(entry, BaseException):
+            entry = {"status": "error", "seconds": None, "error": str(entry)}
+        item = {"file": display(path), "status": entry["status"], "seconds": entry["seconds"]}
+        if entry["status"] == "ok":
+            item["output"] = display(output)
+            detail = f", {describe(entry['result'])}" if describe else ""
+            lines.append(f"[ok] {item['file']} -> {item['output']} ({entry['seconds']:.2f}s{detail})")
+        else:
+            item["error"] = entry["error"]
+            lines.append(f"[error] {item['file']}: {entry['error']}")
+        report.append(item)
+
+    succeeded = sum(1 for item in report if item["status"] == "ok")
+    failed = len(report) - succeeded
+    summary = f"{action} {succeeded}/{len(report)} files in {seconds:.2f}s"
+    if failed:
+        summary += f" ({failed} failed)"
+    return {
+        "message": summary + "\n" + "\n".join(lines),
+        "report": report,
+        "succeeded": succeeded,
+        "failed": failed,
+        "seconds": round(seconds, 3)
+    }
@@ -1,13 +1,172 @@
+import json
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from spire.pdf import *
 
+from spire_pdf_mcp.core.documentcache import cached_document, file_digest, load_document, save_document
 from spire_pdf_mcp.utils.exceptions import BookmarksError
 from spire_pdf_mcp.utils.utils import *
 logger = logging.getLogger(__name__)
 
+
+def deleteallbookmarks_doc(doc: PdfDocument, options: Dict[str, Any] = None) -> None:
+    """Remove all bookmarks from a loaded document"""
+    doc.Bookmarks.Clear()
+
+def expandbookmarks_doc(doc: PdfDocument, options: Dict[str, Any] = None) -> None:
+    """Show the bookmarks of a loaded document expanded"""
+    #Set BookMarkExpandOrCollapse as true to expand the bookmarks.
+    doc.ViewerPreferences.BookMarkExpandOrCollapse = True
+
+def bookmark_tree(doc: PdfDocument) -> List[Dict[str, Any]]:
+    """
+    The outline of a loaded document as nested
+    {"title", "level", "page", "children"} objects.
+
+    level starts at 1 for top-level bookmarks; page is the 1-based target
+    page, or None for bookmarks without a page destination.
+    """
+    def nodes(collection: PdfBookmarkCollection, level: int) -> List[Dict[str, Any]]:
+        result = []
+        for i in range(collection.Count):
+            bookmark = collection.get_Item(i)
+            destination = bookmark.Destination
+            page = None
+            if destination is not None and destination.Page is not None:
+                page = destination.PageNumber + 1
+            result.append({
+                "title": bookmark.Title,
+                "level": level,
+                "page": page,
+                "children": nodes(bookmark.ConvertToBookmarkCollection(), level + 1)
+            })
+        return result
+    return nodes(doc.Bookmarks, 1)
+
+def flatten_outline(tree: List[Dict[str, Any]], max_depth: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Outline nodes in reading order as {"title", "level", "page"}, down to max_depth"""
+    flat = []
+    for node in tree:
+        if max_depth is not None and node["level"] > max_depth:
+            continue
+        flat.append({"title": node["title"], "level": node["level"], "page": node["page"]})
+        flat.extend(flatten_outline(node["children"], max_depth))
+    return flat
+
+def _prune_outline(tree: List[Dict[str, Any]], max_depth: int) -> List[Dict[str, Any]]:
+    return [dict(node, children=_prune_outline(node["children"], max_depth) if node["level"] < max_depth else [])
+            for node in tree]
+
+# File content digest -> exported outline, shared across calls. Outlines are
+# small, so many more are kept than parsed documents.
+_outlines: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+_outlines_lock = threading.Lock()
+_MAX_OUTLINES = 256
+
+def read_outline(filepath: str) -> List[Dict[str, Any]]:
+    """
+    The bookmark tree of a Pdf file (see bookmark_tree).
+
+    Outlines are cached by file content, so repeated calls for an unchanged
+    file do not parse it again. The returned tree is shared and must not be
+    modified.
+    """
+    digest = file_digest(filepath)
+    with _outlines_lock:
+        tree = _outlines.get(digest)
+        if tree is not None:
+            _outlines.move_to_end(digest)
+            return tree
+    # Borrow the parsed pdf document from the shared cache (read-only)
+    with cached_document(filepath) as doc:
+        tree = bookmark_tree(doc)
+    with _outlines_lock:
+        _outlines[digest] = tree
+        while len(_outlines) > _MAX_OUTLINES:
+            _outlines.popitem(last=False)
+    return tree
+
+def load_outline(bookmarks: Union[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Bookmarks to add, as a tree, from a list of objects or a .json file.
+
+    Entries have a "title" and a 1-based "page" (optional), and either nest
+    their sub-bookmarks in "children" (the get_bookmarks format) or form a
+    flat list in reading order with a "level" each, 1 for top level.
+    """
+    if isinstance(bookmarks, str):
+        suffix = Path(bookmarks).suffix.lower()
+        if suffix != ".json":
+            raise ValueError(f"Unsupported bookmarks file type: {suffix} (use .json)")
+        with open(bookmarks, "r", encoding="utf-8-sig") as f:
+            bookmarks = json.load(f)
+    if not isinstance(bookmarks, list) or not all(isinstance(entry, dict) for entry in bookmarks):
+        raise ValueError("Bookmarks must be a list of objects with a title")
+    for entry in bookmarks:
+        if not str(entry.get("title") or "").strip():
+            raise ValueError(f"Bookmark without a title: {entry}")
+    if any(entry.get("children") for entry in bookmarks) or not any("level" in entry for entry in bookmarks):
+        return bookmarks
+
+    # Rebuild the nesting of a flat list from the levels
+    root: List[Dict[str, Any]] = []
+    stack = [(0, root)]
+    for entry in bookmarks:
+        level = int(entry.get("level", 1))
+        if level < 1:
+            raise ValueError(f"Bookmark level must be at least 1: {entry}")
+        while stack[-1][0] >= level:
+            stack.pop()
+        if level > stack[-1][0] + 1:
+            raise ValueError(f"Bookmark skips a level: {entry}")
+        node = dict(entry, children=[])
+        stack[-1][1].append(node)
+        stack.append((level, node["children"]))
+    return root
+
+def setbookmarks_doc(doc: PdfDocument, bookmarks: Union[str, List[Dict[str, Any]]],
+                     options: Dict[str, Any] = None) -> int:
+    """
+    Add bookmarks to a loaded document.
+
+    Options:
+        mode: "replace" the existing bookmarks (default) or "append" to them
+        expanded: Show bookmarks with children expanded (default: false);
+            a bookmark's own "expanded" entry takes precedence
+
+    Returns:
+        Number of bookmarks added
+    """
+    options = options or {}
+    mode = str(options.get("mode", "replace")).lower()
+    if mode not in ("replace", "append"):
+        raise ValueError(f"Unsupported mode: {mode} (use replace or append)")
+    tree = load_outline(bookmarks)
+    page_count = doc.Pages.Count
+
+    def add(collection: PdfBookmarkCollection, nodes: List[Dict[str, Any]]) -> int:
+        added = 0
+        for node in nodes:
+            bookmark = collection.Add(str(node["title"]))
+            if node.get("page") is not None:
+                page = int(node["page"])
+                if page < 1 or page > page_count:
+                    raise ValueError(f"Page {page} of bookmark {node['title']} is outside the document (1-{page_count})")
+                bookmark.Destination = PdfDestination(doc.Pages.get_Item(page - 1))
+            children = node.get("children") or []
+            if children:
+                bookmark.ExpandBookmark = bool(node.get("expanded", options.get("expanded", False)))
+            added += 1 + add(bookmark.ConvertToBookmarkCollection(), children)
+        return added
+
+    if mode == "replace":
+        doc.Bookmarks.Clear()
+    return add(doc.Bookmarks, tree)
+
     
 def deleteallbookmarks (filepath: str,options: Dict[str, Any] = None) -> Dict[str, Any]:
     """Delete bookmarks in PDF"""
@@ -20,15 +179,15 @@ def deleteallbookmarks (filepath: str,options: Dict[str, Any] = None) -> Dict[st
         base_name = save_path.stem
         deleteallbookmarks_output_path = os.path.join(output_dir, f"{base_name}-deleteallbookmarks.pdf")
         
-        #Create a new Pdf document.
-        document = PdfDocument()
         #Load the file from disk.
-        document.LoadFromFile(filepath)
-        #Remove all bookmarks.
-        document.Bookmarks.Clear()
-        #Save the document
-        document.SaveToFile(deleteallbookmarks_output_path)
-        document.Close()      
+        document = load_document(filepath)
+        try:
+            #Remove all bookmarks.
+            deleteallbookmarks_doc(document, options)
+            #Save the document
+            save_document(document, deleteallbookmarks_output_path)
+        finally:
+            document.Close()
             
         return {
             "message": f"Delete bookmarks to file: {deleteallbookmarks_output_path}"
@@ -48,20 +207,89 @@ def expandbookmarks (filepath: str,options: Dict[str, Any] = None) -> Dict[str,
         base_name = save_path.stem
         expandbookmarks_output_path = os.path.join(output_dir, f"{base_name}-expandbookmarks.pdf")
         
-        #Create a new PDF document.
-        doc = PdfDocument()
         #Load the file from disk.
-        doc.LoadFromFile(filepath)
-        #Set BookMarkExpandOrCollapse as true to expand the bookmarks.
-        doc.ViewerPreferences.BookMarkExpandOrCollapse = True
-        #Save the document
-        doc.SaveToFile(expandbookmarks_output_path)
-        doc.Close()    
+        doc = load_document(filepath)
+        try:
+            #Expand the bookmarks.
+            expandbookmarks_doc(doc, options)
+            #Save the document
+            save_document(doc, expandbookmarks_output_path)
+        finally:
+            doc.Close()
             
         return {
             "message": f"Expand bookmarks to file: {expandbookmarks_output_path}"
         }
     except Exception as e:
         logger.error(f"Failed to Expand bookmarks in PDF: {e}")
-        raise BookmarksError(f"Failed to Expand bookmarks in PDF: {e!s}")     
-         
\ No newline at end of file
+        raise BookmarksError(f"Failed to Expand bookmarks in PDF: {e!s}")
+
+def getbookmarks(filepath: str, options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Get the bookmark tree of the pdf
+
+    Writes the outline as JSON to <name>-bookmarks.json, a list of
+    {"title", "level", "page", "children"} objects; with options.inline the
+    JSON is returned instead. options.flat gives a flat list in reading order
+    and options.max_depth drops deeper levels.
+    """
+    options = options or {}
+    try:
+        tree = read_outline(filepath)
+        max_depth = options.get("max_depth")
+        if options.get("flat"):
+            outline = flatten_outline(tree, int(max_depth) if max_depth else None)
+        elif max_depth:
+            outline = _prune_outline(tree, int(max_depth))
+        else:
+            outline = tree
+        count = len(flatten_outline(tree, int(max_depth) if max_depth else None))
+        if options.get("inline"):
+            return {
+                "message": json.dumps(outline, ensure_ascii=False, indent=2),
+                "bookmarks": outline
+            }
+
+        output_dir = os.path.dirname(filepath)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        save_path = Path(filepath)
+        base_name = save_path.stem
+        getbookmarks_output_path = os.path.join(output_dir, f"{base_name}-bookmarks.json")
+        with open(getbookmarks_output_path, "w", encoding="utf-8") as f:
+            json.dump(outline, f, ensure_ascii=False, indent=2)
+
+        return {
+            "message": f"Get {count} bookmarks to file: {getbookmarks_output_path}",
+            "output_path": getbookmarks_output_path,
+            "bookmarks": outline
+        }
+    except Exception as e:
+        logger.error(f"Failed to get bookmarks in PDF: {e}")
+        raise BookmarksError(f"Failed to get bookmarks in PDF: {e!s}")
+
+def setbookmarks(filepath: str, bookmarks: Union[str, List[Dict[str, Any]]],
+                 options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Add or replace bookmarks in PDF (see setbookmarks_doc)"""
+    try:
+        output_dir = os.path.dirname(filepath)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        save_path = Path(filepath)
+        base_name = save_path.stem
+        setbookmarks_output_path = os.path.join(output_dir, f"{base_name}-setbookmarks.pdf")
+
+        document = load_document(filepath)
+        try:
+            added = setbookmarks_doc(document, bookmarks, options)
+            save_document(document, setbookmarks_output_path)
+        finally:
+            document.Close()
+
+        return {
+            "message": f"Set {added} bookmarks to file: {setbookmarks_output_path}",
+            "output_path": setbookmarks_output_path,
+            "bookmarks": added
+        }
+    except Exception as e:
+        logger.error(f"Failed to set bookmarks in PDF: {e}")
+        raise BookmarksError(f"Failed to set bookmarks in PDF: {e!s}")
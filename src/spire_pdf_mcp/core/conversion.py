@@ -1,12 +1,278 @@
 import logging
-from typing import Any, Dict, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
 
 from spire.pdf import *
 
+from spire_pdf_mcp.core.batch import mirrored_path
+from spire_pdf_mcp.core.conversioncache import get_conversion_cache
+from spire_pdf_mcp.core.documentcache import cached_document, load_document, save_document
 from spire_pdf_mcp.utils.exceptions import ConversionError
+from spire_pdf_mcp.utils.executor import get_render_pool
+from spire_pdf_mcp.utils.tracing import span
+from spire_pdf_mcp.utils.utils import parse_page_range
 
 logger = logging.getLogger(__name__)
 
+# Spire renders pages at 96 DPI
+SPIRE_RENDER_DPI = 96
+# Formats other than png are re-encoded with Pillow when it is installed
+IMAGE_FORMATS = ('png', 'jpg', 'jpeg', 'bmp', 'gif', 'tiff', 'webp')
+# Below this many pages, starting worker processes costs more than it saves
+PARALLEL_RENDER_MIN_PAGES = 16
+
+def batch_output_path(filepath: str, root: str, output_dir: str, format_type: str) -> str:
+    """Output path of one file of a batch conversion.
+
+    Files below root keep their relative directory under output_dir, so equal
+    names in different folders do not collide. Pdf outputs get the format as
+    suffix ("a.pdf" -> "a-graypdf.pdf") so a source is never overwritten.
+    """
+    format_type = format_type.lower()
+    extension = get_converter(format_type).extension
+    stem = Path(filepath).stem
+    name = f"{stem}-{format_type}.{extension}" if extension == 'pdf' else f"{stem}.{extension}"
+    return mirrored_path(filepath, root, output_dir, name)
+
+
+def image_output_pattern(output_filepath: str, image_format: str) -> str:
+    """Output name pattern for page images, derived from output_filepath.
+
+    "out/report.png" gives "out/report-{page}.png"; a path without suffix is
+    treated as a directory and gives "<dir>/page-{page}.png".
+    """
+    path = Path(output_filepath)
+    if path.suffix:
+        return str(path.with_name(f"{path.stem}-{{page}}.{image_format}"))
+    return str(path / f"page-{{page}}.{image_format}")
+
+
+def _render_page(doc: PdfDocument, index: int, dpi: int) -> bytes:
+    """Render one page to PNG bytes at the requested resolution"""
+    if dpi == SPIRE_RENDER_DPI:
+        with span("PdfDocument.SaveAsImage", **{"pdf.page": index + 1}):
+            return bytes(doc.SaveAsImage(index).ToArray())
+    # The bindings render at a fixed resolution, so draw the page scaled up
+    # (or down) onto a blank page of the target size and render that.
+    page = doc.Pages.get_Item(index)
+    scale = dpi / float(SPIRE_RENDER_DPI)
+    size = SizeF(page.Size.Width * scale, page.Size.Height * scale)
+    scaled = PdfDocument()
+    try:
+        scaled_page = scaled.Pages.Add(size, PdfMargins(0.0))
+        scaled_page.Canvas.DrawTemplate(page.CreateTemplate(), PointF(0.0, 0.0), size)
+        with span("PdfDocument.SaveAsImage", **{"pdf.page": index + 1, "render.dpi": dpi}):
+            return bytes(scaled.SaveAsImage(0).ToArray())
+    finally:
+        scaled.Close()
+
+
+def _write_image(png: bytes, image_path: str, image_format: str, dpi: int) -> None:
+    if image_format == 'png':
+        with open(image_path, 'wb') as f:
+            f.write(png)
+        return
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ConversionError(f"Saving images as {image_format} requires Pillow; use png or install Pillow")
+    import io
+    with Image.open(io.BytesIO(png)) as image:
+        if image_format in ('jpg', 'jpeg', 'bmp') and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        image.save(image_path, format='JPEG' if image_format == 'jpg' else image_format.upper(), dpi=(dpi, dpi))
+
+
+def render_pages(doc: PdfDocument, page_indices: List[int], output_pattern: str,
+                 dpi: int = SPIRE_RENDER_DPI, image_format: str = 'png') -> List[str]:
+    """Render pages of a loaded document to image files.
+
+    Returns:
+        Paths of the written images, in page order
+    """
+    written = []
+    for index in page_indices:
+        image_path = output_pattern.format(page=index + 1)
+        _write_image(_render_page(doc, index, dpi), image_path, image_format, dpi)
+        written.append(image_path)
+    return written
+
+
+def _render_pages_from_file(filepath: str, page_indices: List[int], output_pattern: str,
+                            dpi: int, image_format: str) -> List[str]:
+    """Render pool entry point: load the source once and render a run of pages"""
+    doc = load_document(filepath)
+    try:
+        return render_pages(doc, page_indices, output_pattern, dpi, image_format)
+    finally:
+        doc.Close()
+
+
+def convert_to_images(doc: PdfDocument, filepath: str, output_filepath: str,
+                      options: Dict[str, Any] = None) -> List[str]:
+    """
+    Render pages to images, fanning large jobs out over the shared render pool.
+
+    Options:
+        pages: Page selection such as "1-3,5" (default: all pages)
+        dpi: Output resolution (default: 96)
+        image_format: png, or jpg/bmp/gif/tiff/webp with Pillow (default: png,
+            or the suffix of output_filepath)
+        workers: Page runs rendered at once (default: the render pool size,
+            PDF_RENDER_WORKERS; 1 renders in the calling worker)
+
+    Returns:
+        Paths of the written images, in page order
+    """
+    options = options or {}
+    suffix = Path(output_filepath).suffix.lstrip('.').lower()
+    image_format = str(options.get('image_format') or (suffix if suffix in IMAGE_FORMATS else 'png')).lower()
+    if image_format not in IMAGE_FORMATS:
+        raise ConversionError(f"Unsupported image_format: {image_format}")
+    dpi = int(options.get('dpi', SPIRE_RENDER_DPI))
+    if dpi <= 0:
+        raise ConversionError(f"dpi must be positive, got {dpi}")
+    try:
+        page_indices = parse_page_range(options.get('pages'), doc.Pages.Count)
+    except ValueError as e:
+        raise ConversionError(str(e))
+
+    output_pattern = image_output_pattern(output_filepath, image_format)
+    os.makedirs(os.path.dirname(output_pattern) or '.', exist_ok=True)
+
+    pool = get_render_pool()
+    if pool is None or len(page_indices) < PARALLEL_RENDER_MIN_PAGES:
+        return render_pages(doc, page_indices, output_pattern, dpi, image_format)
+    workers = min(int(options.get('workers', pool.max_workers)), pool.max_workers, len(page_indices))
+    if workers <= 1:
+        return render_pages(doc, page_indices, output_pattern, dpi, image_format)
+
+    # Contiguous runs of pages so each render process parses the source only once
+    chunk_size = -(-len(page_indices) // workers)
+    chunks = [page_indices[i:i + chunk_size] for i in range(0, len(page_indices), chunk_size)]
+    futures = [
+        pool.submit(_render_pages_from_file, filepath, chunk, output_pattern, dpi, image_format)
+        for chunk in chunks
+    ]
+    return [path for future in futures for path in future.result()]
+
+
+def svg_outputs(output_filepath: str, page_count: int) -> List[str]:
+    """Files written by an SVG conversion: <name>_<page>.svg per page, or the name itself for one page"""
+    if page_count == 1:
+        return [output_filepath]
+    path = Path(output_filepath)
+    return [str(path.with_name(f"{path.stem}_{page}{path.suffix}")) for page in range(1, page_count + 1)]
+
+
+class Converter(NamedTuple):
+    """A conversion backend registered for one format_type.
+
+    needs says what convert is called with:
+        "path": convert(filepath, output_filepath, options); the backend reads
+            the source itself, so no PdfDocument is loaded for it
+        "document": convert(doc, filepath, output_filepath, options) with a
+            read-only document borrowed from the shared document cache
+    convert returns the files it wrote, or None for just output_filepath.
+    """
+    convert: Callable[..., Optional[List[str]]]
+    needs: str
+    extension: str
+
+
+CONVERTERS: Dict[str, Converter] = {}
+
+
+def register_converter(format_type: str, extension: str, needs: str = "document"):
+    """Decorator registering a conversion backend for format_type"""
+    if needs not in ("path", "document"):
+        raise ValueError(f"Unsupported converter requirement: {needs}")
+
+    def decorator(func: Callable[..., Optional[List[str]]]) -> Callable[..., Optional[List[str]]]:
+        CONVERTERS[format_type.lower()] = Converter(func, needs, extension)
+        return func
+    return decorator
+
+
+def get_converter(format_type: str) -> Converter:
+    """Look up the backend of a format_type"""
+    converter = CONVERTERS.get(format_type.lower())
+    if converter is None:
+        raise ConversionError(
+            f"Unsupported format type: {format_type} (expected one of {', '.join(sorted(CONVERTERS))})"
+        )
+    return converter
+
+
+def _register_save_format(format_type: str, extension: str, file_format: FileFormat) -> None:
+    def convert(doc: PdfDocument, filepath: str, output_filepath: str,
+                options: Dict[str, Any]) -> Optional[List[str]]:
+        save_document(doc, output_filepath, file_format)
+        return None
+    register_converter(format_type, extension)(convert)
+
+
+def _register_path_converter(format_type: str, factory: Callable[[str], Any], method: str) -> None:
+    def convert(filepath: str, output_filepath: str, options: Dict[str, Any]) -> Optional[List[str]]:
+        # These converters parse the source themselves
+        getattr(factory(filepath), method)(output_filepath)
+        return None
+    register_converter(format_type, 'pdf', needs="path")(convert)
+
+
+for _format_type, _extension, _file_format in [
+        ('pdf', 'pdf', FileFormat.PDF),
+        ('xps', 'xps', FileFormat.XPS),
+        ('doc', 'doc', FileFormat.DOC),
+        ('docx', 'docx', FileFormat.DOCX),
+        ('html', 'html', FileFormat.HTML),
+        ('pcl', 'pcl', FileFormat.PCL),
+        ('xlsx', 'xlsx', FileFormat.XLSX),
+        ('postscript', 'ps', FileFormat.POSTSCRIPT),
+        ('ofd', 'ofd', FileFormat.OFD),
+        ('pptx', 'pptx', FileFormat.PPTX)]:
+    _register_save_format(_format_type, _extension, _file_format)
+
+for _format_type, _factory, _method in [
+        ('linearizedpdf', PdfToLinearizedPdfConverter, 'ToLinearizedPdf'),
+        ('graypdf', PdfGrayConverter, 'ToGrayPdf'),
+        ('pdfa1a', PdfStandardsConverter, 'ToPdfA1A'),
+        ('pdfa1b', PdfStandardsConverter, 'ToPdfA1B'),
+        ('pdfa2a', PdfStandardsConverter, 'ToPdfA2A'),
+        ('pdfa2b', PdfStandardsConverter, 'ToPdfA2B'),
+        ('pdfa3a', PdfStandardsConverter, 'ToPdfA3A'),
+        ('pdfa3b', PdfStandardsConverter, 'ToPdfA3B'),
+        ('pdfx1a2001', PdfStandardsConverter, 'ToPdfX1A2001')]:
+    _register_path_converter(_format_type, _factory, _method)
+
+
+@register_converter('svg', 'svg')
+def _convert_svg(doc: PdfDocument, filepath: str, output_filepath: str,
+                 options: Dict[str, Any]) -> List[str]:
+    save_document(doc, output_filepath, FileFormat.SVG)
+    # Editions with a page limit write fewer files
+    return [f for f in svg_outputs(output_filepath, doc.Pages.Count) if os.path.exists(f)]
+
+
+@register_converter('image', 'png')
+def _convert_image(doc: PdfDocument, filepath: str, output_filepath: str,
+                   options: Dict[str, Any]) -> List[str]:
+    # One file per selected page
+    return convert_to_images(doc, filepath, output_filepath, options)
+
+
+def _convert(filepath: str, output_filepath: str, format_type: str,
+             options: Dict[str, Any]) -> List[str]:
+    """Run one conversion; returns the files written"""
+    converter = get_converter(format_type)
+    if converter.needs == "path":
+        output_files = converter.convert(filepath, output_filepath, options)
+    else:
+        # Borrow the parsed pdfdocument from the shared cache (read-only)
+        with cached_document(filepath) as doc:
+            output_files = converter.convert(doc, filepath, output_filepath, options)
+    return output_files if output_files is not None else [output_filepath]
+
 
 def convert_pdfdocument(
         filepath: str,
@@ -16,21 +282,22 @@ def convert_pdfdocument(
 ) -> Dict[str, Any]:
     """
     Convert PdfDocument to different formats.
-    
+
+    Results are kept in the conversion cache: converting the same content
+    with the same format and options again only copies the stored outputs.
+
     Args:
         filepath: Source Pdf file path
         output_filepath: Target output file path
         format_type: Target format (pdf,xps,doc,docx,html,svg,pcl,xlsx,postscript,ofd,pptx,image,linearizedpdf,graypdf,pdfa1a,pdfa1b,pdfa2a,pdfa2b,pdfa3a,pdfa3b,pdfx1a2001, etc.)
-        options (dict, optional): Format-specific options
-        
+        options (dict, optional): Format-specific options; "cache": False
+            bypasses the conversion cache
+
     Returns:
         Dictionary with operation status
     """
+    options = options or {}
     try:
-        # Load the pdfdocument
-        doc = PdfDocument()
-        doc.LoadFromFile(filepath)
-
         # Ensure output directory exists
         output_dir = os.path.dirname(output_filepath)
         if output_dir:
@@ -39,75 +306,39 @@ def convert_pdfdocument(
         # Handle format-specific conversion
         format_type = format_type.lower()
 
-        # Process different format types
-        if format_type == 'linearizedpdf':
-            # Convert to linearizedpdf
-            converter = PdfToLinearizedPdfConverter(filepath)
-            converter.ToLinearizedPdf(output_filepath)
-
-        elif format_type == 'image':
-            # Convert to image(*.png)
-            for i in range(doc.Pages.Count):
-                with doc.SaveAsImage(i) as image:
-                    image_output_path = os.path.join(output_dir, f"page_{i+1}.png")
-                    image.Save(image_output_path)
-
-        elif format_type == 'graypdf':
-            converter = PdfGrayConverter(filepath)
-            converter.ToGrayPdf(output_filepath)
-        elif format_type == 'pdfa1a':
-            converter = PdfStandardsConverter(filepath)
-            converter.ToPdfA1A(output_filepath)      
-        elif format_type == 'pdfa1b':
-            converter = PdfStandardsConverter(filepath)
-            converter.ToPdfA1B(output_filepath)  
-        elif format_type == 'pdfa2a':
-            converter = PdfStandardsConverter(filepath)
-            converter.ToPdfA2A(output_filepath)      
-        elif format_type == 'pdfa2b':
-            converter = PdfStandardsConverter(filepath)
-            converter.ToPdfA2B(output_filepath)   
-        elif format_type == 'pdfa3a':
-            converter = PdfStandardsConverter(filepath)
-            converter.ToPdfA3A(output_filepath)          
-        elif format_type == 'pdfa3b':
-            converter = PdfStandardsConverter(filepath)
-            converter.ToPdfA3B(output_filepath)     
-        elif format_type == 'pdfx1a2001':
-            converter = PdfStandardsConverter(filepath)
-            converter.ToPdfX1A2001(output_filepath)                                                                              
-                    
-        elif format_type in ['pdf','xps','doc','docx','html','svg','pcl','xlsx','postscript','ofd','pptx']:
-            # Map format type to file format
-            format_map = {
-                'pdf': FileFormat.PDF,
-                'xps': FileFormat.XPS,
-                'doc': FileFormat.DOC,
-                'docx': FileFormat.DOCX,
-                'html': FileFormat.HTML,
-                'svg': FileFormat.SVG,
-                'pcl': FileFormat.PCL,
-                'xlsx': FileFormat.XLSX,
-                'postscript': FileFormat.POSTSCRIPT,
-                'ofd': FileFormat.OFD,
-                'pptx': FileFormat.PPTX
-            }
-
-            if format_type not in format_map:
-                raise ConversionError(f"Unsupported format_type: {format_type}")
-
-            # Convert to the specified format
-            doc.SaveToFile(output_filepath, format_map[format_type])
-
-        else:
-            raise ConversionError(f"Unsupported format type: {format_type}")
-
-        return {
+        # Reject unknown formats before hashing or loading anything
+        get_converter(format_type)
+
+        cache = get_conversion_cache()
+        key = None
+        output_files = None
+        if cache.enabled and options.get('cache', True):
+            key = cache.key(filepath, format_type, output_filepath, options)
+            output_files = cache.fetch(key, output_filepath)
+        cached = output_files is not None
+        if not cached:
+            cache.release_outputs(output_filepath)
+            output_files = _convert(filepath, output_filepath, format_type, options)
+            if key is not None:
+                cache.store(key, output_filepath, output_files)
+
+        result = {
             "message": f"Pdf file successfully converted to {format_type.upper()}: {output_filepath}",
             "source_file": filepath,
             "output_file": output_filepath,
-            "format": format_type
+            "format": format_type,
+            "cached": cached
         }
+        if output_files != [output_filepath]:
+            noun = "images" if format_type == 'image' else "files"
+            result["message"] = (
+                f"Pdf file successfully converted to {len(output_files)} {noun}: "
+                + ", ".join(output_files)
+            )
+            result["output_files"] = output_files
+        if cached:
+            result["message"] += " (from conversion cache)"
+        return result
 
     except ConversionError as e:
         logger.error(str(e))
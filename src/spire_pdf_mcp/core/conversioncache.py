@@ -0,0 +1,264 @@
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from spire_pdf_mcp.core.documentcache import file_digest
+
+logger = logging.getLogger(__name__)
+
+# Options that change how a conversion runs but not what it produces
+NON_OUTPUT_OPTIONS = ("workers", "concurrency", "cache")
+
+MANIFEST = "manifest.json"
+# Directory of the records of which outputs are hardlinks into the store
+LINKS = "links"
+
+
+def output_base(output_filepath: str) -> str:
+    """Prefix shared by all files a conversion writes for output_filepath.
+
+    "out/report.svg" writes "out/report_1.svg", ...; a path without suffix is
+    a directory of page images. Outputs are stored relative to this base so a
+    cache hit can be materialized under another name.
+    """
+    path = Path(output_filepath)
+    if path.suffix:
+        return str(path.with_suffix(""))
+    return str(path) + os.sep
+
+
+class ConversionCache:
+    """Content-addressed store of conversion outputs.
+
+    Entries are keyed by the source file's content hash, the format, the
+    output-affecting options and the output suffix, and hold copies of every
+    file the conversion wrote. A hit is materialized by copying (or, with
+    link=True, hardlinking) the stored files to the requested output path.
+    Least recently used entries are removed once the store exceeds max_bytes.
+
+    With link=True the outputs share their inode with the cache and are made
+    read-only, so they cannot be modified in place behind the cache's back.
+    """
+
+    def __init__(self, path: str, max_bytes: int, link: bool = False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.link = link
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def key(self, filepath: str, format_type: str, output_filepath: str,
+            options: Dict[str, Any] = None) -> str:
+        """Cache key of converting filepath with these settings"""
+        normalized = {k: v for k, v in (options or {}).items() if k not in NON_OUTPUT_OPTIONS}
+        material = json.dumps({
+            "source": file_digest(filepath),
+            "format": format_type.lower(),
+            "suffix": Path(output_filepath).suffix.lower(),
+            "options": normalized
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def _place(self, source: str, target: str) -> None:
+        if os.path.lexists(target):
+            # Never write through an existing (possibly linked) file
+            os.unlink(target)
+        if self.link:
+            try:
+                os.link(source, target)
+                return
+            except OSError:
+                pass
+        shutil.copyfile(source, target)
+
+    def _links_record(self, output_filepath: str) -> str:
+        name = hashlib.sha256(os.path.abspath(output_filepath).encode("utf-8")).hexdigest()
+        return os.path.join(self.path, LINKS, f"{name}.json")
+
+    def _record_links(self, output_filepath: str, outputs: List[str]) -> None:
+        """Remember which files at output_filepath's names are links into the store"""
+        record = self._links_record(output_filepath)
+        staging = f"{record}.{uuid.uuid4().hex}"
+        try:
+            os.makedirs(os.path.dirname(record), exist_ok=True)
+            with open(staging, "w", encoding="utf-8") as f:
+                json.dump({"outputs": [os.path.abspath(output) for output in outputs]}, f)
+            os.replace(staging, record)
+        except OSError as e:
+            logger.warning(f"Failed to record cache links of {output_filepath}: {e}")
+            with contextlib.suppress(OSError):
+                os.unlink(staging)
+
+    def release_outputs(self, output_filepath: str) -> None:
+        """Unlink read-only cache links at output_filepath's names before a conversion rewrites them.
+
+        Only the outputs recorded when the links were made are touched, never
+        other files that merely share the name prefix.
+        """
+        if not self.link:
+            return
+        record = self._links_record(output_filepath)
+        try:
+            with open(record, encoding="utf-8") as f:
+                outputs = json.load(f)["outputs"]
+        except (OSError, ValueError, KeyError):
+            return
+        for path in outputs:
+            try:
+                st = os.lstat(path)
+                if stat.S_ISREG(st.st_mode) and st.st_nlink > 1 and not st.st_mode & stat.S_IWUSR:
+                    os.unlink(path)
+            except OSError:
+                continue
+        with contextlib.suppress(OSError):
+            os.unlink(record)
+
+    def fetch(self, key: str, output_filepath: str) -> Optional[List[str]]:
+        """Materialize a cached result at output_filepath.
+
+        Returns:
+            The written output files, or None on a miss
+        """
+        entry = self._entry_dir(key)
+        try:
+            with open(os.path.join(entry, MANIFEST), encoding="utf-8") as f:
+                manifest = json.load(f)
+            base = output_base(output_filepath)
+            outputs = []
+            for i, relative in enumerate(manifest["outputs"]):
+                target = output_filepath if relative is None else base + relative
+                directory = os.path.dirname(target)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._place(os.path.join(entry, str(i)), target)
+                outputs.append(target)
+            # The manifest's mtime orders entries for eviction
+            os.utime(os.path.join(entry, MANIFEST))
+            if self.link:
+                self._record_links(output_filepath, outputs)
+        except (OSError, ValueError, KeyError):
+            # Missing, evicted concurrently or unreadable: convert again
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return outputs
+
+    def store(self, key: str, output_filepath: str, output_files: List[str]) -> None:
+        """Add the files written by a conversion; errors are logged, not raised"""
+        base = output_base(output_filepath)
+        staging = os.path.join(self.path, f"tmp-{uuid.uuid4().hex}")
+        try:
+            os.makedirs(staging)
+            outputs = []
+            size = 0
+            for i, output in enumerate(output_files):
+                blob = os.path.join(staging, str(i))
+                if self.link:
+                    # Read-only so the linked output cannot change the cached copy
+                    os.chmod(output, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+                    try:
+                        os.link(output, blob)
+                    except OSError:
+                        shutil.copyfile(output, blob)
+                else:
+                    shutil.copyfile(output, blob)
+                size += os.path.getsize(blob)
+                if output == output_filepath:
+                    outputs.append(None)
+                elif output.startswith(base):
+                    outputs.append(output[len(base):])
+                else:
+                    logger.warning(f"Not caching conversion with unexpected output {output}")
+                    return
+            with open(os.path.join(staging, MANIFEST), "w", encoding="utf-8") as f:
+                json.dump({"outputs": outputs, "bytes": size}, f)
+            if self.link:
+                self._record_links(output_filepath, output_files)
+            entry = self._entry_dir(key)
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                # Another request stored the same result first
+                return
+            self._evict()
+        except OSError as e:
+            logger.warning(f"Failed to cache conversion result: {e}")
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _entries(self) -> List[Dict[str, Any]]:
+        entries = []
+        if not os.path.isdir(self.path):
+            return entries
+        for shard in os.scandir(self.path):
+            if not shard.is_dir() or shard.name.startswith("tmp-") or shard.name == LINKS:
+                continue
+            for entry in os.scandir(shard.path):
+                manifest = os.path.join(entry.path, MANIFEST)
+                try:
+                    with open(manifest, encoding="utf-8") as f:
+                        size = json.load(f)["bytes"]
+                    entries.append({"path": entry.path, "bytes": size, "used": os.stat(manifest).st_mtime})
+                except (OSError, ValueError, KeyError):
+                    continue
+        return entries
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = self._entries()
+            total = sum(e["bytes"] for e in entries)
+            for entry in sorted(entries, key=lambda e: e["used"]):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry["path"], ignore_errors=True)
+                total -= entry["bytes"]
+
+    def clear(self) -> None:
+        """Remove every stored result"""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of this process and current store usage"""
+        entries = self._entries()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(entries),
+                "bytes": sum(e["bytes"] for e in entries),
+                "max_bytes": self.max_bytes
+            }
+
+
+_conversion_cache = ConversionCache(
+    os.environ.get(
+        "PDF_CONVERSION_CACHE_PATH",
+        os.path.join(os.environ.get("PDF_FILES_PATH", "./pdf_files"), ".spire-pdf-conversion-cache")
+    ),
+    int(os.environ.get("PDF_CONVERSION_CACHE_MB", 512)) * 1024 * 1024,
+    link=os.environ.get("PDF_CONVERSION_CACHE_LINK", "copy").lower() == "hardlink"
+)
+
+
+def get_conversion_cache() -> ConversionCache:
+    """Get the process-wide conversion result cache"""
+    return _conversion_cache
@@ -0,0 +1,261 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from spire.pdf import *
+
+from spire_pdf_mcp.utils.metrics import phase
+from spire_pdf_mcp.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# (resolved path, size, mtime_ns, password)
+CacheKey = Tuple[str, int, int, str]
+
+
+class _CacheEntry:
+    def __init__(self, doc: PdfDocument, size: int):
+        self.doc = doc
+        self.size = size
+        # Spire documents are not safe for concurrent use, so readers of the
+        # same entry take turns; different documents are read in parallel.
+        self.lock = threading.Lock()
+        self.refs = 0
+        self.evicted = False
+
+
+def document_key(filepath: str, password: Optional[str] = None) -> Tuple[CacheKey, int]:
+    """Build the cache key for a file on disk.
+
+    Returns:
+        (key, size) where size is the file size in bytes
+    """
+    resolved = os.path.realpath(filepath)
+    st = os.stat(resolved)
+    return (resolved, st.st_size, st.st_mtime_ns, password or ""), st.st_size
+
+
+_digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_digests_lock = threading.Lock()
+_MAX_DIGESTS = 4096
+
+
+def file_digest(filepath: str) -> str:
+    """SHA-256 of a file's content, remembered per (path, size, mtime)"""
+    resolved = os.path.realpath(filepath)
+    st = os.stat(resolved)
+    key = (resolved, st.st_size, st.st_mtime_ns)
+    with _digests_lock:
+        digest = _digests.get(key)
+        if digest is not None:
+            _digests.move_to_end(key)
+            return digest
+    sha = hashlib.sha256()
+    with open(resolved, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(block)
+    digest = sha.hexdigest()
+    with _digests_lock:
+        _digests[key] = digest
+        while len(_digests) > _MAX_DIGESTS:
+            _digests.popitem(last=False)
+    return digest
+
+
+def load_document(filepath: str, password: Optional[str] = None) -> PdfDocument:
+    """Parse a Pdf file into a new PdfDocument owned by the caller"""
+    doc = PdfDocument()
+    try:
+        with phase("load"), span("PdfDocument.LoadFromFile", **{"file.path": filepath}):
+            if password:
+                doc.LoadFromFile(filepath, password)
+            else:
+                doc.LoadFromFile(filepath)
+    except BaseException:
+        # A failed load still holds native memory
+        doc.Close()
+        raise
+    return doc
+
+
+def load_document_from_stream(stream: Stream, password: Optional[str] = None) -> PdfDocument:
+    """Parse a Pdf held in a Spire Stream into a new PdfDocument owned by the caller"""
+    doc = PdfDocument()
+    # The password overload is used even without a password: the native
+    # library does not export the single-argument LoadFromStream.
+    try:
+        with phase("load"), span("PdfDocument.LoadFromStream"):
+            doc.LoadFromStream(stream, password or "")
+    except BaseException:
+        doc.Close()
+        raise
+    return doc
+
+
+def save_document(doc: PdfDocument, filepath: str, file_format: Optional[FileFormat] = None) -> None:
+    """Write a document to a file, as Pdf or in file_format"""
+    attributes = {"file.path": filepath, "file.format": str(file_format or "PDF")}
+    with phase("save"), span("PdfDocument.SaveToFile", **attributes):
+        if file_format is None:
+            doc.SaveToFile(filepath)
+        else:
+            doc.SaveToFile(filepath, file_format)
+
+
+class DocumentCache:
+    """Process-wide LRU cache of parsed Pdf documents.
+
+    Entries are keyed by (resolved path, size, mtime, password), so a file that
+    changes on disk is reparsed. The budget is counted in source file bytes.
+    Cached documents are shared and must only be read; tools that modify a
+    document load their own copy with load_document().
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._loading: Dict[CacheKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _release(self, entry: _CacheEntry) -> None:
+        with self._lock:
+            entry.refs -= 1
+            close = entry.evicted and entry.refs == 0
+        if close:
+            entry.doc.Close()
+
+    def _evict(self, key: CacheKey) -> Optional[_CacheEntry]:
+        """Remove an entry; caller holds self._lock and closes the returned document"""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        self.evictions += 1
+        entry.evicted = True
+        return entry if entry.refs == 0 else None
+
+    def _insert(self, key: CacheKey, entry: _CacheEntry) -> None:
+        to_close = []
+        with self._lock:
+            # Older versions of the same file can never be hit again
+            for stale in [k for k in self._entries if k[0] == key[0] and k != key]:
+                to_close.append(self._evict(stale))
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                to_close.append(self._evict(oldest))
+        for evicted in to_close:
+            if evicted is not None:
+                evicted.doc.Close()
+
+    @contextmanager
+    def document(self, filepath: str, password: Optional[str] = None) -> Iterator[PdfDocument]:
+        """Borrow a parsed document for reading.
+
+        The document is only valid inside the with block and must not be
+        modified or closed by the caller.
+        """
+        key, size = document_key(filepath, password)
+        if not self.enabled or size > self.max_bytes:
+            doc = load_document(filepath, password)
+            try:
+                yield doc
+            finally:
+                doc.Close()
+            return
+
+        entry = self._acquire(key, size, filepath, password)
+        try:
+            with entry.lock:
+                yield entry.doc
+        finally:
+            self._release(entry)
+
+    def _acquire(self, key: CacheKey, size: int, filepath: str,
+                 password: Optional[str]) -> _CacheEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.refs += 1
+                self.hits += 1
+                return entry
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Only one thread parses a given file; the others wait and then hit
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    entry.refs += 1
+                    self.hits += 1
+                    return entry
+                self.misses += 1
+            try:
+                entry = _CacheEntry(load_document(filepath, password), size)
+                entry.refs += 1
+                self._insert(key, entry)
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+        return entry
+
+    def invalidate(self, filepath: str) -> None:
+        """Drop every cached version of a file"""
+        resolved = os.path.realpath(filepath)
+        to_close = []
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == resolved]:
+                to_close.append(self._evict(key))
+        for evicted in to_close:
+            if evicted is not None:
+                evicted.doc.Close()
+
+    def clear(self) -> None:
+        """Drop all cached documents"""
+        to_close = []
+        with self._lock:
+            for key in list(self._entries):
+                to_close.append(self._evict(key))
+        for evicted in to_close:
+            if evicted is not None:
+                evicted.doc.Close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current usage"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes
+            }
+
+
+_document_cache = DocumentCache(int(os.environ.get("PDF_DOCUMENT_CACHE_MB", 256)) * 1024 * 1024)
+
+
+def get_document_cache() -> DocumentCache:
+    """Get the process-wide document cache"""
+    return _document_cache
+
+
+@contextmanager
+def cached_document(filepath: str, password: Optional[str] = None) -> Iterator[PdfDocument]:
+    """Borrow a read-only parsed document from the process-wide cache"""
+    with _document_cache.document(filepath, password) as doc:
+        yield doc
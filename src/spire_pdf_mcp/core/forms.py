@@ -1,14 +1,22 @@
+import csv
+import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Union
 
 from spire.pdf import *
 
+from spire_pdf_mcp.core.documentcache import cached_document, load_document, load_document_from_stream, save_document
 from spire_pdf_mcp.utils.exceptions import FormsError
 from spire_pdf_mcp.utils.utils import *
 logger = logging.getLogger(__name__)
 
 
+def flattenformfield_doc(doc: PdfDocument, options: Dict[str, Any] = None) -> None:
+    """Flatten the form fields of a loaded document"""
+    doc.Form.IsFlatten = True
     
 def flattenformfield (filepath: str,options: Dict[str, Any] = None) -> Dict[str, Any]:
     """Flatten Form Field in PDF document"""
@@ -22,13 +30,14 @@ def flattenformfield (filepath: str,options: Dict[str, Any] = None) -> Dict[str,
         flattenformfield_output_path = os.path.join(output_dir, f"{base_name}-flattenformfield.pdf")
         
         #Open pdf document
-        doc = PdfDocument()
-        doc.LoadFromFile(filepath)
-        #Flatten form fields
-        doc.Form.IsFlatten = True
-        #Save pdf document
-        doc.SaveToFile(flattenformfield_output_path)
-        doc.Close()      
+        doc = load_document(filepath)
+        try:
+            #Flatten form fields
+            flattenformfield_doc(doc, options)
+            #Save pdf document
+            save_document(doc, flattenformfield_output_path)
+        finally:
+            doc.Close()
             
         return {
             "message": f"Flatten Form Field to file: {flattenformfield_output_path}"
@@ -37,72 +46,359 @@ def flattenformfield (filepath: str,options: Dict[str, Any] = None) -> Dict[str,
         logger.error(f"Failed to Flatten Form Field in PDF document: {e}")
         raise FormsError(f"Failed to Flatten Form Field in PDF document: {e!s}")    
     
+# Widget classes and the field type reported for them
+FIELD_TYPES = (
+    (PdfTextBoxFieldWidget, "text"),
+    (PdfCheckBoxWidgetFieldWidget, "checkbox"),
+    (PdfRadioButtonListFieldWidget, "radio"),
+    (PdfComboBoxWidgetFieldWidget, "combo"),
+    (PdfListBoxWidgetFieldWidget, "listbox"),
+    (PdfButtonWidgetFieldWidget, "button"),
+    (PdfSignatureFieldWidget, "signature")
+)
+
+def _choice_values(field: PdfField) -> List[str]:
+    values = field.Values
+    # A saved combo box selection shows up as an extra, duplicate item
+    return list(dict.fromkeys(values.get_Item(i).Value for i in range(values.Count)))
+
+def form_field_record(field: PdfField) -> Dict[str, Any]:
+    """Name, type, value and (for choices) options of one form field"""
+    field_type = next((name for cls, name in FIELD_TYPES if isinstance(field, cls)), "other")
+    record = {"name": field.Name, "type": field_type, "value": None}
+    if field_type == "text":
+        record["value"] = field.Text
+    elif field_type == "checkbox":
+        record["value"] = field.Checked
+    elif field_type == "radio":
+        record["value"] = field.SelectedValue if field.SelectedIndex >= 0 else None
+    elif field_type in ("combo", "listbox"):
+        record["options"] = _choice_values(field)
+        try:
+            record["value"] = field.SelectedValue
+        except Exception:
+            # Spire raises when nothing is selected
+            record["value"] = None
+    return record
+
+def read_form_fields(filepath: str) -> List[Dict[str, Any]]:
+    """Structured records of every form field of a Pdf file, in document order"""
+    # Borrow the parsed pdf document from the shared cache (read-only)
+    with cached_document(filepath) as doc:
+        pdfform = doc.Form
+        formWidget = PdfFormWidget(pdfform)
+        try:
+            fields = formWidget.FieldsWidget
+        except Exception:
+            # A document without a form has no field collection
+            return []
+        return [form_field_record(fields.get_Item(i)) for i in range(fields.Count)]
+
 def getformsvalues (filepath: str,options: Dict[str, Any] = None) -> Dict[str, Any]:
-    """Get forms values from the pdf"""
+    """Get forms values from the pdf
+
+    Writes the fields as JSON to <name>-getformsvalues.json, a list of
+    {"name", "type", "value", "options"} objects; with options.inline the
+    JSON is returned instead.
+    """
+    options = options or {}
     try:
+        fields = read_form_fields(filepath)
+        if options.get("inline"):
+            return {
+                "message": json.dumps(fields, ensure_ascii=False, indent=2),
+                "fields": fields
+            }
+
         output_dir = os.path.dirname(filepath)
         if output_dir:
             os.makedirs(output_dir, exist_ok=True)
         save_path = Path(filepath)
         base_name = save_path.stem
-        getformsvalues_output_path = os.path.join(output_dir, f"{base_name}-getformsvalues.txt")
-        
-        #Load a pdf document
-        doc = PdfDocument()
-        doc.LoadFromFile(filepath)
-        #Get pdf forms
-        pdfform = doc.Form
-        formWidget = PdfFormWidget(pdfform)
-        sb = []
-        #Traverse all the forms
-        if formWidget.FieldsWidget.Count > 0:
-            for i in range(formWidget.FieldsWidget.Count):
-                field = formWidget.FieldsWidget.get_Item(i)
-                if isinstance(field, PdfTextBoxFieldWidget):
-                    textBoxField = field if isinstance(field, PdfTextBoxFieldWidget) else None
-                    #Get text of textbox
-                    text = textBoxField.Text
-                    sb.append("The text in textbox is " + text + "\r\n")
-                if isinstance(field, PdfListBoxWidgetFieldWidget):
-                    listBoxField = field if isinstance(field, PdfListBoxWidgetFieldWidget) else None
-                    sb.append("Listbox items are \r\n")
-                    #Get values of listbox
-                    items = listBoxField.Values
-                    for i in range(items.Count):
-                        item = items.get_Item(i)
-                        sb.append(item.Value + "\r\n")
-                    #Get selected value
-                    selectedValue = listBoxField.SelectedValue
-                    sb.append("The selected value in the listbox is " + selectedValue + "\r\n")
-                if isinstance(field, PdfComboBoxWidgetFieldWidget):
-                    comBoxField = field if isinstance(field, PdfComboBoxWidgetFieldWidget) else None
-                    sb.append("comBoxField items are \r\n")
-                    #Get values of comboBox
-                    items = comBoxField.Values
-                    for i in range(items.Count):
-                        item = items.get_Item(i)
-                        sb.append(item.Value + "\r\n")
-                    #Get selected value
-                    selectedValue = comBoxField.SelectedValue
-                    sb.append("The selected value in the comBoxField is " + selectedValue + "\r\n")
-                if isinstance(field, PdfRadioButtonListFieldWidget):
-                    radioBtnField = field if isinstance(field, PdfRadioButtonListFieldWidget) else None
-                    #Get value of radio button
-                    value = radioBtnField.Value
-                    sb.append("The text in radioButtonField is " + value + "\r\n")
-                if isinstance(field, PdfCheckBoxWidgetFieldWidget):
-                    checkBoxField = field if isinstance(field, PdfCheckBoxWidgetFieldWidget) else None
-                    #Get the checked state of the checkbox
-                    state = checkBoxField.Checked
-                    stateValue = "True" if state else "False"
-                    sb.append("If the checkBox is checked: " + stateValue + "\r\n")
-        
-        AppendAllText(getformsvalues_output_path, sb)    
+        getformsvalues_output_path = os.path.join(output_dir, f"{base_name}-getformsvalues.json")
+        with open(getformsvalues_output_path, "w", encoding="utf-8") as f:
+            json.dump(fields, f, ensure_ascii=False, indent=2)
             
         return {
-            "message": f"Get forms values to file: {getformsvalues_output_path}"
+            "message": f"Get {len(fields)} forms values to file: {getformsvalues_output_path}",
+            "output_path": getformsvalues_output_path,
+            "fields": fields
         }
     except Exception as e:
         logger.error(f"Failed to get forms values: {e}")
         raise FormsError(f"Failed to get forms values: {e!s}")     
-         
\ No newline at end of file
+
+def write_form_records(records: List[Dict[str, Any]], output_path: str) -> int:
+    """
+    Write the fields of many files to one .jsonl or .csv file.
+
+    JSONL gets one {"file", "fields"} object per file. CSV gets one row per
+    file with a column per field name (in order of first appearance);
+    list box selections are joined with ";".
+
+    Args:
+        records: {"file": path, "fields": read_form_fields(path)} per file
+
+    Returns:
+        Number of records written
+    """
+    suffix = Path(output_path).suffix.lower()
+    if suffix not in (".jsonl", ".csv"):
+        raise ValueError(f"Unsupported output type: {suffix} (use .jsonl or .csv)")
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        if suffix == ".jsonl":
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            return len(records)
+        columns: Dict[str, None] = {}
+        for record in records:
+            for field in record["fields"]:
+                columns.setdefault(field["name"], None)
+        writer = csv.DictWriter(f, fieldnames=["file", *columns])
+        writer.writeheader()
+        for record in records:
+            row = {"file": record["file"]}
+            for field in record["fields"]:
+                value = field["value"]
+                row[field["name"]] = ";".join(map(str, value)) if isinstance(value, list) else value
+            writer.writerow(row)
+    return len(records)
+
+# Cell values read as a checked checkbox
+CHECKED_VALUES = ("true", "yes", "y", "on", "1", "x", "checked")
+
+def load_form_rows(data: Union[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Rows to fill from a list of objects or a .json/.jsonl/.csv file.
+
+    A JSON file holds a list of objects; a CSV file has one field name per
+    column. Empty cells and nulls leave the template value in place.
+    """
+    if isinstance(data, str):
+        suffix = Path(data).suffix.lower()
+        with open(data, "r", encoding="utf-8-sig", newline="") as f:
+            if suffix == ".csv":
+                rows = list(csv.DictReader(f))
+            elif suffix == ".jsonl":
+                rows = [json.loads(line) for line in f if line.strip()]
+            elif suffix == ".json":
+                rows = json.load(f)
+            else:
+                raise ValueError(f"Unsupported data file type: {suffix} (use .json, .jsonl or .csv)")
+    else:
+        rows = data
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError("Form data must be a list of objects, one per output document")
+    return [{k: v for k, v in row.items() if v not in (None, "")} for row in rows]
+
+class FormFiller:
+    """A parsed form template that is filled and saved once per row.
+
+    The template is parsed from an in-memory snapshot and the same document
+    is reused for consecutive rows: fields a row does not set are put back to
+    their template value. Selections in a list or combo box cannot be cleared
+    once made, so the template is parsed again only when a row leaves such a
+    field unset after an earlier row set it. Flattening removes the fields on
+    save, so flattened outputs always start from a fresh copy.
+    """
+
+    def __init__(self, snapshot: bytes):
+        self.snapshot = snapshot
+        self._doc = None
+        self._dirty: Set[str] = set()
+
+    def _open(self) -> None:
+        self.close()
+        self._doc = load_document_from_stream(Stream(self.snapshot))
+        # Keep the form objects alive: child handles are only valid while they are
+        self._form = self._doc.Form
+        self._widget = PdfFormWidget(self._form)
+        try:
+            self._widgets = self._widget.FieldsWidget
+        except Exception:
+            raise ValueError("The template has no form fields")
+        self.fields = {}
+        for i in range(self._widgets.Count):
+            field = self._widgets.get_Item(i)
+            self.fields[field.Name] = field
+        self._original = {name: self._read(field) for name, field in self.fields.items()}
+        self._dirty = set()
+
+    @staticmethod
+    def _read(field: PdfField) -> Any:
+        if isinstance(field, PdfTextBoxFieldWidget):
+            return field.Text
+        if isinstance(field, PdfCheckBoxWidgetFieldWidget):
+            return field.Checked
+        if isinstance(field, PdfRadioButtonListFieldWidget):
+            return field.SelectedValue if field.SelectedIndex >= 0 else None
+        if isinstance(field, (PdfComboBoxWidgetFieldWidget, PdfListBoxWidgetFieldWidget)):
+            try:
+                return field.SelectedValue
+            except Exception:
+                # Nothing selected
+                return None
+        return None
+
+    @staticmethod
+    def _write(name: str, field: PdfField, value: Any) -> None:
+        if isinstance(field, PdfTextBoxFieldWidget):
+            field.Text = str(value)
+        elif isinstance(field, PdfCheckBoxWidgetFieldWidget):
+            field.Checked = value if isinstance(value, bool) else str(value).strip().lower() in CHECKED_VALUES
+        elif isinstance(field, PdfRadioButtonListFieldWidget):
+            field.SelectedValue = str(value)
+        elif isinstance(field, (PdfComboBoxWidgetFieldWidget, PdfListBoxWidgetFieldWidget)):
+            options = _choice_values(field)
+            if str(value) not in options:
+                raise ValueError(f"{value!r} is not an option of {name} ({', '.join(options)})")
+            field.SelectedValue = str(value)
+        else:
+            raise ValueError(f"Field {name} ({type(field).__name__}) cannot be filled")
+
+    def field_names(self) -> List[str]:
+        if self._doc is None:
+            self._open()
+        return list(self.fields)
+
+    def fill(self, row: Dict[str, Any], output_path: str, flatten: bool = False) -> None:
+        """Write the template filled with row to output_path"""
+        if self._doc is None or flatten:
+            self._open()
+        elif any(self._original[name] is None for name in self._dirty - set(row)):
+            # A selection the template did not have cannot be undone
+            self._open()
+        for name in self._dirty - set(row):
+            if self._original[name] is not None:
+                self._write(name, self.fields[name], self._original[name])
+        for name, value in row.items():
+            self._write(name, self.fields[name], value)
+        self._dirty = set(row)
+        if flatten:
+            self._form.IsFlatten = True
+        try:
+            save_document(self._doc, output_path)
+        finally:
+            if flatten:
+                self.close()
+
+    def close(self) -> None:
+        if self._doc is not None:
+            self._doc.Close()
+            self._doc = None
+
+def _fill_rows(snapshot: bytes, jobs: List[tuple], flatten: bool) -> List[Dict[str, Any]]:
+    """Fill a share of the rows with one template copy; failures are reported per row"""
+    filler = FormFiller(snapshot)
+    results = []
+    try:
+        for index, row, output_path in jobs:
+            started = time.perf_counter()
+            try:
+                filler.fill(row, output_path, flatten)
+                results.append({"row": index, "file": output_path,
+                                "seconds": round(time.perf_counter() - started, 3)})
+            except Exception as e:
+                # Start the next row from a clean copy
+                filler.close()
+                results.append({"row": index, "error": short_error(e)})
+    finally:
+        filler.close()
+    return results
+
+def fillforms(filepath: str, data: Union[str, List[Dict[str, Any]]],
+              options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Fill a form template once per data row (mail merge).
+
+    The template is read once; each worker parses its own copy and reuses it
+    for all of its rows (see FormFiller), writing the outputs concurrently.
+
+    Args:
+        filepath: Path to the form template
+        data: List of {field name: value} rows, or a .json/.jsonl/.csv file of them
+        options:
+            flatten: Flatten the fields of the outputs (default: False)
+            output_dir: Directory for the outputs, relative to the template
+                (default: <template name>-filled)
+            name_field: Row field whose value names the output file
+                (default: <template name>-<row number>.pdf)
+            workers: Rows filled at once (default: min(4, CPU count))
+
+    Returns:
+        Dictionary containing the operation result
+    """
+    options = options or {}
+    try:
+        if not Path(filepath).exists():
+            raise FileNotFoundError(f"Form template not found: {filepath}")
+        rows = load_form_rows(data)
+        if not rows:
+            raise ValueError("No rows to fill")
+        with open(filepath, "rb") as f:
+            snapshot = f.read()
+
+        # Check every column against the template before writing anything
+        probe = FormFiller(snapshot)
+        try:
+            known = set(probe.field_names())
+        finally:
+            probe.close()
+        name_field = options.get("name_field")
+        unknown = sorted({name for row in rows for name in row} - known - {name_field})
+        if unknown:
+            raise ValueError(f"Unknown form fields: {', '.join(unknown)} (template has {', '.join(sorted(known))})")
+
+        save_path = Path(filepath)
+        output_dir = os.path.join(os.path.dirname(filepath), options.get("output_dir") or f"{save_path.stem}-filled")
+        os.makedirs(output_dir, exist_ok=True)
+        width = len(str(len(rows)))
+        jobs = []
+        renamed = []
+        # Rows are written concurrently, so equal names would overwrite each
+        # other; later rows get -2, -3, ... (compared case-insensitively)
+        seen = set()
+        for n, row in enumerate(rows, 1):
+            if name_field and row.get(name_field) not in (None, ""):
+                stem = safe_file_name(str(row[name_field]))
+            else:
+                stem = f"{save_path.stem}-{n:0{width}d}"
+            name, suffix = stem, 1
+            while name.lower() in seen:
+                suffix += 1
+                name = f"{stem}-{suffix}"
+            seen.add(name.lower())
+            if name != stem:
+                renamed.append(f"- row {n}: {stem}.pdf already used, saved as {name}.pdf")
+            fields = {k: v for k, v in row.items() if k in known}
+            jobs.append((n, fields, os.path.join(output_dir, f"{name}.pdf")))
+
+        workers = max(1, min(len(jobs), int(options.get("workers", min(4, os.cpu_count() or 1)))))
+        flatten = bool(options.get("flatten", False))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="spire-pdf-fill") as pool:
+            shares = pool.map(_fill_rows, [snapshot] * workers,
+                              [jobs[i::workers] for i in range(workers)], [flatten] * workers)
+            results = sorted((r for share in shares for r in share), key=lambda r: r["row"])
+        elapsed = time.perf_counter() - started
+
+        filled = [r for r in results if "file" in r]
+        failed = [r for r in results if "error" in r]
+        lines = [f"- row {r['row']}: {r['error']}" for r in failed]
+        message = (f"Filled {len(filled)} of {len(rows)} forms in {elapsed:.2f}s to: {output_dir}"
+                   + (f" ({len(failed)} failed)\n" + "\n".join(lines) if failed else ""))
+        if renamed:
+            message += f"\n{len(renamed)} duplicate file names were numbered:\n" + "\n".join(renamed)
+        return {
+            "message": message,
+            "output_path": output_dir,
+            "files": [r["file"] for r in filled],
+            "rows": results,
+            "failed": failed,
+            "seconds": round(elapsed, 3)
+        }
+    except Exception as e:
+        logger.error(f"Failed to fill forms: {e}")
+        raise FormsError(f"Failed to fill forms: {e!s}")
@@ -0,0 +1,96 @@
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from spire.pdf import *
+
+from spire_pdf_mcp.core.attachments import deleteallattachments_doc, deleteattachments_doc
+from spire_pdf_mcp.core.bookmarks import deleteallbookmarks_doc, expandbookmarks_doc, setbookmarks_doc
+from spire_pdf_mcp.core.forms import flattenformfield_doc
+from spire_pdf_mcp.core.pdfdocument import add_text_watermark_doc, compressdocument_doc
+from spire_pdf_mcp.core.security import decryptdocument_doc, encryptdocument_doc
+from spire_pdf_mcp.core.text import replacealltext_doc
+
+logger = logging.getLogger(__name__)
+
+
+def _require(params: Dict[str, Any], name: str) -> Any:
+    if params.get(name) is None:
+        raise ValueError(f"Missing required parameter: {name}")
+    return params[name]
+
+
+def _options(params: Dict[str, Any], *names: str) -> Dict[str, Any]:
+    """The options of an operation: its params without the named parameters"""
+    return {key: value for key, value in params.items() if key not in names}
+
+
+def operation_params(params: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    One flat dict of an operation's parameters and options.
+
+    Options sit next to the parameters, e.g. {"watermark_text": "DRAFT",
+    "font_size": 30}. A nested "options" object is still merged in;
+    top-level entries win.
+    """
+    params = dict(params or {})
+    nested = params.pop("options", None)
+    if nested is None:
+        return params
+    if not isinstance(nested, dict):
+        raise ValueError(f"options must be an object, got {nested!r}")
+    return {**nested, **params}
+
+
+# In-memory operations on a loaded PdfDocument: name -> func(doc, params).
+# params is the flat dict of operation_params: the operation's arguments
+# plus its options. Most operations modify doc in place (returning None or
+# a summary of what they did); operations that have to rebuild the
+# document return the replacement PdfDocument.
+OPERATIONS: Dict[str, Callable[[PdfDocument, Dict[str, Any]], Any]] = {
+    "delete_all_bookmarks": lambda doc, p: deleteallbookmarks_doc(doc, p),
+    "expand_bookmarks": lambda doc, p: expandbookmarks_doc(doc, p),
+    "set_bookmarks": lambda doc, p: setbookmarks_doc(doc, _require(p, "bookmarks"), _options(p, "bookmarks")),
+    "delete_all_attachments": lambda doc, p: deleteallattachments_doc(doc, p),
+    "delete_attachments": lambda doc, p: deleteattachments_doc(doc, _require(p, "names"), _options(p, "names")),
+    "flatten_formfield": lambda doc, p: flattenformfield_doc(doc, p),
+    "add_text_watermark": lambda doc, p: add_text_watermark_doc(
+        doc, _require(p, "watermark_text"), _options(p, "watermark_text")),
+    "replace_all_text": lambda doc, p: replacealltext_doc(
+        doc, p.get("oldtext"), p.get("newtext"), _options(p, "oldtext", "newtext")),
+    "encrypt_document": lambda doc, p: encryptdocument_doc(
+        doc, _require(p, "userpsw"), _require(p, "ownerpsw"), _options(p, "userpsw", "ownerpsw")),
+    "decrypt_document": lambda doc, p: decryptdocument_doc(doc, p),
+    "compress_document": lambda doc, p: compressdocument_doc(doc, p),
+}
+
+
+def list_operations() -> List[str]:
+    """Names of the operations that can be applied to a loaded document"""
+    return sorted(OPERATIONS)
+
+
+def apply_operation(doc: PdfDocument, operation: str, params: Dict[str, Any] = None) -> PdfDocument:
+    """Apply a named in-memory operation to a loaded document.
+
+    Args:
+        doc: The loaded document
+        operation: Operation name (see OPERATIONS)
+        params: The operation's parameters and options (see operation_params)
+
+    Returns:
+        The document to continue with: doc itself, or a replacement in which
+        case doc has been closed
+
+    Raises:
+        ValueError: If the operation is unknown or a required parameter is missing
+    """
+    func = OPERATIONS.get(operation)
+    if func is None:
+        raise ValueError(
+            f"Unsupported operation: {operation} (expected one of {', '.join(list_operations())})"
+        )
+    result = func(doc, operation_params(params))
+    if not isinstance(result, PdfDocument) or result is doc:
+        return doc
+    doc.Close()
+    return result
@@ -0,0 +1,100 @@
+import base64
+import binascii
+import logging
+import os
+import tempfile
+from typing import Optional, Union
+
+from spire.pdf import *
+
+from spire_pdf_mcp.core.documentcache import load_document, load_document_from_stream
+from spire_pdf_mcp.utils.metrics import phase
+from spire_pdf_mcp.utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Documents up to this size are passed to and from Spire as in-memory
+# streams; larger ones go through a spool file. Copying a Stream back into
+# Python goes byte by byte in the binding, so beyond a few hundred KB a
+# native write to tmpfs plus a file read is much faster, and a spooled input
+# is not held in memory twice while it is parsed.
+SPOOL_THRESHOLD = int(float(os.environ.get("PDF_SPOOL_THRESHOLD_KB", 256)) * 1024)
+
+
+def _default_spool_dir() -> str:
+    # /dev/shm is tmpfs on Linux: spooled files never reach a disk
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+SPOOL_DIR = os.environ.get("PDF_SPOOL_DIR") or _default_spool_dir()
+
+
+def decode_pdf_data(data: Union[str, bytes]) -> bytes:
+    """
+    The bytes of a Pdf given as bytes, base64 text or a base64 data: URI.
+
+    Raises:
+        ValueError: If the text is not base64 or the content is not a Pdf
+    """
+    if isinstance(data, str):
+        text = data.strip()
+        if text.startswith("data:"):
+            text = text.split(",", 1)[-1]
+        try:
+            data = base64.b64decode(text, validate=True)
+        except (binascii.Error, ValueError):
+            raise ValueError("Pdf data is not valid base64")
+    elif isinstance(data, (bytearray, memoryview)):
+        data = bytes(data)
+    if b"%PDF-" not in data[:1024]:
+        raise ValueError("Pdf data does not hold a PDF file")
+    return data
+
+
+def encode_pdf_data(data: bytes) -> str:
+    """Base64 text of a Pdf's bytes"""
+    return base64.b64encode(data).decode("ascii")
+
+
+def _spool_file(prefix: str) -> str:
+    fd, path = tempfile.mkstemp(prefix=prefix, suffix=".pdf", dir=SPOOL_DIR)
+    os.close(fd)
+    return path
+
+
+def load_document_from_bytes(data: Union[str, bytes], password: Optional[str] = None) -> PdfDocument:
+    """Parse a Pdf given as bytes or base64 (see decode_pdf_data) into a new PdfDocument owned by the caller"""
+    data = decode_pdf_data(data)
+    if len(data) <= SPOOL_THRESHOLD:
+        return load_document_from_stream(Stream(data), password)
+    path = _spool_file(".spire-pdf-in-")
+    try:
+        with open(path, "wb") as f:
+            f.write(data)
+        del data
+        return load_document(path, password)
+    finally:
+        os.remove(path)
+
+
+def save_document_to_bytes(doc: PdfDocument) -> bytes:
+    """Serialize a loaded document to the bytes of a Pdf file"""
+    stream = Stream()
+    with phase("save"):
+        with span("PdfDocument.SaveToStream"):
+            doc.SaveToStream(stream)
+        return stream_bytes(stream)
+
+
+def stream_bytes(stream: Stream) -> bytes:
+    """The content of a Spire Stream, spooled through a file when it is large"""
+    if stream.Length <= SPOOL_THRESHOLD:
+        return stream.ToArray()
+    path = _spool_file(".spire-pdf-out-")
+    try:
+        stream.Save(path)
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(path)
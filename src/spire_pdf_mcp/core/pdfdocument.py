@@ -1,10 +1,19 @@
 import logging
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from spire.pdf import *
 
+from spire_pdf_mcp.core.documentcache import (cached_document, file_digest, load_document, load_document_from_stream,
+                                               save_document)
+from spire_pdf_mcp.core.textcache import get_text_cache, text_options_key
 from spire_pdf_mcp.utils.exceptions import PdfDocumentError
+from spire_pdf_mcp.utils.tracing import span
 from spire_pdf_mcp.utils.utils import *
 logger = logging.getLogger(__name__)
 
@@ -14,15 +23,18 @@ def create_pdfdocument(filepath: str) -> Dict[str, Any]:
     try:
         #Create a pdf document
         doc= PdfDocument()
-        #Create one page
-        page = doc.Pages.Add()
+        try:
+            #Create one page
+            page = doc.Pages.Add()
 
-        save_path = Path(filepath)
-        save_path.parent.mkdir(parents=True, exist_ok=True)
-        doc.SaveToFile(str(save_path))
+            save_path = Path(filepath)
+            save_path.parent.mkdir(parents=True, exist_ok=True)
+            save_document(doc, str(save_path))
+        finally:
+            doc.Close()
         return {
             "message": f"Created pdfdocument: {filepath}",
-            "pdfdocument": doc
+            "output_path": str(save_path)
         }
     except Exception as e:
         logger.error(f"Failed to create pdfdocument: {e}")
@@ -31,94 +43,471 @@ def create_pdfdocument(filepath: str) -> Dict[str, Any]:
 def get_or_create_pdfdocument(filepath: str) -> PdfDocument:
     """Get existing PdfDocument or create new one if it doesn't exist"""
     try:
-        doc= PdfDocument()
-        if Path(filepath).exists():
-            doc.LoadFromFile(filepath)
-        else:
-            doc = create_pdfdocument(filepath)["pdfdocument"]
+        if not Path(filepath).exists():
+            create_pdfdocument(filepath)
+        doc = load_document(filepath)
         return doc
     except Exception as e:
         logger.error(f"Failed to get or create pdfdocument: {e}")
         raise PdfDocumentError(f"Failed to get or create pdfdocument: {e!s}")
     
-def extract_text (filepath: str,options: Dict[str, Any] = None) -> Dict[str, Any]:
-    """Extract the text from the pdf"""
+# Default size of one inline extract_text chunk, in characters
+INLINE_TEXT_CHUNK_CHARS = 20000
+
+def text_extract_options(options: Dict[str, Any] = None) -> PdfTextExtractOptions:
+    """Build the PdfTextExtractOptions shared by every page of one extraction"""
+    options = options or {}
+    pdfTextExtractOptions = PdfTextExtractOptions()
+    if options.get("simple_extraction"):
+        pdfTextExtractOptions.IsSimpleExtraction = True
+    if options.get("show_hidden_text"):
+        pdfTextExtractOptions.IsShowHiddenText = True
+    return pdfTextExtractOptions
+
+def iter_page_text(doc: PdfDocument, page_indices: List[int],
+                   options: Dict[str, Any] = None) -> Iterator[Tuple[int, str]]:
+    """Extract text page by page, yielding (page index, text)"""
+    # One options object serves every page
+    pdfTextExtractOptions = text_extract_options(options)
+    for i in page_indices:
+        page = doc.Pages.get_Item(i)
+        pdfTextExtractor = PdfTextExtractor(page)
+        with span("PdfTextExtractor.ExtractText", **{"pdf.page": i + 1}):
+            text = pdfTextExtractor.ExtractText(pdfTextExtractOptions)
+        yield i, text
+
+class PageTextReader:
+    """Per-page text of a Pdf file, served from the on-disk text cache.
+
+    The file is only parsed when a requested page (or the page count) is not
+    cached; newly extracted pages are written back to the cache. Use as a
+    context manager so the borrowed document is released.
+
+    A caller that already loaded the file can pass it as document so misses
+    are extracted from it instead of parsing the file again.
+    """
+
+    # Extracted pages are written to the cache in batches of this size
+    FLUSH_PAGES = 64
+
+    def __init__(self, filepath: str, options: Dict[str, Any] = None,
+                 document: Optional[PdfDocument] = None):
+        self.filepath = filepath
+        self.options = options or {}
+        self._cache = get_text_cache()
+        self._digest = file_digest(filepath) if self._cache.enabled else None
+        self._options_key = text_options_key(self.options)
+        self._page_count, _ = self._lookup([])
+        self._stack = ExitStack()
+        self._doc = document
+        self._pending: Dict[int, str] = {}
+
+    def __enter__(self) -> "PageTextReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        try:
+            self._flush()
+        finally:
+            self._stack.close()
+
+    def _lookup(self, page_indices: List[int]) -> Tuple[Optional[int], Dict[int, str]]:
+        if self._digest is None:
+            return None, {}
+        return self._cache.lookup(self._digest, self._options_key, page_indices)
+
+    def _flush(self) -> None:
+        if self._pending and self._digest is not None:
+            self._cache.store(self._digest, self._options_key, self.page_count, self._pending)
+        self._pending = {}
+
+    def _document(self) -> PdfDocument:
+        if self._doc is None:
+            # Borrow the parsed pdf document from the shared cache (read-only)
+            self._doc = self._stack.enter_context(cached_document(self.filepath))
+        return self._doc
+
+    @property
+    def page_count(self) -> int:
+        if self._page_count is None:
+            self._page_count = self._document().Pages.Count
+        return self._page_count
+
+    def pages(self, page_indices: List[int]) -> Iterator[Tuple[int, str]]:
+        """Yield (page index, text) for each requested page, in order"""
+        _, cached = self._lookup(page_indices)
+        missing = [i for i in page_indices if i not in cached]
+        extracted = None
+        for i in page_indices:
+            if i in cached:
+                yield i, cached[i]
+                continue
+            if extracted is None:
+                # Parse the document only once a page has to be extracted
+                extracted = iter_page_text(self._document(), missing, self.options)
+            _, text = next(extracted)
+            if self._digest is not None:
+                self._pending[i] = text
+                if len(self._pending) >= self.FLUSH_PAGES:
+                    self._flush()
+            yield i, text
+
+def _parse_text_cursor(cursor: Any) -> Tuple[int, int]:
+    """Parse a cursor of the form "<position in page selection>:<offset in that page>"."""
+    if cursor in (None, ""):
+        return 0, 0
     try:
-        doc= PdfDocument()
-        if Path(filepath).exists():
-            doc.LoadFromFile(filepath)
-        else:
-            doc = create_pdfdocument(filepath)["pdfdocument"]
+        position, offset = (int(part) for part in str(cursor).split(":"))
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if position < 0 or offset < 0:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return position, offset
 
-        output_dir = os.path.dirname(filepath)
-        if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
-        save_path = Path(filepath)
-        base_name = save_path.stem
-        text_output_path = os.path.join(output_dir, f"{base_name}.txt")
-        
-        # Create a buffer to store the extracted text
-        sbuffer = []
+def _extract_text_inline(reader: PageTextReader, page_indices: List[int],
+                         options: Dict[str, Any]) -> Dict[str, Any]:
+    """Return one chunk of text and the cursor of the next chunk"""
+    max_chars = int(options.get("max_chars", INLINE_TEXT_CHUNK_CHARS))
+    if max_chars <= 0:
+        raise ValueError(f"max_chars must be positive, got {max_chars}")
+    position, offset = _parse_text_cursor(options.get("cursor"))
 
-        # Iterate through each page in the document
-        for i in range(doc.Pages.Count):
-            page = doc.Pages.get_Item(i)
+    parts = []
+    used = 0
+    next_cursor = None
+    first_page = last_page = None
+    for n, (i, text) in enumerate(reader.pages(page_indices[position:])):
+        text = text[offset:] if n == 0 else text
+        page_offset = offset if n == 0 else 0
+        if first_page is None:
+            first_page = i + 1
+        room = max_chars - used
+        if len(text) > room:
+            parts.append(text[:room])
+            last_page = i + 1
+            next_cursor = f"{position + n}:{page_offset + room}"
+            break
+        parts.append(text)
+        used += len(text)
+        last_page = i + 1
+        if used >= max_chars and position + n + 1 < len(page_indices):
+            next_cursor = f"{position + n + 1}:0"
+            break
 
-            # Create a PdfTextExtractor object for the page
-            pdfTextExtractor = PdfTextExtractor(page)
+    text = "\n".join(parts)
+    if first_page is None:
+        header = "No text left to extract"
+    else:
+        header = f"Text of pages {first_page}-{last_page} ({len(page_indices)} pages selected)"
+    if next_cursor:
+        header += f"; more text follows, call again with cursor={next_cursor}"
+    return {
+        "message": f"{header}\n\n{text}",
+        "text": text,
+        "next_cursor": next_cursor
+    }
+
+def extract_text (filepath: str,options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Extract the text from the pdf.
 
-            # Create PdfTextExtractOptions object
-            pdfTextExtractOptions = PdfTextExtractOptions()
+    Text is written page by page to <stem>.txt next to the source, or with
+    the inline option returned in chunks of max_chars characters.
+
+    Options:
+        pages: Page selection such as "1-3,5" (default: all pages)
+        inline: Return the text instead of writing a file
+        max_chars: Characters per inline chunk (default: 20000)
+        cursor: next_cursor of the previous inline chunk
+        simple_extraction: Use Spire's simple extraction mode
+        show_hidden_text: Include hidden text
+    """
+    options = options or {}
+    try:
+        if not Path(filepath).exists():
+            create_pdfdocument(filepath)
+
+        # Cached pages are served without parsing the pdf document
+        with PageTextReader(filepath, options) as reader:
+            page_indices = parse_page_range(options.get("pages"), reader.page_count)
+            if options.get("inline"):
+                return _extract_text_inline(reader, page_indices, options)
+
+            output_dir = os.path.dirname(filepath)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            save_path = Path(filepath)
+            base_name = save_path.stem
+            text_output_path = os.path.join(output_dir, f"{base_name}.txt")
+
+            # Write each page as soon as it is extracted
+            with open(text_output_path, 'w', encoding='utf-8') as file:
+                for _, text in reader.pages(page_indices):
+                    file.write(f"{text}\n")
 
-            # Extract the text from the page
-            sbuffer.append(pdfTextExtractor.ExtractText(pdfTextExtractOptions))
-        
-        AppendAllText(text_output_path, sbuffer)    
-            
         return {
-            "message": f"Text extraction to file: {text_output_path}"
+            "message": f"Text extraction to file: {text_output_path}",
+            "output_path": text_output_path
         }
     except Exception as e:
         logger.error(f"Failed to text extraction: {e}")
         raise PdfDocumentError(f"Failed to text extraction: {e!s}")    
     
+def _check_merge_input(filepath: str) -> Optional[str]:
+    """Cheap up-front check of a merge input; returns why it is unusable, or None"""
+    try:
+        with open(filepath, "rb") as f:
+            header = f.read(1024)
+    except FileNotFoundError:
+        return "not found"
+    except OSError as e:
+        return f"not readable ({e.strerror or e})"
+    if b"%PDF-" not in header:
+        return "not a PDF file"
+    return None
+
+def _merge_batch(inputs: List[Tuple[str, Any]], output_path: str) -> List[Dict[str, Any]]:
+    """
+    Append the selected pages of each input to a new document saved at output_path.
+
+    Imported pages still reference their source document (see splitdocument),
+    so the sources stay open until the merged document is saved; the batch
+    size bounds how many are open at once. An input that fails to load is
+    skipped and reported.
+
+    Returns:
+        One entry per input with its page count and time, or its error
+    """
+    merged = PdfDocument()
+    sources = []
+    entries = []
+    try:
+        for filepath, pages in inputs:
+            started = time.perf_counter()
+            try:
+                source = load_document(filepath)
+                sources.append(source)
+                page_indices = parse_page_range(pages, source.Pages.Count)
+                for first, last in _page_runs(page_indices):
+                    merged.InsertPageRange(source, first, last)
+                entries.append({"file": filepath, "pages": len(page_indices),
+                                "seconds": round(time.perf_counter() - started, 3)})
+            except Exception as e:
+                error = short_error(e)
+                logger.warning(f"Skipping {filepath} in merge: {error}")
+                entries.append({"file": filepath, "error": error})
+        if any("pages" in entry for entry in entries):
+            save_document(merged, output_path)
+    finally:
+        merged.Close()
+        for source in sources:
+            source.Close()
+    return entries
+
+def _merged_inputs(results: List[Dict[str, Any]],
+                   members: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    The input entries held by the intermediate files that merged cleanly.
+
+    members maps each intermediate file to the entries of the inputs it
+    holds; the inputs of an intermediate file that failed to merge are
+    marked with its error.
+    """
+    kept = []
+    for result in results:
+        inputs = members.pop(result["file"])
+        if "error" in result:
+            for entry in inputs:
+                entry.pop("pages", None)
+                entry.pop("seconds", None)
+                entry["error"] = f"lost merging an intermediate file ({result['error']})"
+        else:
+            kept.extend(inputs)
+    return kept
+
 def merge_pdfs(filepaths: List[str], output_path: str, options: Dict[str, Any] = None) -> Dict[str, Any]:
     """
-    Merge multiple PDF files into one using pdfmerger library.
-    
+    Merge multiple PDF files into one.
+
+    Inputs are checked up front in parallel and unusable ones are dropped.
+    Large merges are done hierarchically: batches of inputs are merged into
+    intermediate files in parallel, and those are merged into the result, so
+    only one batch per worker is open at a time.
+
     Args:
         filepaths: List of PDF file paths to be merged
         output_path: Path where the merged PDF will be saved
-    
+        options:
+            page_ranges: Page selection per input, aligned with filepaths
+                (e.g. ["1-3", None, "5-"]; default: all pages)
+            batch_size: Inputs merged per intermediate file (default: 50)
+            workers: Batches merged at once (default: min(4, CPU count))
+
     Returns:
         Dictionary containing the operation result
     """
+    options = options or {}
     try:
         # Check if output directory exists, create if not
         output_dir = os.path.dirname(filepaths[0])
         if output_dir:
             os.makedirs(output_dir, exist_ok=True)
-        merge_pdfs_output_path = os.path.join(output_dir, output_path)            
-        
-        # Iterate through all PDF files to be merged
-        for filepath in filepaths:
-            if not Path(filepath).exists():
-                logger.warning(f"PDF file not found: {filepath}")
-                continue
-                
-        # Add PDF file using mergebyfile method
-        mergeOp = MergerOptions()
-        # Create a PDF merger 
-        PdfMerger.MergeByFile(filepaths,merge_pdfs_output_path,mergeOp)
-        
+        merge_pdfs_output_path = os.path.join(output_dir, output_path)
+
+        page_ranges = options.get("page_ranges") or [None] * len(filepaths)
+        if len(page_ranges) != len(filepaths):
+            raise ValueError(f"page_ranges has {len(page_ranges)} entries for {len(filepaths)} files")
+        batch_size = max(2, int(options.get("batch_size", 50)))
+        workers = max(1, int(options.get("workers", min(4, os.cpu_count() or 1))))
+
+        # Validate every input before merging anything
+        with ThreadPoolExecutor(max_workers=min(16, len(filepaths))) as pool:
+            problems = list(pool.map(_check_merge_input, filepaths))
+        skipped = [{"file": f, "error": problem} for f, problem in zip(filepaths, problems) if problem]
+        for entry in skipped:
+            logger.warning(f"PDF file {entry['error']}: {entry['file']}")
+        inputs = [(f, pages) for f, pages, problem in zip(filepaths, page_ranges, problems) if not problem]
+        if not inputs:
+            raise ValueError("None of the input files can be merged")
+
+        started = time.perf_counter()
+        if len(inputs) <= batch_size:
+            entries = _merge_batch(inputs, merge_pdfs_output_path)
+        else:
+            with tempfile.TemporaryDirectory(prefix=".merge-", dir=output_dir or None) as work_dir:
+                batches = [inputs[i:i + batch_size] for i in range(0, len(inputs), batch_size)]
+                parts = [os.path.join(work_dir, f"batch-{n}.pdf") for n in range(len(batches))]
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(_merge_batch, batches, parts))
+                entries = [entry for result in results for entry in result]
+                # The inputs held by each intermediate file; batches that
+                # produced no pages wrote no file
+                members = {part: [entry for entry in result if "pages" in entry]
+                           for part, result in zip(parts, results)}
+                parts = [part for part in parts if members[part]]
+                level = 0
+                while len(parts) > batch_size:
+                    level += 1
+                    groups = [[(part, None) for part in parts[i:i + batch_size]]
+                              for i in range(0, len(parts), batch_size)]
+                    merged = [os.path.join(work_dir, f"level{level}-{n}.pdf") for n in range(len(groups))]
+                    with ThreadPoolExecutor(max_workers=workers) as pool:
+                        results = list(pool.map(_merge_batch, groups, merged))
+                    for part, result in zip(merged, results):
+                        members[part] = _merged_inputs(result, members)
+                    parts = [part for part in merged if members[part]]
+                if parts:
+                    _merged_inputs(_merge_batch([(part, None) for part in parts], merge_pdfs_output_path),
+                                   members)
+        elapsed = time.perf_counter() - started
+
+        merged_entries = [entry for entry in entries if "pages" in entry]
+        skipped += [entry for entry in entries if "pages" not in entry]
+        if not merged_entries:
+            raise ValueError("None of the input files can be merged: "
+                             + "; ".join(f"{e['file']}: {e['error']}" for e in skipped))
+        total_pages = sum(entry["pages"] for entry in merged_entries)
+        lines = [f"- {os.path.basename(e['file'])}: {e['pages']} pages ({e['seconds']:.2f}s)"
+                 for e in merged_entries]
+        lines += [f"- {os.path.basename(e['file'])}: skipped ({e['error']})" for e in skipped]
         return {
-            "message": f"PDFs merged successfully and saved to: {merge_pdfs_output_path}",
-            "output_path": merge_pdfs_output_path
+            "message": (f"PDFs merged successfully and saved to: {merge_pdfs_output_path} "
+                        f"({len(merged_entries)} of {len(filepaths)} files, {total_pages} pages, {elapsed:.2f}s)\n"
+                        + "\n".join(lines)),
+            "output_path": merge_pdfs_output_path,
+            "inputs": merged_entries,
+            "skipped": skipped
         }
-        
+
     except Exception as e:
         logger.error(f"Failed to merge PDFs: {e}")
-        raise PdfDocumentError(f"Failed to merge PDFs: {e!s}")     
+        raise PdfDocumentError(f"Failed to merge PDFs: {e!s}")
+    
+def watermark_settings(options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Watermark parameters from options, with the historical defaults"""
+    options = options or {}
+    settings = {
+        "font_size": float(options.get("font_size", 24.0)),
+        "opacity": float(options.get("opacity", 0.3)),
+        "rotation": float(options.get("rotation", 45.0)),
+        "color": str(options.get("color", "Violet")),
+        "font_family": str(options.get("font_family", "Helvetica")),
+        "columns": int(options.get("columns", 2)),
+        "rows": int(options.get("rows", 3))
+    }
+    if not 0.0 <= settings["opacity"] <= 1.0:
+        raise ValueError(f"opacity must be between 0 and 1, got {settings['opacity']}")
+    if settings["font_size"] <= 0 or settings["columns"] < 1 or settings["rows"] < 1:
+        raise ValueError("font_size, columns and rows must be positive")
+    return settings
+
+def _watermark_brush(color: str) -> PdfBrush:
+    if re.fullmatch(r"#?[0-9a-fA-F]{6}", color):
+        value = color.lstrip("#")
+        return PdfSolidBrush(PdfRGBColor(int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)))
+    getter = getattr(PdfBrushes, f"get_{color[:1].upper()}{color[1:]}", None)
+    if getter is None:
+        raise ValueError(f"Unknown color: {color} (use a name such as Violet or #RRGGBB)")
+    return getter()
+
+def watermark_template(watermark_text: str, settings: Dict[str, Any],
+                       width: float, height: float) -> PdfTemplate:
+    """Build the watermark for one page size as a single Form XObject.
+
+    Every page of that size draws the same template, so the saved file holds
+    the watermark once instead of once per page.
+    """
+    family = getattr(PdfFontFamily, settings["font_family"], None)
+    if family is None:
+        raise ValueError(f"Unknown font_family: {settings['font_family']}")
+    font = PdfFont(family, settings["font_size"])
+    brush = _watermark_brush(settings["color"])
+    string_format = PdfStringFormat(PdfTextAlignment.Center)
+    tile_width = width / float(settings["columns"])
+    tile_height = height / float(settings["rows"])
+
+    template = PdfTemplate(width, height)
+    graphics = template.Graphics
+    graphics.SetTransparency(settings["opacity"])
+    for row in range(settings["rows"]):
+        for column in range(settings["columns"]):
+            graphics.Save()
+            graphics.TranslateTransform(tile_width * (column + 0.5), tile_height * (row + 0.5))
+            graphics.RotateTransform(-settings["rotation"])
+            graphics.DrawString(watermark_text, font, brush, 0.0, 0.0, string_format)
+            graphics.Restore()
+    graphics.SetTransparency(1.0)
+    return template
+
+def add_text_watermark_doc(document: PdfDocument, watermark_text: str,
+                           options: Dict[str, Any] = None) -> None:
+    """
+    Draw a tiled text watermark on the pages of a loaded document.
+
+    Options:
+        font_size: Font size of the watermark (default: 24)
+        opacity: Opacity of the watermark (0.0-1.0, default: 0.3)
+        rotation: Rotation angle of the watermark in degrees (default: 45)
+        color: Color name such as Violet or Red, or #RRGGBB (default: Violet)
+        font_family: Helvetica, TimesRoman or Courier (default: Helvetica)
+        columns / rows: Watermark repetitions across / down a page (default: 2 / 3)
+        pages: Page selection such as "1-3,5" (default: all pages)
+    """
+    options = options or {}
+    settings = watermark_settings(options)
+    page_indices = parse_page_range(options.get("pages"), document.Pages.Count)
+
+    # One template per page size, drawn on every page of that size. Templates
+    # are built per document: once drawn they belong to that document.
+    templates: Dict[Tuple[float, float], PdfTemplate] = {}
+    for i in page_indices:
+        page = document.Pages.get_Item(i)
+        size = page.Canvas.ClientSize
+        key = (round(size.Width, 2), round(size.Height, 2))
+        template = templates.get(key)
+        if template is None:
+            template = templates[key] = watermark_template(watermark_text, settings, size.Width, size.Height)
+        page.Canvas.DrawTemplate(template, PointF(0.0, 0.0))
     
 def add_text_watermark(input_path: str, output_path: str, watermark_text: str, 
                        options: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -129,6 +518,7 @@ def add_text_watermark(input_path: str, output_path: str, watermark_text: str,
         input_path: Path to the original PDF file
         output_path: Path to save the PDF with watermark
         watermark_text: Text content of the watermark
+        options: Watermark parameters and page selection (see add_text_watermark_doc)
     
     Returns:
         Dictionary containing the operation result
@@ -145,36 +535,15 @@ def add_text_watermark(input_path: str, output_path: str, watermark_text: str,
         add_text_watermark_output_path = os.path.join(output_dir, output_path)                
             
         # Load the PDF document
-        document = PdfDocument()
-        document.LoadFromFile(input_path)
-        
-        #default options
-        #font_size: Font size of the watermark (default: 24)
-        #opacity: Opacity of the watermark (0.0-1.0, default: 0.3)
-        #rotation: Rotation angle of the watermark in degrees (default: 45)
-        font_size = 24.0
-        opacity = 0.3
-        opacity1 = 1.0
-        rotation = 45.0
-        
-        # Loop through each page
-        for i in range(document.Pages.Count):
-            page = document.Pages.get_Item(i)
-            
-            #Draw text watermark
-            brush = PdfTilingBrush(SizeF(page.Canvas.ClientSize.Width / float(2), page.Canvas.ClientSize.Height / float(3)))
-            brush.Graphics.SetTransparency(opacity)
-            brush.Graphics.Save()
-            brush.Graphics.TranslateTransform(brush.Size.Width / float(2), brush.Size.Height / float(2))
-            brush.Graphics.RotateTransform(-rotation)
-            brush.Graphics.DrawString(watermark_text, PdfFont(PdfFontFamily.Helvetica, font_size), PdfBrushes.get_Violet(), 0.0, 0.0, PdfStringFormat(PdfTextAlignment.Center))
-            brush.Graphics.Restore()
-            brush.Graphics.SetTransparency(opacity1)
-            page.Canvas.DrawRectangle(brush, RectangleF(PointF(0.0, 0.0), page.Canvas.ClientSize))
-        
-        # Save the document with watermark
-        document.SaveToFile(add_text_watermark_output_path)
-        document.Close()
+        document = load_document(input_path)
+        try:
+            # Draw the watermark on the selected pages
+            add_text_watermark_doc(document, watermark_text, options)
+
+            # Save the document with watermark
+            save_document(document, add_text_watermark_output_path)
+        finally:
+            document.Close()
         
         return {
             "message": f"Text watermark added successfully and saved to: {add_text_watermark_output_path}",
@@ -185,6 +554,80 @@ def add_text_watermark(input_path: str, output_path: str, watermark_text: str,
         logger.error(f"Failed to add text watermark: {e}")
         raise PdfDocumentError(f"Failed to add text watermark: {e!s}")    
     
+# Named OptimizationOptions recipes; "default" is the historical one
+COMPRESSION_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {"image_quality": "low", "resize_images": True, "compress_images": True,
+                "compress_fonts": False, "compress_contents": False, "unembed_fonts": False},
+    # Smallest output for long-term storage; fonts stay embedded
+    "archive": {"image_quality": "low", "resize_images": True, "compress_images": True,
+                "compress_fonts": True, "compress_contents": True, "unembed_fonts": False},
+    # Balanced size and on-screen quality for downloads
+    "web": {"image_quality": "medium", "resize_images": True, "compress_images": True,
+            "compress_fonts": True, "compress_contents": True, "unembed_fonts": False},
+    # Keeps image resolution and fonts intact, only recompresses
+    "print": {"image_quality": "high", "resize_images": False, "compress_images": True,
+              "compress_fonts": False, "compress_contents": True, "unembed_fonts": False}
+}
+
+def compression_settings(options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Resolve the profile in options and apply the explicit overrides on top"""
+    options = options or {}
+    profile = str(options.get("profile", "default")).lower()
+    if profile not in COMPRESSION_PROFILES:
+        raise ValueError(f"Unknown compression profile: {profile} "
+                         f"(supported: {', '.join(COMPRESSION_PROFILES)})")
+    settings = dict(COMPRESSION_PROFILES[profile])
+    for name in settings:
+        if name in options:
+            settings[name] = options[name]
+    quality = str(settings["image_quality"]).capitalize()
+    if quality not in ("Low", "Medium", "High"):
+        raise ValueError(f"image_quality must be low, medium or high, got {settings['image_quality']}")
+    settings["image_quality"] = quality.lower()
+    settings["profile"] = profile
+    return settings
+
+def compression_options(options: Dict[str, Any] = None) -> OptimizationOptions:
+    """Build the OptimizationOptions used to compress a document"""
+    settings = compression_settings(options)
+    cpoptions = OptimizationOptions()
+    cpoptions.SetImageQuality(getattr(ImageQuality, settings["image_quality"].capitalize()))
+    cpoptions.SetIsCompressFonts(bool(settings["compress_fonts"]))
+    cpoptions.SetIsCompressImage(bool(settings["compress_images"]))
+    cpoptions.SetIsCompressContents(bool(settings["compress_contents"]))
+    cpoptions.SetResizeImages(bool(settings["resize_images"]))
+    cpoptions.SetIsUnembedFonts(bool(settings["unembed_fonts"]))
+    return cpoptions
+
+def compressdocument_doc_to(doc: PdfDocument, target: Union[str, Stream],
+                            options: Dict[str, Any] = None) -> None:
+    """Compress a loaded document into a file path or Stream.
+
+    PdfCompressor only works on serialized documents, so the document is
+    written to a memory stream first.
+    """
+    source = Stream()
+    with span("PdfDocument.SaveToStream"):
+        doc.SaveToStream(source)
+    pdfcompressor = PdfCompressor(source)
+    pdfcompressor.OptimizationOptions = compression_options(options)
+    if isinstance(target, str):
+        with span("PdfCompressor.CompressToFile", **{"file.path": target}):
+            pdfcompressor.CompressToFile(target)
+    else:
+        with span("PdfCompressor.CompressToStream"):
+            pdfcompressor.CompressToStream(target)
+
+def compressdocument_doc(doc: PdfDocument, options: Dict[str, Any] = None) -> PdfDocument:
+    """Compress a loaded document in memory.
+
+    Returns:
+        A new PdfDocument holding the compressed content; the caller closes both
+    """
+    compressed = Stream()
+    compressdocument_doc_to(doc, compressed, options)
+    return load_document_from_stream(compressed)
+    
 def compressdocument(input_path: str, output_path: str,
                        options: Dict[str, Any] = None) -> Dict[str, Any]:
     """
@@ -193,9 +636,15 @@ def compressdocument(input_path: str, output_path: str,
     Args:
         input_path: Path to the original PDF file
         output_path: Path to save the PDF 
+        options:
+            profile: default, archive, web or print (see COMPRESSION_PROFILES)
+            image_quality: low, medium or high
+            resize_images, compress_images, compress_fonts, compress_contents,
+            unembed_fonts: Override the profile's setting
     
     Returns:
-        Dictionary containing the operation result
+        Dictionary containing the operation result, with the input and
+        output sizes, their ratio and the elapsed time
     """
     try:
         # Check if input file exists
@@ -207,62 +656,180 @@ def compressdocument(input_path: str, output_path: str,
         if output_dir:
             os.makedirs(output_dir, exist_ok=True)
         compressdocument_output_path = os.path.join(output_dir, output_path)                
+        if os.path.dirname(compressdocument_output_path):
+            os.makedirs(os.path.dirname(compressdocument_output_path), exist_ok=True)
+        settings = compression_settings(options)
             
         # Load the PDF document
+        started = time.perf_counter()
         pdfcompressor = PdfCompressor(input_path)
-        cpoptions = OptimizationOptions()
-        cpoptions.SetImageQuality(ImageQuality.Low)
-        cpoptions.SetIsCompressFonts(False)
-        cpoptions.SetIsCompressImage(True)
-        cpoptions.SetIsCompressContents(False)
-        cpoptions.SetResizeImages(True)
-        pdfcompressor.OptimizationOptions = cpoptions
-        pdfcompressor.CompressToFile(compressdocument_output_path)
-        
+        pdfcompressor.OptimizationOptions = compression_options(options)
+        with span("PdfCompressor.CompressToFile", **{"file.path": compressdocument_output_path}):
+            pdfcompressor.CompressToFile(compressdocument_output_path)
+        elapsed = time.perf_counter() - started
+
+        input_bytes = os.path.getsize(input_path)
+        output_bytes = os.path.getsize(compressdocument_output_path)
+        ratio = output_bytes / input_bytes if input_bytes else 1.0
         return {
-            "message": f"Compress document successfully and saved to: {compressdocument_output_path}",
-            "output_path": compressdocument_output_path
+            "message": (f"Compress document successfully and saved to: {compressdocument_output_path} "
+                        f"({input_bytes:,} -> {output_bytes:,} bytes, {ratio:.1%} of the original, "
+                        f"{elapsed:.2f}s, profile {settings['profile']})"),
+            "output_path": compressdocument_output_path,
+            "profile": settings["profile"],
+            "input_bytes": input_bytes,
+            "output_bytes": output_bytes,
+            "ratio": round(ratio, 4),
+            "seconds": round(elapsed, 3)
         }
         
     except Exception as e:
         logger.error(f"Failed to compress document: {e}")
         raise PdfDocumentError(f"Failed to compress document: {e!s}")       
     
-def splitdocument(input_path: str, 
+def _page_runs(page_indices: List[int]) -> List[Tuple[int, int]]:
+    """Group sorted page indices into (first, last) runs of consecutive pages"""
+    runs = []
+    for i in page_indices:
+        if runs and runs[-1][1] == i - 1:
+            runs[-1] = (runs[-1][0], i)
+        else:
+            runs.append((i, i))
+    return runs
+
+def split_plan(doc: PdfDocument, base_name: str, options: Dict[str, Any] = None) -> List[Tuple[str, List[int]]]:
+    """
+    Work out the parts of a split as (file name, page indices).
+
+    Options (at most one):
+        ranges: Page selections, one per part, as a list or separated by ";"
+            (e.g. ["1-3", "4-10", "11-"] or "1-3;4-10;11-")
+        every: Number of pages per part
+        at_bookmarks: Start a new part at each top-level bookmark
+    Without a spec every page becomes its own part, named <stem>-<index>.pdf
+    as before.
+    """
+    options = options or {}
+    page_count = doc.Pages.Count
+    specs = [name for name in ("ranges", "every", "at_bookmarks") if options.get(name)]
+    if len(specs) > 1:
+        raise ValueError(f"Use only one of ranges, every and at_bookmarks (got {', '.join(specs)})")
+
+    if options.get("ranges"):
+        ranges = options["ranges"]
+        if isinstance(ranges, str):
+            ranges = [r for r in ranges.split(";") if r.strip()]
+        return [(f"{base_name}-part{n}.pdf", parse_page_range(spec, page_count))
+                for n, spec in enumerate(ranges, 1)]
+
+    if options.get("every"):
+        every = int(options["every"])
+        if every < 1:
+            raise ValueError(f"every must be at least 1, got {every}")
+        return [(f"{base_name}-part{n}.pdf", list(range(start, min(start + every, page_count))))
+                for n, start in enumerate(range(0, page_count, every), 1)]
+
+    if options.get("at_bookmarks"):
+        starts: Dict[int, str] = {}
+        for i in range(doc.Bookmarks.Count):
+            bookmark = doc.Bookmarks.get_Item(i)
+            if bookmark.Destination is None or bookmark.Destination.Page is None:
+                continue
+            index = doc.Pages.IndexOf(bookmark.Destination.Page)
+            # The first bookmark on a page names the part
+            if index >= 0 and index not in starts:
+                starts[index] = bookmark.Title
+        # Pages before the first bookmark form their own part
+        starts.setdefault(0, "front")
+        boundaries = sorted(starts) + [page_count]
+        return [(f"{base_name}-{n}-{safe_file_name(starts[start])}.pdf", list(range(start, end)))
+                for n, (start, end) in enumerate(zip(boundaries, boundaries[1:]), 1)]
+
+    return [(f"{base_name}-{i}.pdf", [i]) for i in range(page_count)]
+
+def _extract_part(doc: PdfDocument, page_indices: List[int]) -> PdfDocument:
+    part = PdfDocument()
+    try:
+        for first, last in _page_runs(page_indices):
+            part.InsertPageRange(doc, first, last)
+    except BaseException:
+        part.Close()
+        raise
+    return part
+
+def _write_parts(doc: PdfDocument, jobs: List[Tuple[str, List[int]]]) -> None:
+    """Cut parts from doc and save them one after another"""
+    for path, page_indices in jobs:
+        part = _extract_part(doc, page_indices)
+        try:
+            save_document(part, path)
+        finally:
+            part.Close()
+
+def _write_parts_from_file(input_path: str, jobs: List[Tuple[str, List[int]]]) -> None:
+    """Worker thread entry point: cut a share of the parts from a private copy of the source"""
+    doc = load_document(input_path)
+    try:
+        _write_parts(doc, jobs)
+    finally:
+        doc.Close()
+
+def splitdocument(input_path: str,
                        options: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Split the content in an existing PDF file.
-    
+
+    With one worker the parts are cut from the cached source and saved one
+    after another. With more, each worker parses its own copy of the source
+    and writes its share of the parts: a part built with InsertPageRange
+    still references its source, and Spire documents are not safe for
+    concurrent use, so threads never share one.
+
     Args:
         input_path: Path to the original PDF file
-        output_path: Path to save the PDF 
-    
+        options: Split spec (see split_plan) plus
+            output_dir: Directory for the parts (default: next to the source)
+            workers: Parts written at once, each worker holding its own copy
+                of the source (default: min(4, CPU count))
+
     Returns:
         Dictionary containing the operation result
     """
+    options = options or {}
     try:
         # Check if input file exists
         if not Path(input_path).exists():
             raise FileNotFoundError(f"Input PDF file not found: {input_path}")
-            
+
         output_dir = os.path.dirname(input_path)
+        if options.get("output_dir"):
+            output_dir = os.path.join(output_dir, options["output_dir"])
         if output_dir:
             os.makedirs(output_dir, exist_ok=True)
         save_path = Path(input_path)
         base_name = save_path.stem
-        splitdocument_output_path = os.path.join(output_dir, f"{base_name}-{0}.pdf")           
-            
-        # Load the PDF document
-        doc = PdfDocument()
-        doc.LoadFromFile(input_path)
-        #Split document
-        doc.Split(splitdocument_output_path)
-        
+        workers = max(1, int(options.get("workers", min(4, os.cpu_count() or 1))))
+
+        # Borrow the parsed pdf document from the shared cache (read-only)
+        with cached_document(input_path) as doc:
+            plan = split_plan(doc, base_name, options)
+            jobs = [(os.path.join(output_dir, name), page_indices) for name, page_indices in plan if page_indices]
+            workers = min(workers, len(jobs))
+            if workers <= 1:
+                _write_parts(doc, jobs)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="spire-pdf-split") as pool:
+                list(pool.map(_write_parts_from_file, [input_path] * workers,
+                              [jobs[i::workers] for i in range(workers)]))
+        parts = [{"file": path, "pages": len(page_indices)} for path, page_indices in jobs]
+
+        lines = [f"- {os.path.basename(part['file'])} ({part['pages']} pages)" for part in parts]
         return {
-            "message": f"Split document successfully and saved to: {output_dir}",
-            "output_path": output_dir
+            "message": f"Split document into {len(parts)} files in: {output_dir}\n" + "\n".join(lines),
+            "output_path": output_dir,
+            "parts": parts
         }
-        
+
     except Exception as e:
         logger.error(f"Failed to split document: {e}")
-        raise PdfDocumentError(f"Failed to split document: {e!s}")             
\ No newline at end of file
+        raise PdfDocumentError(f"Failed to split document: {e!s}")
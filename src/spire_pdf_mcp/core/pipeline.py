@@ -0,0 +1,147 @@
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from spire.pdf import *
+
+from spire_pdf_mcp.core.documentcache import get_document_cache, load_document, save_document
+from spire_pdf_mcp.core.operations import OPERATIONS, apply_operation, list_operations, operation_params
+from spire_pdf_mcp.core.pdfdata import load_document_from_bytes, stream_bytes
+from spire_pdf_mcp.core.pdfdocument import compressdocument_doc_to
+from spire_pdf_mcp.utils.exceptions import PipelineError
+from spire_pdf_mcp.utils.metrics import phase
+from spire_pdf_mcp.utils.tracing import span
+from spire_pdf_mcp.utils.utils import *
+logger = logging.getLogger(__name__)
+
+
+def _validate_steps(steps: List[Dict[str, Any]]) -> None:
+    if not steps:
+        raise PipelineError("The pipeline needs at least one step")
+    for index, step in enumerate(steps):
+        if not isinstance(step, dict) or "operation" not in step:
+            raise PipelineError(f"Step {index + 1} must be an object with an 'operation' key")
+        if step["operation"] not in OPERATIONS:
+            raise PipelineError(
+                f"Step {index + 1}: unsupported operation {step['operation']} "
+                f"(expected one of {', '.join(list_operations())})"
+            )
+
+
+def _apply_steps(doc: PdfDocument, steps: List[Dict[str, Any]], timings: List[Dict[str, Any]]) -> PdfDocument:
+    """Apply the steps to doc, recording their timings; returns the document to continue with"""
+    for step in steps:
+        step_started = time.perf_counter()
+        doc = apply_operation(doc, step["operation"], step.get("options"))
+        timings.append({"step": step["operation"], "seconds": round(time.perf_counter() - step_started, 4)})
+    return doc
+
+
+def _describe_timings(timings: List[Dict[str, Any]]) -> str:
+    return ", ".join(f"{t['step']} {t['seconds']}s" for t in timings)
+
+
+def run_pipeline(filepath: str, output_path: str, steps: List[Dict[str, Any]],
+                 password: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Apply several operations to one in-memory document and save only the result.
+
+    Args:
+        filepath: Path to the original PDF file
+        output_path: Path to save the final PDF
+        steps: Ordered steps, each {"operation": name, "options": {...}} where
+            options holds the operation's parameters (see core/operations.py)
+        password: Password used to open an encrypted source
+
+    Returns:
+        Dictionary containing the operation result and per-step timings
+    """
+    _validate_steps(steps)
+    try:
+        if not Path(filepath).exists():
+            raise FileNotFoundError(f"Input PDF file not found: {filepath}")
+
+        started = time.perf_counter()
+        doc = load_document(filepath, password)
+        timings = [{"step": "load", "seconds": round(time.perf_counter() - started, 4)}]
+        try:
+            # A trailing compress step compresses straight to the output file
+            # instead of reparsing the compressed document only to save it.
+            final_compress = steps[-1]["operation"] == "compress_document"
+            doc = _apply_steps(doc, steps[:-1] if final_compress else steps, timings)
+
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            step_started = time.perf_counter()
+            if final_compress:
+                compressdocument_doc_to(doc, output_path, operation_params(steps[-1].get("options")))
+                timings.append({"step": "compress_document+save", "seconds": round(time.perf_counter() - step_started, 4)})
+            else:
+                save_document(doc, output_path)
+                timings.append({"step": "save", "seconds": round(time.perf_counter() - step_started, 4)})
+        finally:
+            doc.Close()
+        get_document_cache().invalidate(output_path)
+
+        return {
+            "message": f"Pipeline of {len(steps)} steps applied and saved to: {output_path} ("
+                       + _describe_timings(timings) + ")",
+            "output_path": output_path,
+            "timings": timings
+        }
+    except Exception as e:
+        logger.error(f"Failed to run pipeline: {e}")
+        raise PipelineError(f"Failed to run pipeline: {e!s}")
+
+
+def run_pipeline_data(data: Union[str, bytes], steps: List[Dict[str, Any]],
+                      password: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Apply several operations to a Pdf given as bytes and return the result as bytes.
+
+    The document is loaded from and saved to memory streams, so nothing is
+    written to the files directory; only documents above the spool
+    threshold pass through a tmpfs file (see core/pdfdata.py).
+
+    Args:
+        data: The Pdf as bytes or base64 text
+        steps: Ordered steps, as for run_pipeline
+        password: Password used to open an encrypted source
+
+    Returns:
+        Dictionary containing the resulting Pdf bytes under "data" and per-step timings
+    """
+    _validate_steps(steps)
+    try:
+        started = time.perf_counter()
+        doc = load_document_from_bytes(data, password)
+        timings = [{"step": "load", "seconds": round(time.perf_counter() - started, 4)}]
+        try:
+            final_compress = steps[-1]["operation"] == "compress_document"
+            doc = _apply_steps(doc, steps[:-1] if final_compress else steps, timings)
+
+            step_started = time.perf_counter()
+            output = Stream()
+            if final_compress:
+                compressdocument_doc_to(doc, output, operation_params(steps[-1].get("options")))
+            with phase("save"):
+                if not final_compress:
+                    with span("PdfDocument.SaveToStream"):
+                        doc.SaveToStream(output)
+                result = stream_bytes(output)
+            timings.append({"step": "compress_document+save" if final_compress else "save",
+                            "seconds": round(time.perf_counter() - step_started, 4)})
+        finally:
+            doc.Close()
+
+        return {
+            "message": f"Pipeline of {len(steps)} steps applied ({len(result)} bytes; "
+                       + _describe_timings(timings) + ")",
+            "data": result,
+            "timings": timings
+        }
+    except Exception as e:
+        logger.error(f"Failed to run pipeline: {e}")
+        raise PipelineError(f"Failed to run pipeline: {e!s}")
@@ -0,0 +1,328 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from spire_pdf_mcp.core.pdfdocument import PageTextReader
+from spire_pdf_mcp.utils.exceptions import SearchError
+from spire_pdf_mcp.utils.utils import short_error
+
+logger = logging.getLogger(__name__)
+
+# Seconds between scans of the files directory for changed files
+SEARCH_REFRESH_INTERVAL = float(os.environ.get("PDF_SEARCH_REFRESH_INTERVAL", 30))
+
+# CJK text has no spaces between words, so it is indexed per character
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"
+_TOKEN = re.compile(f"[{_CJK}]|[^\\W{_CJK}]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    page_count INTEGER NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    file_id INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    hits INTEGER NOT NULL,
+    PRIMARY KEY (term, file_id, page)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_file ON postings (file_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-case index terms"""
+    return _TOKEN.findall(text.lower())
+
+
+def _scan_pdf_files(root: str) -> Dict[str, Tuple[int, int]]:
+    """Relative path -> (size, mtime_ns) of every Pdf file below root"""
+    found = {}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            logger.warning(f"Cannot scan {directory}: {e}")
+            continue
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.name.lower().endswith(".pdf") and entry.is_file():
+                st = entry.stat()
+                found[os.path.relpath(entry.path, root)] = (st.st_size, st.st_mtime_ns)
+    return found
+
+
+class SearchIndex:
+    """Inverted index (term -> file/page postings) of the Pdf files below root.
+
+    The index lives in a SQLite file and is updated incrementally: only files
+    whose size or mtime changed since the last scan are re-extracted, using
+    the same per-page extraction (and text cache) as extract_text. Files that
+    cannot be read (encrypted, corrupt) are recorded with their error and
+    not retried until they change. Several processes may refresh the same
+    index; rows are upserted, so the last writer of a file wins.
+    """
+
+    def __init__(self, root: str, path: str):
+        self.root = root
+        self.path = path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            # Indexes written before failures were recorded lack the column
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+            if "error" not in columns:
+                conn.execute("ALTER TABLE files ADD COLUMN error TEXT")
+            self._initialized = True
+        return conn
+
+    def _last_refresh(self, conn: sqlite3.Connection) -> float:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_refresh'").fetchone()
+        return float(row[0]) if row else 0.0
+
+    def needs_refresh(self) -> bool:
+        """Whether the last scan is older than SEARCH_REFRESH_INTERVAL"""
+        conn = self._connect()
+        try:
+            return time.time() - self._last_refresh(conn) >= SEARCH_REFRESH_INTERVAL
+        finally:
+            conn.close()
+
+    def refresh(self, force: bool = False) -> Dict[str, int]:
+        """Bring the index up to date with the files on disk.
+
+        Returns:
+            Counts of indexed, removed and failed files
+        """
+        counts = {"indexed": 0, "removed": 0, "failed": 0}
+        # One refresh at a time per process; others wait and then find it fresh
+        with self._lock:
+            conn = self._connect()
+            try:
+                if not force and time.time() - self._last_refresh(conn) < SEARCH_REFRESH_INTERVAL:
+                    return counts
+                on_disk = _scan_pdf_files(self.root)
+                indexed = {path: (file_id, size, mtime_ns) for file_id, path, size, mtime_ns
+                           in conn.execute("SELECT id, path, size, mtime_ns FROM files")}
+
+                for path, (file_id, _, _) in indexed.items():
+                    if path not in on_disk:
+                        with conn:
+                            conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+                            conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                        counts["removed"] += 1
+
+                for path, (size, mtime_ns) in sorted(on_disk.items()):
+                    known = indexed.get(path)
+                    if known is not None and known[1:] == (size, mtime_ns):
+                        continue
+                    try:
+                        self._index_file(conn, path, size, mtime_ns)
+                        counts["indexed"] += 1
+                    except Exception as e:
+                        error = short_error(e)
+                        logger.warning(f"Failed to index {path}: {error}")
+                        self._record_failure(conn, path, size, mtime_ns, error)
+                        counts["failed"] += 1
+
+                with conn:
+                    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_refresh', ?)",
+                                 (str(time.time()),))
+            finally:
+                conn.close()
+        if counts["indexed"] or counts["removed"]:
+            logger.info(f"Search index updated: {counts}")
+        return counts
+
+    def _store_file(self, conn: sqlite3.Connection, path: str, size: int, mtime_ns: int,
+                    page_count: int, error: Optional[str]) -> int:
+        """Insert or update the row of a file and drop its postings; returns its id.
+
+        Runs inside the caller's transaction. Another process may have
+        indexed the same file meanwhile, so the row is upserted.
+        """
+        conn.execute(
+            "INSERT INTO files (path, size, mtime_ns, page_count, error) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns, "
+            "page_count = excluded.page_count, error = excluded.error",
+            (path, size, mtime_ns, page_count, error))
+        file_id = conn.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()[0]
+        conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+        return file_id
+
+    def _index_file(self, conn: sqlite3.Connection, path: str, size: int, mtime_ns: int) -> None:
+        postings = []
+        with PageTextReader(os.path.join(self.root, path)) as reader:
+            page_count = reader.page_count
+            for page, text in reader.pages(list(range(page_count))):
+                postings.extend((term, page, hits) for term, hits in Counter(tokenize(text)).items())
+        # Each file is replaced in its own transaction so progress survives interruptions
+        with conn:
+            file_id = self._store_file(conn, path, size, mtime_ns, page_count, None)
+            conn.executemany(
+                "INSERT INTO postings (term, file_id, page, hits) VALUES (?, ?, ?, ?)",
+                [(term, file_id, page, hits) for term, page, hits in postings])
+
+    def _record_failure(self, conn: sqlite3.Connection, path: str, size: int, mtime_ns: int,
+                        error: str) -> None:
+        with conn:
+            self._store_file(conn, path, size, mtime_ns, 0, error)
+
+    def failures(self) -> List[Dict[str, str]]:
+        """Files that could not be indexed in their current version, with the error"""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path").fetchall()
+        finally:
+            conn.close()
+        return [{"file": path, "error": error} for path, error in rows]
+
+    def search(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Files and pages containing every term of the query.
+
+        Returns:
+            Up to limit files ordered by total hits, each with its matching
+            1-based pages
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+        conn = self._connect()
+        try:
+            placeholders = ",".join("?" * len(terms))
+            rows = conn.execute(
+                f"SELECT f.path, p.page, SUM(p.hits) AS hits FROM postings p "
+                f"JOIN files f ON f.id = p.file_id WHERE p.term IN ({placeholders}) "
+                f"GROUP BY p.file_id, p.page HAVING COUNT(*) = ?",
+                (*terms, len(terms))).fetchall()
+        finally:
+            conn.close()
+        matches: Dict[str, Dict[str, Any]] = {}
+        for path, page, hits in rows:
+            match = matches.setdefault(path, {"file": path, "pages": [], "hits": 0})
+            match["pages"].append(page + 1)
+            match["hits"] += hits
+        results = sorted(matches.values(), key=lambda m: (-m["hits"], m["file"]))
+        for match in results:
+            match["pages"].sort()
+        return results[:limit]
+
+
+_indexes: Dict[str, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(root: str) -> SearchIndex:
+    """Get the search index of a files directory"""
+    path = os.environ.get("PDF_SEARCH_INDEX_PATH",
+                          os.path.join(root, ".spire-pdf-search-index.sqlite"))
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = _indexes[path] = SearchIndex(root, path)
+        return index
+
+
+def _describe_failures(failures: List[Dict[str, str]]) -> str:
+    return (f"({len(failures)} files could not be indexed: "
+            + ", ".join(f["file"] for f in failures[:10])
+            + (", ..." if len(failures) > 10 else "") + ")")
+
+
+def refresh_search_index(root: str, options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Bring the search index of root up to date with the files on disk.
+
+    Options:
+        force: Rescan even if the last scan is less than
+            PDF_SEARCH_REFRESH_INTERVAL seconds old (default: True)
+    """
+    options = options or {}
+    try:
+        started = time.perf_counter()
+        index = get_search_index(root)
+        counts = index.refresh(force=bool(options.get("force", True)))
+        elapsed = time.perf_counter() - started
+        failures = index.failures()
+        message = (f"Search index updated in {elapsed:.2f}s: {counts['indexed']} files indexed, "
+                   f"{counts['removed']} removed, {counts['failed']} failed")
+        if failures:
+            message += "\n" + _describe_failures(failures)
+        return {"message": message, **counts, "failed_files": failures}
+    except Exception as e:
+        logger.error(f"Failed to update search index: {e}")
+        raise SearchError(f"Failed to update search index: {e!s}")
+
+
+def search_text(root: str, query: str, options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Find the Pdf files and pages below root that mention every term of query.
+
+    Only the index is read, so queries stay fast however many files changed.
+    The result's "stale" flag tells the caller to bring the index up to date
+    in the background (see refresh_search_index).
+
+    Options:
+        limit: Maximum number of files returned (default: 50)
+        refresh: Update the index before searching and wait for it
+    """
+    options = options or {}
+    try:
+        limit = int(options.get("limit", 50))
+        started = time.perf_counter()
+        index = get_search_index(root)
+        counts = index.refresh(force=True) if options.get("refresh") else None
+        results = index.search(query, limit)
+        stale = counts is None and index.needs_refresh()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if results:
+            lines = [f"- {r['file']}: pages {', '.join(str(p) for p in r['pages'])} ({r['hits']} hits)"
+                     for r in results]
+            message = f"Found '{query}' in {len(results)} files:\n" + "\n".join(lines)
+        else:
+            message = f"No pages mention '{query}'"
+        if counts and (counts["indexed"] or counts["removed"]):
+            message += f"\n(index updated: {counts['indexed']} files indexed, {counts['removed']} removed)"
+        elif stale:
+            message += "\n(the index is being updated in the background; recent changes may be missing)"
+        failures = index.failures()
+        if failures:
+            message += "\n" + _describe_failures(failures)
+        return {
+            "message": message,
+            "results": results,
+            "failed": failures,
+            "stale": stale,
+            "elapsed_ms": round(elapsed_ms, 1)
+        }
+    except Exception as e:
+        logger.error(f"Failed to search text: {e}")
+        raise SearchError(f"Failed to search text: {e!s}")
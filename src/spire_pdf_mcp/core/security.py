@@ -1,14 +1,87 @@
+import csv
+import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from spire.pdf import *
 
+from spire_pdf_mcp.core.documentcache import load_document, load_document_from_stream, save_document
 from spire_pdf_mcp.utils.exceptions import SecurityError
 from spire_pdf_mcp.utils.utils import *
 logger = logging.getLogger(__name__)
 
 
+# Encryption algorithms accepted in options["algorithm"]
+ENCRYPTION_ALGORITHMS = {
+    "rc4_40": PdfEncryptionAlgorithm.RC4_40,
+    "rc4_128": PdfEncryptionAlgorithm.RC4_128,
+    "aes_128": PdfEncryptionAlgorithm.AES_128,
+    "aes_256": PdfEncryptionAlgorithm.AES_256
+}
+
+# Privileges accepted in options["privileges"] and the PdfDocumentPrivilege flag each sets
+PRIVILEGES = {
+    "print": "AllowPrint",
+    "degraded_printing": "AllowDegradedPrinting",
+    "fill_form_fields": "AllowFillFormFields",
+    "modify_annotations": "AllowModifyAnnotations",
+    "modify_contents": "AllowModifyContents",
+    "content_copying": "AllowContentCopying",
+    "copy_content_accessibility": "AllowCopyContentAccessibility",
+    "assembly": "AllowAssembly"
+}
+
+DEFAULT_PRIVILEGES = ("print", "fill_form_fields")
+
+def security_policy(userpsw: str, ownerpsw: str, options: Dict[str, Any] = None) -> PdfPasswordSecurityPolicy:
+    """
+    Build the password security policy described by options.
+
+    Options:
+        algorithm: rc4_40, rc4_128, aes_128 or aes_256 (default: rc4_128)
+        privileges: List of allowed privileges (see PRIVILEGES), "all" or "none"
+            (default: print and fill_form_fields)
+    """
+    options = options or {}
+    algorithm = str(options.get("algorithm", "rc4_128")).lower().replace("-", "_")
+    if algorithm not in ENCRYPTION_ALGORITHMS:
+        raise ValueError(f"Unknown encryption algorithm: {algorithm} "
+                         f"(supported: {', '.join(ENCRYPTION_ALGORITHMS)})")
+    privileges = options.get("privileges", DEFAULT_PRIVILEGES)
+    if privileges == "all":
+        privileges = list(PRIVILEGES)
+    elif privileges in ("none", None):
+        privileges = []
+    elif isinstance(privileges, str):
+        privileges = [p.strip() for p in privileges.split(",") if p.strip()]
+    unknown = [p for p in privileges if p not in PRIVILEGES]
+    if unknown:
+        raise ValueError(f"Unknown privileges: {', '.join(unknown)} (supported: {', '.join(PRIVILEGES)})")
+
+    # Create a security policy with user and owner passwords
+    securityPolicy = PdfPasswordSecurityPolicy(userpsw, ownerpsw)
+
+    # Set the encryption algorithm
+    securityPolicy.EncryptionAlgorithm = ENCRYPTION_ALGORITHMS[algorithm]
+
+    # Define document privileges
+    dp = PdfDocumentPrivilege.ForbidAll()
+    for privilege in privileges:
+        setattr(dp, PRIVILEGES[privilege], True)
+    securityPolicy.DocumentPrivilege = dp
+    return securityPolicy
+
+def encryptdocument_doc(doc: PdfDocument, userpsw: str, ownerpsw: str, options: Dict[str, Any] = None) -> None:
+    """Apply a password security policy to a loaded document (see security_policy for options)"""
+    # Encrypt the document with the security policy
+    doc.Encrypt(security_policy(userpsw, ownerpsw, options))
+
+def decryptdocument_doc(doc: PdfDocument, options: Dict[str, Any] = None) -> None:
+    """Remove the security policy from a document loaded with its password"""
+    doc.Decrypt()
     
 def encryptdocument (filepath: str,userpsw: str,ownerpsw: str,options: Dict[str, Any] = None) -> Dict[str, Any]:
     """Encrypt the pdf"""
@@ -22,26 +95,15 @@ def encryptdocument (filepath: str,userpsw: str,ownerpsw: str,options: Dict[str,
         encrypt_output_path = os.path.join(output_dir, f"{base_name}-encrypt.pdf")
         
         # Load a Pdf document from disk
-        doc = PdfDocument()
-        doc.LoadFromFile(filepath)
-
-        # Create a security policy with user and owner passwords
-        securityPolicy = PdfPasswordSecurityPolicy(userpsw, ownerpsw)
-
-        # Set the encryption algorithm
-        securityPolicy.EncryptionAlgorithm = PdfEncryptionAlgorithm.RC4_128
-
-        # Define document privileges
-        dp = PdfDocumentPrivilege.ForbidAll()
-        dp.AllowPrint = True
-        dp.AllowFillFormFields = True
-        securityPolicy.DocumentPrivilege = dp
+        doc = load_document(filepath)
+        try:
+            # Encrypt the document with the security policy
+            encryptdocument_doc(doc, userpsw, ownerpsw, options)
 
-        # Encrypt the document with the security policy
-        doc.Encrypt(securityPolicy)
-        
-        # Save the document
-        doc.SaveToFile(encrypt_output_path)        
+            # Save the document
+            save_document(doc, encrypt_output_path)
+        finally:
+            doc.Close()
             
         return {
             "message": f"Encrypt the pdf to file: {encrypt_output_path}"
@@ -62,18 +124,152 @@ def decryptdocument (filepath: str,psw: str,options: Dict[str, Any] = None) -> D
         decrypt_output_path = os.path.join(output_dir, f"{base_name}-decrypt.pdf")
         
         # Load a Pdf document from disk
-        doc = PdfDocument()
-        doc.LoadFromFile(filepath,psw)
+        doc = load_document(filepath, psw)
+        try:
+            # Decrypt the document
+            decryptdocument_doc(doc, options)
 
-        # Decrypt the document
-        doc.Decrypt()
-        
-        # Save the document
-        doc.SaveToFile(decrypt_output_path)        
+            # Save the document
+            save_document(doc, decrypt_output_path)
+        finally:
+            doc.Close()
             
         return {
             "message": f"Decrypt the pdf to file: {decrypt_output_path}"
         }
     except Exception as e:
         logger.error(f"Failed to Decrypt the pdf: {e}")
-        raise SecurityError(f"Failed to Decrypt the pdf: {e!s}")             
\ No newline at end of file
+        raise SecurityError(f"Failed to Decrypt the pdf: {e!s}")
+
+def load_recipients(recipients: Union[str, List[Dict[str, Any]]],
+                    options: Dict[str, Any] = None) -> List[Dict[str, str]]:
+    """
+    Recipients of a batch encryption from a list or a .json/.csv file.
+
+    Each recipient has a userpsw and optionally a name (used for the output
+    file) and an ownerpsw; options["ownerpsw"] is the owner password of
+    recipients without one. A plain list of strings is taken as user passwords.
+    """
+    options = options or {}
+    if isinstance(recipients, str):
+        suffix = Path(recipients).suffix.lower()
+        with open(recipients, "r", encoding="utf-8-sig", newline="") as f:
+            if suffix == ".csv":
+                recipients = list(csv.DictReader(f))
+            elif suffix == ".json":
+                recipients = json.load(f)
+            else:
+                raise ValueError(f"Unsupported recipients file type: {suffix} (use .json or .csv)")
+    result = []
+    for n, recipient in enumerate(recipients or [], 1):
+        if isinstance(recipient, str):
+            recipient = {"userpsw": recipient}
+        userpsw = recipient.get("userpsw")
+        ownerpsw = recipient.get("ownerpsw") or options.get("ownerpsw")
+        if not userpsw:
+            raise ValueError(f"Recipient {n} has no userpsw")
+        if not ownerpsw:
+            raise ValueError(f"Recipient {n} has no ownerpsw and options.ownerpsw is not set")
+        result.append({"name": str(recipient.get("name") or ""), "userpsw": str(userpsw), "ownerpsw": str(ownerpsw)})
+    if not result:
+        raise ValueError("No recipients to encrypt for")
+    return result
+
+def _encrypt_copies(snapshot: bytes, jobs: List[tuple], options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Write encrypted copies from one parsed source; failures are reported per copy"""
+    doc = load_document_from_stream(Stream(snapshot), options.get("password"))
+    results = []
+    try:
+        for index, recipient, output_path in jobs:
+            started = time.perf_counter()
+            try:
+                # Each Encrypt call replaces the previous policy before the save
+                encryptdocument_doc(doc, recipient["userpsw"], recipient["ownerpsw"], options)
+                save_document(doc, output_path)
+                results.append({"recipient": index, "file": output_path,
+                                "seconds": round(time.perf_counter() - started, 3)})
+            except Exception as e:
+                results.append({"recipient": index, "error": short_error(e)})
+    finally:
+        doc.Close()
+    return results
+
+def encryptbatch(filepath: str, recipients: Union[str, List[Dict[str, Any]]],
+                 options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Encrypt one document for many recipients, each with their own passwords.
+
+    The source is read once; each worker parses one copy and re-encrypts and
+    saves it for every recipient in its share, so the saves run concurrently
+    without a load per output.
+
+    Args:
+        filepath: Path to the document to encrypt
+        recipients: Recipients as accepted by load_recipients
+        options: Policy options (see security_policy) plus
+            ownerpsw: Owner password of recipients without their own
+            password: Password of the source document, if it is encrypted
+            output_dir: Directory for the copies, relative to the source
+                (default: <name>-encrypted)
+            workers: Copies written at once (default: min(4, CPU count))
+
+    Returns:
+        Dictionary containing the operation result
+    """
+    options = options or {}
+    try:
+        if not Path(filepath).exists():
+            raise FileNotFoundError(f"Input PDF file not found: {filepath}")
+        recipients = load_recipients(recipients, options)
+        # Reject bad policy options before writing anything
+        security_policy("user", "owner", options)
+        with open(filepath, "rb") as f:
+            snapshot = f.read()
+
+        save_path = Path(filepath)
+        output_dir = os.path.join(os.path.dirname(filepath), options.get("output_dir") or f"{save_path.stem}-encrypted")
+        os.makedirs(output_dir, exist_ok=True)
+        width = len(str(len(recipients)))
+        jobs = []
+        renamed = []
+        # Copies are written concurrently, so equal names would overwrite each
+        # other; later recipients get -2, -3, ... (compared case-insensitively)
+        seen = set()
+        for n, recipient in enumerate(recipients, 1):
+            stem = safe_file_name(recipient["name"]) if recipient["name"] else f"{n:0{width}d}"
+            name, suffix = stem, 1
+            while name.lower() in seen:
+                suffix += 1
+                name = f"{stem}-{suffix}"
+            seen.add(name.lower())
+            if name != stem:
+                renamed.append(f"- recipient {n}: {save_path.stem}-{stem}.pdf already used, "
+                               f"saved as {save_path.stem}-{name}.pdf")
+            jobs.append((n, recipient, os.path.join(output_dir, f"{save_path.stem}-{name}.pdf")))
+
+        workers = max(1, min(len(jobs), int(options.get("workers", min(4, os.cpu_count() or 1)))))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="spire-pdf-encrypt") as pool:
+            shares = pool.map(_encrypt_copies, [snapshot] * workers,
+                              [jobs[i::workers] for i in range(workers)], [options] * workers)
+            results = sorted((r for share in shares for r in share), key=lambda r: r["recipient"])
+        elapsed = time.perf_counter() - started
+
+        written = [r for r in results if "file" in r]
+        failed = [r for r in results if "error" in r]
+        lines = [f"- recipient {r['recipient']}: {r['error']}" for r in failed]
+        message = (f"Encrypted {len(written)} of {len(recipients)} copies in {elapsed:.2f}s to: {output_dir}"
+                   + (f" ({len(failed)} failed)\n" + "\n".join(lines) if failed else ""))
+        if renamed:
+            message += f"\n{len(renamed)} duplicate file names were numbered:\n" + "\n".join(renamed)
+        return {
+            "message": message,
+            "output_path": output_dir,
+            "files": [r["file"] for r in written],
+            "recipients": results,
+            "failed": failed,
+            "seconds": round(elapsed, 3)
+        }
+    except Exception as e:
+        logger.error(f"Failed to Encrypt the pdf copies: {e}")
+        raise SecurityError(f"Failed to Encrypt the pdf copies: {e!s}")
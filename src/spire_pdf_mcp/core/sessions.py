@@ -0,0 +1,216 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from spire.pdf import *
+
+from spire_pdf_mcp.core.documentcache import get_document_cache, load_document, save_document
+from spire_pdf_mcp.core.operations import apply_operation
+from spire_pdf_mcp.core.pdfdata import load_document_from_bytes, save_document_to_bytes
+from spire_pdf_mcp.utils.exceptions import SessionError
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentSession:
+    """A PdfDocument kept open between tool calls"""
+
+    def __init__(self, handle: str, doc: PdfDocument, source_path: str):
+        self.handle = handle
+        self.doc = doc
+        self.source_path = source_path
+        self.operations: List[str] = []
+        self.last_used = time.monotonic()
+        # Operations on one session run one at a time
+        self.lock = threading.Lock()
+
+    def touch(self) -> None:
+        self.last_used = time.monotonic()
+
+
+class SessionStore:
+    """Open documents addressed by handle, closed after idle_timeout seconds unused"""
+
+    def __init__(self, idle_timeout: float, max_sessions: int):
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, DocumentSession] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+
+    def _start_reaper(self) -> None:
+        if self._reaper is None and self.idle_timeout > 0:
+            self._reaper = threading.Thread(target=self._reap, name="spire-pdf-session-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap(self) -> None:
+        while True:
+            time.sleep(max(1.0, self.idle_timeout / 4))
+            self.evict_idle()
+
+    def evict_idle(self) -> int:
+        """Close sessions unused for longer than idle_timeout; returns how many were closed"""
+        if self.idle_timeout <= 0:
+            return 0
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for handle, session in list(self._sessions.items()):
+                # Skip sessions with an operation in progress
+                if now - session.last_used > self.idle_timeout and session.lock.acquire(blocking=False):
+                    del self._sessions[handle]
+                    expired.append(session)
+        for session in expired:
+            logger.info(f"Closing idle document session {session.handle} ({session.source_path})")
+            session.doc.Close()
+            session.lock.release()
+        return len(expired)
+
+    def open(self, filepath: Optional[str], password: Optional[str] = None,
+             data: Union[str, bytes, None] = None) -> DocumentSession:
+        """Open the file at filepath, or the Pdf given as bytes/base64 in data"""
+        self.evict_idle()
+        with self._lock:
+            if len(self._sessions) >= self.max_sessions:
+                raise SessionError(
+                    f"Too many open documents ({self.max_sessions}); close a document handle first"
+                )
+        if data is not None:
+            doc = load_document_from_bytes(data, password)
+        else:
+            doc = load_document(filepath, password)
+        session = DocumentSession(uuid.uuid4().hex, doc, filepath or "<data>")
+        with self._lock:
+            self._sessions[session.handle] = session
+        self._start_reaper()
+        return session
+
+    def get(self, handle: str) -> DocumentSession:
+        with self._lock:
+            session = self._sessions.get(handle)
+        if session is None:
+            raise SessionError(f"Unknown or expired document handle: {handle}")
+        session.touch()
+        return session
+
+    def remove(self, handle: str) -> DocumentSession:
+        with self._lock:
+            session = self._sessions.pop(handle, None)
+        if session is None:
+            raise SessionError(f"Unknown or expired document handle: {handle}")
+        return session
+
+    def close_all(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            with session.lock:
+                session.doc.Close()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+_session_store = SessionStore(
+    idle_timeout=float(os.environ.get("PDF_SESSION_IDLE_TIMEOUT", 600)),
+    max_sessions=int(os.environ.get("PDF_MAX_SESSIONS", 64))
+)
+
+
+def get_session_store() -> SessionStore:
+    """Get the process-wide session store"""
+    return _session_store
+
+
+def open_session(filepath: Optional[str], password: Optional[str] = None,
+                 data: Union[str, bytes, None] = None) -> Dict[str, Any]:
+    """Load a Pdf document, from a file or from bytes/base64 data, and keep it open under a new handle"""
+    try:
+        if data is None and not filepath:
+            raise ValueError("Give either a file path or the Pdf data")
+        if data is None and not Path(filepath).exists():
+            raise FileNotFoundError(f"Input PDF file not found: {filepath}")
+        session = _session_store.open(filepath, password, data)
+        page_count = session.doc.Pages.Count
+        source = filepath if data is None else "Pdf data"
+        return {
+            "message": f"Opened {source} as document handle {session.handle} ({page_count} pages)",
+            "handle": session.handle,
+            "page_count": page_count
+        }
+    except SessionError:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to open document: {e}")
+        raise SessionError(f"Failed to open document: {e!s}")
+
+
+def apply_session_operation(handle: str, operation: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Apply an in-memory operation to an open document"""
+    session = _session_store.get(handle)
+    try:
+        with session.lock:
+            session.doc = apply_operation(session.doc, operation, params)
+            session.operations.append(operation)
+            session.touch()
+        return {
+            "message": f"Applied {operation} to document handle {handle}",
+            "operations": list(session.operations)
+        }
+    except Exception as e:
+        logger.error(f"Failed to apply {operation} to document handle {handle}: {e}")
+        raise SessionError(f"Failed to apply {operation}: {e!s}")
+
+
+def save_session(handle: str, output_path: str) -> Dict[str, Any]:
+    """Write an open document to disk; the handle stays open"""
+    session = _session_store.get(handle)
+    try:
+        with session.lock:
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            save_document(session.doc, output_path)
+            session.touch()
+        get_document_cache().invalidate(output_path)
+        return {
+            "message": f"Saved document handle {handle} to: {output_path}",
+            "output_path": output_path
+        }
+    except Exception as e:
+        logger.error(f"Failed to save document handle {handle}: {e}")
+        raise SessionError(f"Failed to save document: {e!s}")
+
+
+def export_session(handle: str) -> Dict[str, Any]:
+    """Serialize an open document to Pdf bytes; the handle stays open"""
+    session = _session_store.get(handle)
+    try:
+        with session.lock:
+            data = save_document_to_bytes(session.doc)
+            session.touch()
+        return {
+            "message": f"Saved document handle {handle} to {len(data)} bytes",
+            "data": data
+        }
+    except Exception as e:
+        logger.error(f"Failed to save document handle {handle}: {e}")
+        raise SessionError(f"Failed to save document: {e!s}")
+
+
+def close_session(handle: str, output_path: Optional[str] = None) -> Dict[str, Any]:
+    """Close an open document, saving it first when output_path is given"""
+    if output_path:
+        save_session(handle, output_path)
+    session = _session_store.remove(handle)
+    with session.lock:
+        session.doc.Close()
+    message = f"Closed document handle {handle}"
+    if output_path:
+        message += f" after saving to: {output_path}"
+    return {"message": message}
@@ -1,17 +1,131 @@
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from spire.pdf import *
 
+from spire_pdf_mcp.core.documentcache import load_document, save_document
+from spire_pdf_mcp.core.pdfdocument import PageTextReader, iter_page_text
 from spire_pdf_mcp.utils.exceptions import TextError
 from spire_pdf_mcp.utils.utils import *
 logger = logging.getLogger(__name__)
 
 
+# replace_all_text match modes
+MATCH_MODES = {
+    "whole_word": ReplaceActionType.WholeWord,
+    "exact": ReplaceActionType.none,
+    "ignore_case": ReplaceActionType.IgnoreCase,
+    "regex": ReplaceActionType.Regex
+}
+
+def replacement_pairs(oldtext: Optional[str], newtext: Optional[str],
+                      options: Dict[str, Any] = None) -> List[Tuple[str, str]]:
+    """The (old, new) pairs to apply, in order: oldtext/newtext first, then options["replacements"]"""
+    options = options or {}
+    pairs = []
+    if oldtext:
+        pairs.append((oldtext, newtext or ""))
+    replacements = options.get("replacements") or {}
+    items = replacements.items() if isinstance(replacements, dict) else replacements
+    for item in items:
+        old, new = item
+        if not old:
+            raise ValueError("Replacement targets must not be empty")
+        pairs.append((str(old), "" if new is None else str(new)))
+    if not pairs:
+        raise ValueError("Nothing to replace: give oldtext or options.replacements")
+    return pairs
+
+def _normalize(text: str, mode: str) -> str:
+    # Extraction reflows whitespace, so compare with runs collapsed
+    text = " ".join(text.split())
+    return text.casefold() if mode == "ignore_case" else text
+
+def page_targets(text: str, pairs: List[Tuple[str, str]], mode: str) -> List[Tuple[str, str]]:
+    """The pairs whose target may occur on a page with this extracted text.
+
+    Pairs are applied in order, so a target can also be text that an earlier
+    pair puts on the page: with ("A", "B") and ("B", "C") a page holding "A"
+    ends up with "C", as it would without the filter. Regex targets cannot be
+    checked against extracted text reliably, and a page without extractable
+    text may still hold text, so both keep every pair.
+    """
+    if mode == "regex" or not text.strip():
+        return pairs
+    original = replaced = _normalize(text, mode)
+    targets = []
+    for old, new in pairs:
+        target = _normalize(old, mode)
+        # The original text is checked too: a whole word replacement leaves
+        # longer words alone, which the plain replace below does not
+        if target in original or target in replaced:
+            targets.append((old, new))
+            replaced = _normalize(replaced.replace(target, _normalize(new, mode)), mode)
+    return targets
+
+def replacealltext_doc(doc: PdfDocument, oldtext: Optional[str], newtext: Optional[str],
+                       options: Dict[str, Any] = None,
+                       page_texts: Optional[Iterator[Tuple[int, str]]] = None) -> Dict[str, Any]:
+    """
+    Replace text on every page of a loaded document.
+
+    All replacements are applied page by page with one replacer per page.
+    Pages whose extracted text contains none of the targets are skipped.
+
+    Args:
+        doc: The document to change
+        oldtext / newtext: A single replacement (optional with options.replacements)
+        options:
+            replacements: Mapping of old text to new text, or a list of [old, new] pairs
+            match: whole_word (default), exact, ignore_case or regex
+            prefilter: Skip pages without any target (default: True)
+        page_texts: (page index, text) for every page in order, e.g. from a
+            PageTextReader; extracted from doc when not given
+
+    Returns:
+        Counts of replacement pairs, pages searched and pages skipped
+    """
+    options = options or {}
+    pairs = replacement_pairs(oldtext, newtext, options)
+    mode = str(options.get("match", "whole_word")).lower()
+    if mode not in MATCH_MODES:
+        raise ValueError(f"Unknown match mode: {mode} (supported: {', '.join(MATCH_MODES)})")
+    prefilter = options.get("prefilter", True)
+    if prefilter and page_texts is None:
+        page_texts = iter_page_text(doc, list(range(doc.Pages.Count)))
+
+    # One options object serves every page
+    rpoptions = PdfTextReplaceOptions()
+    rpoptions.ReplaceType = MATCH_MODES[mode]
+    searched = 0
+    for i in range(doc.Pages.Count):
+        targets = pairs
+        if prefilter:
+            _, text = next(page_texts)
+            targets = page_targets(text, pairs, mode)
+            if not targets:
+                continue
+        page = doc.Pages.get_Item(i)
+        replacer = PdfTextReplacer(page)
+        replacer.Options = rpoptions
+        for old, new in targets:
+            replacer.ReplaceAllText(old, new)
+        searched += 1
+    return {
+        "pairs": len(pairs),
+        "pages": doc.Pages.Count,
+        "pages_searched": searched,
+        "pages_skipped": doc.Pages.Count - searched
+    }
     
-def replacealltext (filepath: str,oldtext: str,newtext: str,options: Dict[str, Any] = None) -> Dict[str, Any]:
-    """Replace text in PDF document"""
+def replacealltext (filepath: str,oldtext: Optional[str],newtext: Optional[str],options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Replace text in PDF document
+
+    Every replacement is applied in a single load and save; see
+    replacealltext_doc for the options. The page text used to skip pages
+    comes from the text cache when the file was read before.
+    """
     try:
 
         output_dir = os.path.dirname(filepath)
@@ -22,24 +136,25 @@ def replacealltext (filepath: str,oldtext: str,newtext: str,options: Dict[str, A
         replacetext_output_path = os.path.join(output_dir, f"{base_name}-replacetext.pdf")
         
         # Load a Pdf document from disk
-        doc = PdfDocument()
-        doc.LoadFromFile(filepath)
-
-        for i in range(doc.Pages.Count):
-            page = doc.Pages[i]
-            replacer = PdfTextReplacer(page)
-            rpoptions = PdfTextReplaceOptions()
-            rpoptions.ReplaceType = ReplaceActionType.WholeWord
-            replacer.Options = rpoptions
-            replacer.ReplaceAllText(oldtext,newtext)
-        
-        # Save the document
-        doc.SaveToFile(replacetext_output_path)        
+        doc = load_document(filepath)
+        try:
+            # Replace the text on every page, extracting only uncached page text
+            with PageTextReader(filepath, document=doc) as reader:
+                stats = replacealltext_doc(doc, oldtext, newtext, options,
+                                           reader.pages(list(range(doc.Pages.Count))))
+
+            # Save the document
+            save_document(doc, replacetext_output_path)
+        finally:
+            doc.Close()
             
         return {
-            "message": f"Document after text replacement to file: {replacetext_output_path}"
+            "message": (f"Document after text replacement to file: {replacetext_output_path} "
+                        f"({stats['pairs']} replacement pairs, searched {stats['pages_searched']} "
+                        f"of {stats['pages']} pages, skipped {stats['pages_skipped']} without any target)"),
+            "output_path": replacetext_output_path,
+            **stats
         }
     except Exception as e:
         logger.error(f"Failed to Replace text in PDF document: {e}")
         raise TextError(f"Failed to Replace text in PDF document: {e!s}")    
-         
\ No newline at end of file
@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from spire_pdf_mcp.core.documentcache import file_digest
+
+logger = logging.getLogger(__name__)
+
+# Extractor options that change the extracted text, and so the cache key
+TEXT_OPTION_KEYS = ("simple_extraction", "show_hidden_text")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    digest TEXT NOT NULL,
+    options TEXT NOT NULL,
+    page_count INTEGER NOT NULL,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (digest, options)
+);
+CREATE TABLE IF NOT EXISTS pages (
+    digest TEXT NOT NULL,
+    options TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (digest, options, page)
+);
+CREATE INDEX IF NOT EXISTS documents_last_used ON documents (last_used);
+"""
+
+def text_options_key(options: Dict[str, Any] = None) -> str:
+    """Canonical form of the extractor options for the cache key"""
+    options = options or {}
+    return json.dumps({name: bool(options.get(name)) for name in TEXT_OPTION_KEYS}, sort_keys=True)
+
+
+class TextCache:
+    """On-disk cache of extracted page text in a SQLite file.
+
+    Pages are keyed by (file content hash, extractor options, page index), so
+    renamed or copied files still hit and edited files miss. When the stored
+    text exceeds max_bytes, the least recently used documents are dropped.
+    The database is shared by threads and worker processes; cache errors are
+    logged and treated as misses.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    self._initialized = True
+        return conn
+
+    def _open(self) -> Optional[sqlite3.Connection]:
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            return self._connect()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Text cache unavailable ({self.path}): {e}")
+            return None
+
+    def lookup(self, digest: str, options_key: str,
+               pages: Iterable[int]) -> Tuple[Optional[int], Dict[int, str]]:
+        """Cached page count and texts of the requested pages that are stored.
+
+        Returns:
+            (page_count, {page index: text}); page_count is None if the
+            document has never been cached
+        """
+        if not self.enabled:
+            return None, {}
+        conn = self._open()
+        if conn is None:
+            return None, {}
+        try:
+            with conn:
+                row = conn.execute(
+                    "SELECT page_count FROM documents WHERE digest = ? AND options = ?",
+                    (digest, options_key)).fetchone()
+                if row is None:
+                    return None, {}
+                conn.execute(
+                    "UPDATE documents SET last_used = ? WHERE digest = ? AND options = ?",
+                    (time.time(), digest, options_key))
+                texts = dict(conn.execute(
+                    "SELECT page, text FROM pages WHERE digest = ? AND options = ? "
+                    "AND page IN (SELECT value FROM json_each(?))",
+                    (digest, options_key, json.dumps(list(pages)))))
+                return row[0], texts
+        except sqlite3.Error as e:
+            logger.warning(f"Text cache lookup failed: {e}")
+            return None, {}
+        finally:
+            conn.close()
+
+    def store(self, digest: str, options_key: str, page_count: int, texts: Dict[int, str]) -> None:
+        """Add extracted pages of a document, then evict down to max_bytes"""
+        if not self.enabled:
+            return
+        conn = self._open()
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO documents (digest, options, page_count, bytes, last_used) "
+                    "VALUES (?, ?, ?, 0, ?)",
+                    (digest, options_key, page_count, time.time()))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO pages (digest, options, page, text) VALUES (?, ?, ?, ?)",
+                    [(digest, options_key, page, text) for page, text in texts.items()])
+                conn.execute(
+                    "UPDATE documents SET last_used = ?, bytes = "
+                    "(SELECT COALESCE(SUM(LENGTH(CAST(text AS BLOB))), 0) FROM pages "
+                    "WHERE digest = ? AND options = ?) WHERE digest = ? AND options = ?",
+                    (time.time(), digest, options_key, digest, options_key))
+                self._evict(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"Text cache store failed: {e}")
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM documents").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for digest, options_key, size in conn.execute(
+                "SELECT digest, options, bytes FROM documents ORDER BY last_used").fetchall():
+            conn.execute("DELETE FROM pages WHERE digest = ? AND options = ?", (digest, options_key))
+            conn.execute("DELETE FROM documents WHERE digest = ? AND options = ?", (digest, options_key))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        """Drop all cached text"""
+        conn = self._open()
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.execute("DELETE FROM pages")
+                conn.execute("DELETE FROM documents")
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Number of cached documents and pages, and stored text bytes"""
+        conn = self._open()
+        if conn is None:
+            return {"documents": 0, "pages": 0, "bytes": 0, "max_bytes": self.max_bytes}
+        try:
+            documents, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM documents").fetchone()
+            pages = conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            return {"documents": documents, "pages": pages, "bytes": size, "max_bytes": self.max_bytes}
+        finally:
+            conn.close()
+
+
+_text_cache = TextCache(
+    os.environ.get(
+        "PDF_TEXT_CACHE_PATH",
+        os.path.join(os.environ.get("PDF_FILES_PATH", "./pdf_files"), ".spire-pdf-text-cache.sqlite")
+    ),
+    int(os.environ.get("PDF_TEXT_CACHE_MB", 64)) * 1024 * 1024
+)
+
+
+def get_text_cache() -> TextCache:
+    """Get the process-wide extracted text cache"""
+    return _text_cache
@@ -1,9 +1,14 @@
+import asyncio
+import contextvars
+import json
 import logging
 import sys
 import os
-from typing import Any, List, Dict, Optional
+import time
+from typing import Any, List, Dict, Optional, Union
 
 from mcp.server.fastmcp import FastMCP
+from mcp.types import TextContent
 
 # Import exceptions
 from spire_pdf_mcp.utils.exceptions import (
@@ -12,10 +17,25 @@ from spire_pdf_mcp.utils.exceptions import (
     SecurityError,
     TextError,
     BookmarksError,
-    FormsError
+    FormsError,
+    AttachmentsError,
+    PipelineError,
+    SearchError,
+    SessionError
 )
 
 from spire_pdf_mcp.core.conversion import convert_pdfdocument as convert_pdfdocument_impl
+from spire_pdf_mcp.utils.executor import (
+    configure_executor,
+    default_max_workers,
+    map_in_worker,
+    run_in_thread,
+    run_in_worker,
+    shutdown_executor,
+    start_executor
+)
+from spire_pdf_mcp.utils.metrics import get_registry, observe_tool
+from spire_pdf_mcp.utils.tracing import PROFILE_DIR, PROFILE_TOOLS, PROFILER, TRACE_PATH, request_scope
 
 # Configure logging
 logging.basicConfig(
@@ -33,6 +53,19 @@ logger = logging.getLogger("spire-pdf-mcp")
 # Get Pdf files path from environment or use default
 PDF_FILES_PATH = os.environ.get("PDF_FILES_PATH", "./pdf_files")
 
+# Worker pool that runs the blocking Spire calls: "thread" or "process"
+PDF_EXECUTOR = os.environ.get("PDF_EXECUTOR", "thread")
+PDF_MAX_WORKERS = int(os.environ.get("PDF_MAX_WORKERS", default_max_workers()))
+# Process mode only: recycle workers to return native memory to the OS (0 = never)
+PDF_MAX_TASKS_PER_CHILD = int(os.environ.get("PDF_MAX_TASKS_PER_CHILD", 0))
+PDF_WORKER_MAX_RSS_MB = int(os.environ.get("PDF_WORKER_MAX_RSS_MB", 0))
+configure_executor(
+    PDF_MAX_WORKERS,
+    mode=PDF_EXECUTOR,
+    max_tasks_per_child=PDF_MAX_TASKS_PER_CHILD,
+    max_rss_mb=PDF_WORKER_MAX_RSS_MB
+)
+
 def get_pdf_path(filename: str) -> str:
     """Get full path to Pdf file.
     
@@ -49,8 +82,48 @@ def get_pdf_path(filename: str) -> str:
     # Use the configured Pdf files path
     return os.path.join(PDF_FILES_PATH, filename)
 
+def pdf_data_reply(data: bytes, **details: Any) -> str:
+    """Tool reply carrying a resulting Pdf as base64 text under "data" """
+    from spire_pdf_mcp.core.pdfdata import encode_pdf_data
+    return json.dumps({"data": encode_pdf_data(data), "bytes": len(data), **details})
+
+# Path of the Prometheus metrics endpoint served next to the SSE app ("" = disabled)
+PDF_METRICS_PATH = os.environ.get("PDF_METRICS_PATH", "/metrics")
+
+class InstrumentedFastMCP(FastMCP):
+    """FastMCP server that counts, times and optionally traces every tool call.
+
+    A call whose arguments include "_profile": true is profiled (see
+    PDF_PROFILE_TOOLS); the flag is removed before the tool sees them.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self._tool_names = set()
+        super().__init__(*args, **kwargs)
+
+    def add_tool(self, fn: Any, name: Optional[str] = None, *args: Any, **kwargs: Any) -> None:
+        super().add_tool(fn, name, *args, **kwargs)
+        self._tool_names.add(name or fn.__name__)
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        profile = False
+        if arguments and "_profile" in arguments:
+            arguments = dict(arguments)
+            profile = str(arguments.pop("_profile")).lower() in ("1", "true", "yes")
+        # Unknown names share one label so clients cannot grow the metrics
+        tool = name if name in self._tool_names else "unknown"
+        with observe_tool(tool) as outcome, request_scope(tool, profile) as tool_span:
+            result = await super().call_tool(name, arguments)
+            # Tools report expected failures as an "Error: ..." reply
+            errors = [content.text for content in result
+                      if isinstance(content, TextContent) and content.text.startswith("Error:")]
+            if errors:
+                outcome["error"] = True
+                tool_span.set_error(errors[0].splitlines()[0])
+            return result
+
 # Initialize FastMCP server
-mcp = FastMCP(
+mcp = InstrumentedFastMCP(
     "spire-pdf-mcp",
     version="0.1.1",
     description="Pdf MCP Server for manipulating Pdf files",
@@ -60,13 +133,123 @@ mcp = FastMCP(
             "description": "Path to Pdf files directory",
             "required": False,
             "default": PDF_FILES_PATH
+        },
+        "PDF_EXECUTOR": {
+            "description": "Worker pool type for Pdf operations (thread or process)",
+            "required": False,
+            "default": PDF_EXECUTOR
+        },
+        "PDF_MAX_WORKERS": {
+            "description": "Maximum number of workers running Pdf operations",
+            "required": False,
+            "default": PDF_MAX_WORKERS
+        },
+        "PDF_MAX_TASKS_PER_CHILD": {
+            "description": "Recycle a worker process after this many tasks (process mode, 0 = never)",
+            "required": False,
+            "default": PDF_MAX_TASKS_PER_CHILD
+        },
+        "PDF_WORKER_MAX_RSS_MB": {
+            "description": "Recycle worker processes above this resident memory in MB (process mode, 0 = never)",
+            "required": False,
+            "default": PDF_WORKER_MAX_RSS_MB
+        },
+        "PDF_RENDER_WORKERS": {
+            "description": "Processes shared by all parallel image conversions (1 = render in the calling worker)",
+            "required": False,
+            "default": os.environ.get("PDF_RENDER_WORKERS", str(min(4, os.cpu_count() or 1)))
+        },
+        "PDF_DOCUMENT_CACHE_MB": {
+            "description": "Budget in MB of source files kept parsed in memory for read-only tools (0 = disabled)",
+            "required": False,
+            "default": os.environ.get("PDF_DOCUMENT_CACHE_MB", "256")
+        },
+        "PDF_SESSION_IDLE_TIMEOUT": {
+            "description": "Seconds after which an unused open_document handle is closed (0 = never)",
+            "required": False,
+            "default": os.environ.get("PDF_SESSION_IDLE_TIMEOUT", "600")
+        },
+        "PDF_MAX_SESSIONS": {
+            "description": "Maximum number of documents open through open_document",
+            "required": False,
+            "default": os.environ.get("PDF_MAX_SESSIONS", "64")
+        },
+        "PDF_TEXT_CACHE_PATH": {
+            "description": "SQLite file caching extracted page text across requests and restarts",
+            "required": False,
+            "default": os.environ.get("PDF_TEXT_CACHE_PATH", os.path.join(PDF_FILES_PATH, ".spire-pdf-text-cache.sqlite"))
+        },
+        "PDF_SEARCH_INDEX_PATH": {
+            "description": "SQLite file holding the search_text index",
+            "required": False,
+            "default": os.environ.get("PDF_SEARCH_INDEX_PATH", os.path.join(PDF_FILES_PATH, ".spire-pdf-search-index.sqlite"))
+        },
+        "PDF_SEARCH_REFRESH_INTERVAL": {
+            "description": "Age in seconds after which a search_text query updates the index in the background",
+            "required": False,
+            "default": os.environ.get("PDF_SEARCH_REFRESH_INTERVAL", "30")
+        },
+        "PDF_CONVERSION_CACHE_PATH": {
+            "description": "Directory storing conversion results by source content, format and options",
+            "required": False,
+            "default": os.environ.get("PDF_CONVERSION_CACHE_PATH", os.path.join(PDF_FILES_PATH, ".spire-pdf-conversion-cache"))
+        },
+        "PDF_CONVERSION_CACHE_MB": {
+            "description": "Maximum MB of stored conversion results (0 = disabled)",
+            "required": False,
+            "default": os.environ.get("PDF_CONVERSION_CACHE_MB", "512")
+        },
+        "PDF_CONVERSION_CACHE_LINK": {
+            "description": "How cached conversions are written to output paths: copy, or hardlink (outputs become read-only)",
+            "required": False,
+            "default": os.environ.get("PDF_CONVERSION_CACHE_LINK", "copy")
+        },
+        "PDF_METRICS_PATH": {
+            "description": "Path of the Prometheus metrics endpoint served next to the SSE app (empty = disabled)",
+            "required": False,
+            "default": PDF_METRICS_PATH
+        },
+        "PDF_TRACE_PATH": {
+            "description": "JSON lines file receiving timed spans of tool calls and Spire calls (empty = disabled)",
+            "required": False,
+            "default": TRACE_PATH
+        },
+        "PDF_PROFILE_TOOLS": {
+            "description": "Comma-separated tools whose every call is profiled, or * for all (a single call can pass _profile: true)",
+            "required": False,
+            "default": ",".join(sorted(PROFILE_TOOLS))
+        },
+        "PDF_PROFILE_DIR": {
+            "description": "Directory receiving profile dumps",
+            "required": False,
+            "default": PROFILE_DIR or os.path.join(PDF_FILES_PATH, ".spire-pdf-profiles")
+        },
+        "PDF_PROFILER": {
+            "description": "Profiler for profiled calls: cprofile, or pyinstrument if installed",
+            "required": False,
+            "default": PROFILER
+        },
+        "PDF_SPOOL_THRESHOLD_KB": {
+            "description": "Pdf data up to this size is passed to Spire in memory; larger data goes through a spool file",
+            "required": False,
+            "default": os.environ.get("PDF_SPOOL_THRESHOLD_KB", "256")
+        },
+        "PDF_SPOOL_DIR": {
+            "description": "Directory for spooled Pdf data (default: /dev/shm when writable, else the temp directory)",
+            "required": False,
+            "default": os.environ.get("PDF_SPOOL_DIR", "")
+        },
+        "PDF_TEXT_CACHE_MB": {
+            "description": "Maximum MB of extracted text kept in the text cache (0 = disabled)",
+            "required": False,
+            "default": os.environ.get("PDF_TEXT_CACHE_MB", "64")
         }
     }
 )
 
 
 @mcp.tool()
-def create_pdfdocument(filepath: str) -> str:
+async def create_pdfdocument(filepath: str) -> str:
     """
     Creates a new Pdf document.
 
@@ -79,7 +262,7 @@ def create_pdfdocument(filepath: str) -> str:
     try:
         full_path = get_pdf_path(filepath)
         from spire_pdf_mcp.core.pdfdocument import create_pdfdocument as create_pdfdocument_impl
-        result = create_pdfdocument_impl(full_path)
+        result = await run_in_worker(create_pdfdocument_impl, full_path)
         return f"Created pdfdocument at {full_path}"
     except PdfDocumentError as e:
         return f"Error: {str(e)}"
@@ -88,7 +271,7 @@ def create_pdfdocument(filepath: str) -> str:
         raise
 
 @mcp.tool()
-def convert_pdfdocument(
+async def convert_pdfdocument(
         filepath: str,
         output_filepath: str,
         format_type: str,  
@@ -111,9 +294,18 @@ def convert_pdfdocument(
     - pptx: Convert to pptx file
     - graypdf: Convert to graypdf document   
     - linearizedpdf: Convert to linearizedpdf document   
-    - image: Convert to image file(png)
+    - image: Convert pages to image files named after output_filepath
+      (report.png -> report-1.png, report-2.png, ...). Options:
+      pages ("1-3,5", default all), dpi (default 96),
+      image_format (png; jpg/bmp/gif/tiff/webp need Pillow),
+      workers (page runs rendered at once for large documents,
+      default and maximum PDF_RENDER_WORKERS)
     - pdfa: Convert to pdfa document(pdfa1a,pdfa1b,pdfa2a,pdfa2b,pdfa3a,pdfa3b,pdfx1a2001)   
 
+    Repeating a conversion of unchanged content with the same format and
+    options copies the stored result; pass options {"cache": false} to
+    convert again.
+
     Args:
         filepath (str): Path to the Pdf file
         format_type (str): Target format type (pdf,xps,doc,docx,html,svg,pcl,xlsx,postscript,ofd,pptx,image,linearizedpdf,graypdf,pdfa1a,pdfa1b,pdfa2a,pdfa2b,pdfa3a,pdfa3b,pdfx1a2001)
@@ -127,7 +319,8 @@ def convert_pdfdocument(
         full_path = get_pdf_path(filepath)
         output_path = get_pdf_path(output_filepath)
         
-        result = convert_pdfdocument_impl(
+        result = await run_in_worker(
+            convert_pdfdocument_impl,
             filepath=full_path,
             output_filepath=output_path,
             format_type=format_type,
@@ -142,21 +335,78 @@ def convert_pdfdocument(
         raise ConversionError(f"Failed to convert Pdf file: {str(e)}")
 
 @mcp.tool()
-def extract_text(filepath: str,options: Dict[str, Any] = None) -> str:
+async def convert_batch(
+        inputs: Union[str, List[str]],
+        output_dir: str,
+        format_type: str,
+        options: Dict[str, Any] = None
+) -> str:
+    """
+    Converts many Pdf files to another format concurrently.
+
+    Each file is converted as by convert_pdfdocument and written to output_dir
+    as <name>.<ext> (Pdf outputs as <name>-<format_type>.pdf), keeping the
+    subfolder of files below the files directory. A failed file does not stop
+    the batch.
+
+    Args:
+        inputs (str | list): Glob pattern such as "invoices/**/*.pdf", or a list of files/patterns
+        output_dir (str): Directory for the converted files
+        format_type (str): Target format type, as for convert_pdfdocument
+        options (dict, optional): Format-specific options passed to every conversion
+            - concurrency: Conversions running at once (default: worker count)
+
+    Returns:
+        str: Summary and per-file status/timing report, or error description
+    """
+    try:
+        from spire_pdf_mcp.core.batch import batch_report, expand_inputs, timed_call
+        from spire_pdf_mcp.core.conversion import batch_output_path
+        options = dict(options or {})
+        concurrency = int(options.pop("concurrency", 0))
+        if format_type.lower() == "image":
+            # The batch is already parallel; don't fan each file out to more processes
+            options.setdefault("workers", 1)
+        files = expand_inputs(PDF_FILES_PATH, inputs)
+        full_output_dir = get_pdf_path(output_dir)
+        outputs = [batch_output_path(f, PDF_FILES_PATH, full_output_dir, format_type) for f in files]
+
+        started = time.perf_counter()
+        entries = await map_in_worker(
+            timed_call,
+            [(convert_pdfdocument_impl, f, o, format_type, options) for f, o in zip(files, outputs)],
+            concurrency
+        )
+        result = batch_report(PDF_FILES_PATH, f"Converted to {format_type.upper()}",
+                              files, entries, outputs, time.perf_counter() - started)
+        return result["message"]
+    except (ConversionError, ValueError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Error convert_batch :{e}")
+        raise
+
+@mcp.tool()
+async def extract_text(filepath: str,options: Dict[str, Any] = None) -> str:
     """
     Extract the text from the page
 
     Args:
         filepath (str): Path to the Pdf file
         options (dict, optional): extract_text options
+            - pages: Page selection such as "1-3,5,10-" (default: all pages)
+            - inline: Return the text instead of writing <name>.txt
+            - max_chars: Characters per inline chunk (default: 20000)
+            - cursor: next_cursor from the previous inline chunk
+            - simple_extraction / show_hidden_text: Extraction flags
 
     Returns:
-        str: Success message or error description
+        str: Success message, extracted text or error description
     """
     try:
         full_path = get_pdf_path(filepath)
         from spire_pdf_mcp.core.pdfdocument import extract_text as extract_text_impl
-        result = extract_text_impl(full_path,options)
+        result = await run_in_worker(extract_text_impl, full_path,options)
         return result["message"]
     except PdfDocumentError as e:
         return f"Error: {str(e)}"
@@ -164,8 +414,80 @@ def extract_text(filepath: str,options: Dict[str, Any] = None) -> str:
         logger.error(f"Error extract_text :{e}")
         raise
     
+# Background update of the search index started by a query, if one is running
+_index_update: Optional[asyncio.Task] = None
+
+def _start_index_update() -> None:
+    """Update the search index on the worker pool without holding up the query"""
+    global _index_update
+    if _index_update is not None and not _index_update.done():
+        return
+    from spire_pdf_mcp.core.search import refresh_search_index as refresh_search_index_impl
+
+    async def _update() -> None:
+        try:
+            result = await run_in_worker(refresh_search_index_impl, PDF_FILES_PATH, {"force": False})
+            logger.info(result["message"])
+        except Exception as e:
+            logger.warning(f"Background search index update failed: {e}")
+
+    # Started from an empty context: the update is not part of the query's trace
+    _index_update = contextvars.Context().run(asyncio.get_running_loop().create_task, _update())
+
+@mcp.tool()
+async def search_text(query: str, options: Dict[str, Any] = None) -> str:
+    """
+    Find the Pdf files and pages that mention all words of a query
+
+    Only the index is read; when it is older than PDF_SEARCH_REFRESH_INTERVAL
+    it is updated in the background for later queries.
+
+    Args:
+        query (str): Words to search for
+        options (dict, optional): search_text options
+            - limit: Maximum number of files returned (default: 50)
+            - refresh: Update the index before searching and wait for it
+
+    Returns:
+        str: Matching files and pages or error description
+    """
+    try:
+        from spire_pdf_mcp.core.search import search_text as search_text_impl
+        result = await run_in_worker(search_text_impl, PDF_FILES_PATH, query, options)
+        if result["stale"]:
+            _start_index_update()
+        return result["message"]
+    except SearchError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Error search_text :{e}")
+        raise
+
+@mcp.tool()
+async def update_search_index(options: Dict[str, Any] = None) -> str:
+    """
+    Index new and changed Pdf files for search_text and wait until done
+
+    Args:
+        options (dict, optional): update_search_index options
+            - force: Rescan even if the last scan is less than
+              PDF_SEARCH_REFRESH_INTERVAL seconds old (default: true)
+
+    Returns:
+        str: Counts of indexed, removed and failed files or error description
+    """
+    try:
+        from spire_pdf_mcp.core.search import refresh_search_index as refresh_search_index_impl
+        result = await run_in_worker(refresh_search_index_impl, PDF_FILES_PATH, options)
+        return result["message"]
+    except SearchError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Error update_search_index :{e}")
+        raise
+    
 @mcp.tool()
-def merge_pdfs(filepaths: List[str], output_path: str, options: Dict[str, Any] = None) -> str:
+async def merge_pdfs(filepaths: List[str], output_path: str, options: Dict[str, Any] = None) -> str:
     """
     Merge multiple PDF files.
     
@@ -173,9 +495,12 @@ def merge_pdfs(filepaths: List[str], output_path: str, options: Dict[str, Any] =
         filepaths: List of PDF file paths to be merged
         output_path: Path where the merged PDF will be saved
         options (dict, optional): merge_pdfs options
+            - page_ranges: Page selection per input, aligned with filepaths (e.g. ["1-3", null, "5-"])
+            - batch_size: Inputs merged per intermediate file (default: 50)
+            - workers: Batches merged at once (default: min(4, CPU count))
     
     Returns:
-        Success message or error description
+        Success message with per-input page counts and timings, or error description
     """
     try:
         full_path_list = []  
@@ -185,7 +510,7 @@ def merge_pdfs(filepaths: List[str], output_path: str, options: Dict[str, Any] =
             full_path_list.append(full_path)  
             
         from spire_pdf_mcp.core.pdfdocument import merge_pdfs as merge_pdfs_impl
-        result = merge_pdfs_impl(full_path_list,output_path,options)
+        result = await run_in_worker(merge_pdfs_impl, full_path_list,output_path,options)
         return result["message"]
     except PdfDocumentError as e:
         return f"Error: {str(e)}"
@@ -194,7 +519,7 @@ def merge_pdfs(filepaths: List[str], output_path: str, options: Dict[str, Any] =
         raise 
     
 @mcp.tool()
-def add_text_watermark(input_path: str, output_path: str, watermark_text: str, 
+async def add_text_watermark(input_path: str, output_path: str, watermark_text: str, 
                        options: Dict[str, Any] = None) -> str:
     """
     Add text watermark to an existing PDF file.
@@ -204,6 +529,13 @@ def add_text_watermark(input_path: str, output_path: str, watermark_text: str,
         output_path: Path to save the PDF with watermark
         watermark_text: Text content of the watermark
         options (dict, optional): add_text_watermark options
+            - font_size: Font size (default: 24)
+            - opacity: Opacity from 0.0 to 1.0 (default: 0.3)
+            - rotation: Rotation in degrees (default: 45)
+            - color: Color name such as "Violet" or "#RRGGBB" (default: "Violet")
+            - font_family: "Helvetica", "TimesRoman" or "Courier" (default: "Helvetica")
+            - columns / rows: Repetitions across / down a page (default: 2 / 3)
+            - pages: Pages to watermark, e.g. "1-3,5" (default: all pages)
 
     Returns:
         str: Success message or error description
@@ -211,7 +543,7 @@ def add_text_watermark(input_path: str, output_path: str, watermark_text: str,
     try:
         full_path = get_pdf_path(input_path)
         from spire_pdf_mcp.core.pdfdocument import add_text_watermark as add_text_watermark_impl
-        result = add_text_watermark_impl(full_path,output_path,watermark_text,options)
+        result = await run_in_worker(add_text_watermark_impl, full_path,output_path,watermark_text,options)
         return result["message"]
     except PdfDocumentError as e:
         return f"Error: {str(e)}"
@@ -220,7 +552,7 @@ def add_text_watermark(input_path: str, output_path: str, watermark_text: str,
         raise   
     
 @mcp.tool()
-def compress_document(input_path: str, output_path: str,
+async def compress_document(input_path: str, output_path: str,
                        options: Dict[str, Any] = None) -> str:
     """
     Compress the content in an existing PDF file.
@@ -228,37 +560,114 @@ def compress_document(input_path: str, output_path: str,
     Args:
         input_path: Path to the original PDF file
         output_path: Path to save the PDF 
+        options (dict, optional): compress_document options
+            - profile: "default", "archive" (smallest), "web" or "print" (keeps image quality)
+            - image_quality: "low", "medium" or "high"
+            - resize_images, compress_images, compress_fonts, compress_contents,
+              unembed_fonts (bool): Override the profile's setting
     
     Returns:
-        Dictionary containing the operation result
+        Success message with input/output size, ratio and elapsed time, or error description
     """
     try:
         full_path = get_pdf_path(input_path)
         from spire_pdf_mcp.core.pdfdocument import compressdocument as compressdocument_impl
-        result = compressdocument_impl(full_path,output_path,options)
+        result = await run_in_worker(compressdocument_impl, full_path,output_path,options)
         return result["message"]
     except PdfDocumentError as e:
         return f"Error: {str(e)}"
     except Exception as e:
         logger.error(f"Error compress_document :{e}")
         raise       
+
+@mcp.tool()
+async def compress_batch(
+        inputs: Union[str, List[str]],
+        output_dir: str,
+        options: Dict[str, Any] = None
+) -> str:
+    """
+    Compresses many Pdf files concurrently.
+
+    Each file is compressed as by compress_document and written to output_dir
+    under its own name, keeping the subfolder of files below the files
+    directory. A failed file does not stop the batch.
+
+    Args:
+        inputs (str | list): Glob pattern such as "scans/**/*.pdf", or a list of files/patterns
+        output_dir (str): Directory for the compressed files
+        options (dict, optional): compress_document options applied to every file
+            - concurrency: Files compressed at once (default: worker count)
+
+    Returns:
+        str: Summary with total bytes saved and per-file status/size report, or error description
+    """
+    try:
+        from spire_pdf_mcp.core.batch import batch_report, expand_inputs, mirrored_path, timed_call
+        from spire_pdf_mcp.core.pdfdocument import compressdocument as compressdocument_impl
+        from spire_pdf_mcp.core.pdfdocument import compression_settings
+        options = dict(options or {})
+        concurrency = int(options.pop("concurrency", 0))
+        # Fail early on a bad profile instead of once per file
+        compression_settings(options)
+        files = expand_inputs(PDF_FILES_PATH, inputs)
+        full_output_dir = get_pdf_path(output_dir)
+        outputs = []
+        for f in files:
+            output = mirrored_path(f, PDF_FILES_PATH, full_output_dir, os.path.basename(f))
+            if os.path.abspath(output) == os.path.abspath(f):
+                # Never compress a file onto itself
+                output = mirrored_path(f, PDF_FILES_PATH, full_output_dir, f"{os.path.splitext(os.path.basename(f))[0]}-compressed.pdf")
+            outputs.append(output)
+
+        started = time.perf_counter()
+        entries = await map_in_worker(
+            timed_call,
+            [(compressdocument_impl, f, o, options) for f, o in zip(files, outputs)],
+            concurrency
+        )
+        result = batch_report(
+            PDF_FILES_PATH, "Compressed", files, entries, outputs, time.perf_counter() - started,
+            describe=lambda r: f"{r['input_bytes']:,} -> {r['output_bytes']:,} bytes, {r['ratio']:.1%}"
+        )
+        done = [e["result"] for e in entries if isinstance(e, dict) and e["status"] == "ok"]
+        input_bytes = sum(r["input_bytes"] for r in done)
+        output_bytes = sum(r["output_bytes"] for r in done)
+        summary, _, details = result["message"].partition("\n")
+        if input_bytes:
+            summary += (f", {input_bytes:,} -> {output_bytes:,} bytes "
+                        f"({output_bytes / input_bytes:.1%} of the original)")
+        return summary + "\n" + details
+    except (PdfDocumentError, ValueError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Error compress_batch :{e}")
+        raise
     
 @mcp.tool()
-def split_document(input_path: str, 
+async def split_document(input_path: str, 
                        options: Dict[str, Any] = None) -> str:
     """
     Split the content in an existing PDF file.
     
     Args:
         input_path: Path to the original PDF file
+        options (dict, optional): Split spec, at most one of
+            - ranges: One page selection per part, e.g. ["1-3", "4-10", "11-"] or "1-3;4-10;11-"
+            - every: Pages per part
+            - at_bookmarks: Start a new part at each top-level bookmark
+            Without a spec each page becomes its own file. Also:
+            - output_dir: Directory for the parts (default: next to the source)
+            - workers: Parts written at once, each worker parsing its own copy
+              of the source (default: min(4, CPU count))
     
     Returns:
-        Dictionary containing the operation result
+        The produced files with their page counts
     """
     try:
         full_path = get_pdf_path(input_path)
         from spire_pdf_mcp.core.pdfdocument import splitdocument as splitdocument_impl
-        result = splitdocument_impl(full_path,options)
+        result = await run_in_worker(splitdocument_impl, full_path,options)
         return result["message"]
     except PdfDocumentError as e:
         return f"Error: {str(e)}"
@@ -267,7 +676,7 @@ def split_document(input_path: str,
         raise   
     
 @mcp.tool()
-def encrypt_document(input_path: str, userpsw: str,ownerpsw: str,
+async def encrypt_document(input_path: str, userpsw: str,ownerpsw: str,
                        options: Dict[str, Any] = None) -> str:
     """
     Encrypt the document with the security policy
@@ -276,6 +685,12 @@ def encrypt_document(input_path: str, userpsw: str,ownerpsw: str,
         input_path: Path to the original PDF file
         userpsw: the user password to the pdf file 
         ownerpsw: the owner password to the pdf file
+        options (dict, optional): encrypt_document options
+            - algorithm: "rc4_40", "rc4_128" (default), "aes_128" or "aes_256"
+            - privileges: Allowed privileges, a list of "print", "degraded_printing",
+              "fill_form_fields", "modify_annotations", "modify_contents", "content_copying",
+              "copy_content_accessibility", "assembly", or "all"/"none"
+              (default: ["print", "fill_form_fields"])
     
     Returns:
         Dictionary containing the operation result
@@ -283,16 +698,51 @@ def encrypt_document(input_path: str, userpsw: str,ownerpsw: str,
     try:
         full_path = get_pdf_path(input_path)
         from spire_pdf_mcp.core.security import encryptdocument as encryptdocument_impl
-        result = encryptdocument_impl(full_path,userpsw,ownerpsw,options)
+        result = await run_in_worker(encryptdocument_impl, full_path,userpsw,ownerpsw,options)
         return result["message"]
     except SecurityError as e:
         return f"Error: {str(e)}"
     except Exception as e:
         logger.error(f"Error encrypt_document :{e}")
         raise     
+
+@mcp.tool()
+async def encrypt_batch(input_path: str, recipients: Union[str, List[Any]],
+                       options: Dict[str, Any] = None) -> str:
+    """
+    Encrypt one document for many recipients, each with their own password
+
+    The source is loaded once per worker and re-encrypted for every
+    recipient; the copies are saved concurrently as <name>-<recipient>.pdf.
+
+    Args:
+        input_path: Path to the original PDF file
+        recipients: List of {"name", "userpsw", "ownerpsw"} objects (or of user passwords),
+            or a .json/.csv file of them; name and ownerpsw are optional
+        options (dict, optional): encrypt_document options plus
+            - ownerpsw: Owner password of recipients without their own
+            - password: Password of the source document, if it is encrypted
+            - output_dir: Directory for the copies, relative to the source (default: <name>-encrypted)
+            - workers: Copies written at once (default: min(4, CPU count))
+
+    Returns:
+        Summary of the written copies, with any failures
+    """
+    try:
+        full_path = get_pdf_path(input_path)
+        if isinstance(recipients, str):
+            recipients = get_pdf_path(recipients)
+        from spire_pdf_mcp.core.security import encryptbatch as encryptbatch_impl
+        result = await run_in_worker(encryptbatch_impl, full_path, recipients, options)
+        return result["message"]
+    except SecurityError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Error encrypt_batch :{e}")
+        raise
     
 @mcp.tool()
-def decrypt_document(input_path: str, password: str,
+async def decrypt_document(input_path: str, password: str,
                        options: Dict[str, Any] = None) -> str:
     """
     Decrypt the document with the password
@@ -307,7 +757,7 @@ def decrypt_document(input_path: str, password: str,
     try:
         full_path = get_pdf_path(input_path)
         from spire_pdf_mcp.core.security import decryptdocument as decryptdocument_impl
-        result = decryptdocument_impl(full_path,password,options)
+        result = await run_in_worker(decryptdocument_impl, full_path,password,options)
         return result["message"]
     except SecurityError as e:
         return f"Error: {str(e)}"
@@ -316,15 +766,23 @@ def decrypt_document(input_path: str, password: str,
         raise 
     
 @mcp.tool()
-def replace_all_text(input_path: str, oldtext: str,newtext: str,
+async def replace_all_text(input_path: str, oldtext: Optional[str] = None, newtext: Optional[str] = None,
                        options: Dict[str, Any] = None) -> str:
     """
     Replace text in PDF document
     
+    All replacements are applied in one pass; pages whose text contains none
+    of the targets are skipped.
+
     Args:
         input_path: Path to the original PDF file
-        oldtext: Text to be replaced
+        oldtext: Text to be replaced (optional with options.replacements)
         newtext: Replaced text
+        options (dict, optional): replace_all_text options
+            - replacements: Mapping of old text to new text, e.g. {"ACME": "Contoso", "2023": "2024"},
+              applied in order after oldtext/newtext (chained pairs such as A->B, B->C apply in turn)
+            - match: "whole_word" (default), "exact", "ignore_case" or "regex"
+            - prefilter: Skip pages without any target (default: true)
     
     Returns:
         Dictionary containing the operation result
@@ -332,7 +790,7 @@ def replace_all_text(input_path: str, oldtext: str,newtext: str,
     try:
         full_path = get_pdf_path(input_path)
         from spire_pdf_mcp.core.text import replacealltext as replacealltext_impl
-        result = replacealltext_impl(full_path,oldtext,newtext,options)
+        result = await run_in_worker(replacealltext_impl, full_path,oldtext,newtext,options)
         return result["message"]
     except TextError as e:
         return f"Error: {str(e)}"
@@ -341,7 +799,7 @@ def replace_all_text(input_path: str, oldtext: str,newtext: str,
         raise     
     
 @mcp.tool()
-def delete_all_bookmarks(input_path: str, 
+async def delete_all_bookmarks(input_path: str, 
                        options: Dict[str, Any] = None) -> str:
     """
     Delete bookmarks in PDF
@@ -355,7 +813,7 @@ def delete_all_bookmarks(input_path: str,
     try:
         full_path = get_pdf_path(input_path)
         from spire_pdf_mcp.core.bookmarks import deleteallbookmarks as deleteallbookmarks_impl
-        result = deleteallbookmarks_impl(full_path,options)
+        result = await run_in_worker(deleteallbookmarks_impl, full_path,options)
         return result["message"]
     except BookmarksError as e:
         return f"Error: {str(e)}"
@@ -364,7 +822,7 @@ def delete_all_bookmarks(input_path: str,
         raise    
     
 @mcp.tool()
-def expand_bookmarks(input_path: str, 
+async def expand_bookmarks(input_path: str, 
                        options: Dict[str, Any] = None) -> str:
     """
     Expand bookmarks in PDF
@@ -378,7 +836,7 @@ def expand_bookmarks(input_path: str,
     try:
         full_path = get_pdf_path(input_path)
         from spire_pdf_mcp.core.bookmarks import expandbookmarks as expandbookmarks_impl
-        result = expandbookmarks_impl(full_path,options)
+        result = await run_in_worker(expandbookmarks_impl, full_path,options)
         return result["message"]
     except BookmarksError as e:
         return f"Error: {str(e)}"
@@ -387,7 +845,67 @@ def expand_bookmarks(input_path: str,
         raise     
     
 @mcp.tool()
-def flatten_formfield(input_path: str, 
+async def get_bookmarks(input_path: str,
+                       options: Dict[str, Any] = None) -> str:
+    """
+    Get the bookmark tree (table of contents) of a PDF as JSON
+
+    Outlines are cached by file content, so asking again for an unchanged
+    file does not parse it again.
+
+    Args:
+        input_path: Path to the original PDF file
+        options (dict, optional): get_bookmarks options
+            - inline: Return the JSON instead of writing <name>-bookmarks.json (default: false)
+            - flat: List bookmarks in reading order with their level instead of nesting them (default: false)
+            - max_depth: Deepest level to include, 1 for top level only (default: all)
+
+    Returns:
+        The bookmarks as {"title", "level", "page", "children"} objects, or where they were written
+    """
+    try:
+        full_path = get_pdf_path(input_path)
+        from spire_pdf_mcp.core.bookmarks import getbookmarks as getbookmarks_impl
+        result = await run_in_worker(getbookmarks_impl, full_path, options)
+        return result["message"]
+    except BookmarksError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Get bookmarks :{e}")
+        raise
+
+@mcp.tool()
+async def set_bookmarks(input_path: str, bookmarks: Union[str, List[Dict[str, Any]]],
+                       options: Dict[str, Any] = None) -> str:
+    """
+    Add or replace the bookmarks of a PDF in bulk
+
+    Args:
+        input_path: Path to the original PDF file
+        bookmarks: List of {"title", "page"} objects nesting sub-bookmarks in "children"
+            (the get_bookmarks format) or giving a "level" each in reading order, or a .json file of them
+        options (dict, optional): set_bookmarks options
+            - mode: "replace" the existing bookmarks (default) or "append" to them
+            - expanded: Show bookmarks with children expanded (default: false)
+
+    Returns:
+        Dictionary containing the operation result
+    """
+    try:
+        full_path = get_pdf_path(input_path)
+        if isinstance(bookmarks, str):
+            bookmarks = get_pdf_path(bookmarks)
+        from spire_pdf_mcp.core.bookmarks import setbookmarks as setbookmarks_impl
+        result = await run_in_worker(setbookmarks_impl, full_path, bookmarks, options)
+        return result["message"]
+    except BookmarksError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Set bookmarks :{e}")
+        raise
+
+@mcp.tool()
+async def flatten_formfield(input_path: str, 
                        options: Dict[str, Any] = None) -> str:
     """
     Flatten formfield in PDF
@@ -401,7 +919,7 @@ def flatten_formfield(input_path: str,
     try:
         full_path = get_pdf_path(input_path)
         from spire_pdf_mcp.core.forms import flattenformfield as flattenformfield_impl
-        result = flattenformfield_impl(full_path,options)
+        result = await run_in_worker(flattenformfield_impl, full_path,options)
         return result["message"]
     except FormsError as e:
         return f"Error: {str(e)}"
@@ -410,13 +928,18 @@ def flatten_formfield(input_path: str,
         raise       
     
 @mcp.tool()
-def get_forms_values(input_path: str, 
+async def get_forms_values(input_path: str, 
                        options: Dict[str, Any] = None) -> str:
     """
     Get forms values from the pdf
     
+    Writes every field as JSON ({"name", "type", "value", "options"}) to
+    <name>-getformsvalues.json.
+
     Args:
         input_path: Path to the original PDF file
+        options (dict, optional): get_forms_values options
+            - inline: Return the JSON instead of writing the file (default: false)
     
     Returns:
         Dictionary containing the operation result
@@ -424,7 +947,7 @@ def get_forms_values(input_path: str,
     try:
         full_path = get_pdf_path(input_path)
         from spire_pdf_mcp.core.forms import getformsvalues as getformsvalues_impl
-        result = getformsvalues_impl(full_path,options)
+        result = await run_in_worker(getformsvalues_impl, full_path,options)
         return result["message"]
     except FormsError as e:
         return f"Error: {str(e)}"
@@ -433,7 +956,94 @@ def get_forms_values(input_path: str,
         raise             
 
 @mcp.tool()
-def delete_all_attachments(input_path: str, 
+async def get_forms_values_batch(
+        inputs: Union[str, List[str]],
+        output_path: str,
+        options: Dict[str, Any] = None
+) -> str:
+    """
+    Extracts the form fields of many Pdf files into one JSONL or CSV file.
+
+    Files are read concurrently on the worker pool. A JSONL output gets one
+    {"file", "fields"} object per file; a CSV output gets one row per file
+    and one column per field name. Failed files are reported and left out.
+
+    Args:
+        inputs (str | list): Glob pattern such as "submissions/**/*.pdf", or a list of files/patterns
+        output_path (str): Output file, ending in .jsonl or .csv
+        options (dict, optional): get_forms_values_batch options
+            - concurrency: Files read at once (default: worker count)
+
+    Returns:
+        str: Summary and per-file status/timing report, or error description
+    """
+    try:
+        from spire_pdf_mcp.core.batch import batch_report, expand_inputs, timed_call
+        from spire_pdf_mcp.core.forms import read_form_fields, write_form_records
+        options = options or {}
+        full_output_path = get_pdf_path(output_path)
+        if os.path.splitext(full_output_path)[1].lower() not in (".jsonl", ".csv"):
+            raise ValueError(f"output_path must end in .jsonl or .csv: {output_path}")
+        files = expand_inputs(PDF_FILES_PATH, inputs)
+
+        started = time.perf_counter()
+        entries = await map_in_worker(
+            timed_call, [(read_form_fields, f) for f in files], int(options.get("concurrency", 0))
+        )
+        records = []
+        for f, entry in zip(files, entries):
+            if isinstance(entry, dict) and entry["status"] == "ok":
+                relative = os.path.relpath(f, PDF_FILES_PATH)
+                records.append({"file": f if relative.startswith("..") else relative, "fields": entry["result"]})
+        await run_in_worker(write_form_records, records, full_output_path)
+        result = batch_report(
+            PDF_FILES_PATH, "Extracted form fields of", files, entries, [full_output_path] * len(files),
+            time.perf_counter() - started, describe=lambda fields: f"{len(fields)} fields"
+        )
+        return result["message"]
+    except (FormsError, ValueError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Error get_forms_values_batch :{e}")
+        raise
+
+@mcp.tool()
+async def fill_forms(input_path: str, data: Union[str, List[Dict[str, Any]]],
+                       options: Dict[str, Any] = None) -> str:
+    """
+    Fill a form template once per data row (mail merge)
+
+    The template is parsed once per worker and reused for its rows, and the
+    filled documents are written concurrently.
+
+    Args:
+        input_path: Path to the form template
+        data: List of {field name: value} rows, or a .json/.jsonl/.csv file of rows
+        options (dict, optional): fill_forms options
+            - flatten: Flatten the fields of the outputs (default: false)
+            - output_dir: Directory for the outputs, relative to the template (default: <name>-filled)
+            - name_field: Row field whose value names the output file (default: <name>-<row>.pdf);
+              repeated names get -2, -3, ...
+            - workers: Rows filled at once (default: min(4, CPU count))
+
+    Returns:
+        Summary of the filled documents, with any failed rows
+    """
+    try:
+        full_path = get_pdf_path(input_path)
+        if isinstance(data, str):
+            data = get_pdf_path(data)
+        from spire_pdf_mcp.core.forms import fillforms as fillforms_impl
+        result = await run_in_worker(fillforms_impl, full_path, data, options)
+        return result["message"]
+    except FormsError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Fill forms :{e}")
+        raise
+
+@mcp.tool()
+async def delete_all_attachments(input_path: str, 
                        options: Dict[str, Any] = None) -> str:
     """
     Delete all attachments in PDF document
@@ -447,18 +1057,296 @@ def delete_all_attachments(input_path: str,
     try:
         full_path = get_pdf_path(input_path)
         from spire_pdf_mcp.core.attachments import deleteallattachments as deleteallattachments_impl
-        result = deleteallattachments_impl(full_path,options)
+        result = await run_in_worker(deleteallattachments_impl, full_path,options)
         return result["message"]
-    except FormsError as e:
+    except AttachmentsError as e:
         return f"Error: {str(e)}"
     except Exception as e:
         logger.error(f"Delete all attachments :{e}")
         raise    
 
+@mcp.tool()
+async def list_attachments(input_path: str,
+                       options: Dict[str, Any] = None) -> str:
+    """
+    List the attachments in PDF document as JSON
+
+    Args:
+        input_path: Path to the original PDF file
+        options (dict, optional): list_attachments options
+            - names: Attachment names or glob patterns such as "*.xlsx" to list (default: all)
+
+    Returns:
+        The attachments as {"name", "size", "mime_type", "description", "created", "modified"} objects
+    """
+    try:
+        full_path = get_pdf_path(input_path)
+        from spire_pdf_mcp.core.attachments import listattachments as listattachments_impl
+        result = await run_in_worker(listattachments_impl, full_path, options)
+        return result["message"]
+    except AttachmentsError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"List attachments :{e}")
+        raise
+
+@mcp.tool()
+async def extract_attachments(input_path: str,
+                       options: Dict[str, Any] = None) -> str:
+    """
+    Save the attachments in PDF document to files
+
+    Attachments are written to disk one at a time without being copied into
+    memory as a whole.
+
+    Args:
+        input_path: Path to the original PDF file
+        options (dict, optional): extract_attachments options
+            - names: Attachment names or glob patterns to extract (default: all)
+            - output_dir: Directory for the files, relative to the PDF (default: <name>-attachments)
+            - max_total_mb: Cap on the total size extracted; attachments that do not fit are skipped (default: 1024)
+
+    Returns:
+        The extracted files and any skipped attachments
+    """
+    try:
+        full_path = get_pdf_path(input_path)
+        from spire_pdf_mcp.core.attachments import extractattachments as extractattachments_impl
+        result = await run_in_worker(extractattachments_impl, full_path, options)
+        return result["message"]
+    except AttachmentsError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Extract attachments :{e}")
+        raise
+
+@mcp.tool()
+async def delete_attachments(input_path: str, names: Union[str, List[str]],
+                       options: Dict[str, Any] = None) -> str:
+    """
+    Delete the attachments with the given names in PDF document
+
+    Args:
+        input_path: Path to the original PDF file
+        names: Attachment name, or list of names or glob patterns such as "*.tmp"
+
+    Returns:
+        Dictionary containing the operation result
+    """
+    try:
+        full_path = get_pdf_path(input_path)
+        from spire_pdf_mcp.core.attachments import deleteattachments as deleteattachments_impl
+        result = await run_in_worker(deleteattachments_impl, full_path, names, options)
+        return result["message"]
+    except AttachmentsError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Delete attachments :{e}")
+        raise
+
+@mcp.tool()
+async def open_document(filepath: str = None, password: str = None, data: str = None) -> str:
+    """
+    Open a Pdf document once and keep it in memory for several edits.
+
+    Apply operations with edit_document and write the result with
+    save_document or close_document. Handles that stay unused are
+    closed automatically after PDF_SESSION_IDLE_TIMEOUT seconds.
+
+    Args:
+        filepath (str): Path to the Pdf file
+        password (str, optional): Password of an encrypted Pdf file
+        data (str, optional): The Pdf as base64 instead of a file path; it is
+            parsed from memory without writing a file
+
+    Returns:
+        str: Message containing the document handle, or error description
+    """
+    try:
+        full_path = get_pdf_path(filepath) if filepath else None
+        from spire_pdf_mcp.core.sessions import open_session as open_session_impl
+        result = await run_in_thread(open_session_impl, full_path, password, data)
+        return result["message"]
+    except SessionError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Open document :{e}")
+        raise
+
+@mcp.tool()
+async def edit_document(handle: str, operation: str,
+                        options: Dict[str, Any] = None) -> str:
+    """
+    Apply an operation to a document opened with open_document.
+
+    options is one flat object holding the operation's parameters and its
+    options, as for the matching standalone tool, e.g.
+    {"watermark_text": "DRAFT", "font_size": 30, "pages": "1-3"}.
+
+    Supported operations and their parameters:
+    - delete_all_bookmarks
+    - expand_bookmarks
+    - set_bookmarks: bookmarks (plus mode, expanded)
+    - delete_all_attachments
+    - delete_attachments: names
+    - flatten_formfield
+    - add_text_watermark: watermark_text (plus font_size, opacity, rotation, color, pages, ...)
+    - replace_all_text: oldtext, newtext, or replacements (plus match, prefilter)
+    - encrypt_document: userpsw, ownerpsw (plus algorithm, privileges)
+    - decrypt_document (open the document with its password first)
+    - compress_document (profile, image_quality, ...)
+
+    Args:
+        handle (str): Document handle returned by open_document
+        operation (str): Operation name
+        options (dict, optional): Operation parameters and options
+
+    Returns:
+        str: Success message or error description
+    """
+    try:
+        from spire_pdf_mcp.core.sessions import apply_session_operation as apply_session_operation_impl
+        result = await run_in_thread(apply_session_operation_impl, handle, operation, options)
+        return result["message"]
+    except SessionError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Edit document :{e}")
+        raise
+
+@mcp.tool()
+async def save_document(handle: str, output_path: str = None) -> str:
+    """
+    Save a document opened with open_document; the handle stays open.
+
+    Args:
+        handle (str): Document handle returned by open_document
+        output_path (str, optional): Path to save the PDF; without it the
+            document is returned as JSON {"data": base64, "bytes": size}
+
+    Returns:
+        str: Success message or error description
+    """
+    try:
+        if not output_path:
+            from spire_pdf_mcp.core.sessions import export_session as export_session_impl
+            result = await run_in_thread(export_session_impl, handle)
+            return pdf_data_reply(result["data"])
+        full_path = get_pdf_path(output_path)
+        from spire_pdf_mcp.core.sessions import save_session as save_session_impl
+        result = await run_in_thread(save_session_impl, handle, full_path)
+        return result["message"]
+    except SessionError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Save document :{e}")
+        raise
+
+@mcp.tool()
+async def close_document(handle: str, output_path: str = None, return_data: bool = False) -> str:
+    """
+    Close a document opened with open_document.
+
+    Args:
+        handle (str): Document handle returned by open_document
+        output_path (str, optional): Save the document here before closing it
+        return_data (bool, optional): Return the document as JSON
+            {"data": base64, "bytes": size} before closing it
+
+    Returns:
+        str: Success message or error description
+    """
+    try:
+        full_path = get_pdf_path(output_path) if output_path else None
+        from spire_pdf_mcp.core.sessions import close_session as close_session_impl
+        if return_data:
+            from spire_pdf_mcp.core.sessions import export_session as export_session_impl
+            exported = await run_in_thread(export_session_impl, handle)
+            await run_in_thread(close_session_impl, handle, full_path)
+            return pdf_data_reply(exported["data"])
+        result = await run_in_thread(close_session_impl, handle, full_path)
+        return result["message"]
+    except SessionError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Close document :{e}")
+        raise
+
+@mcp.tool()
+async def run_pipeline(input_path: str, output_path: str, steps: List[Dict[str, Any]],
+                       password: str = None) -> str:
+    """
+    Apply several operations to a Pdf document in one load and one save.
+
+    Each step is {"operation": name, "options": {...}}, using the operations
+    and options of edit_document plus compress_document. Example:
+    [{"operation": "decrypt_document"},
+     {"operation": "delete_all_bookmarks"},
+     {"operation": "add_text_watermark", "options": {"watermark_text": "DRAFT"}},
+     {"operation": "compress_document", "options": {"profile": "web"}}]
+
+    Args:
+        input_path (str): Path to the Pdf file
+        output_path (str): Path to save the final PDF
+        steps (list): Ordered list of steps
+        password (str, optional): Password of an encrypted Pdf file
+
+    Returns:
+        str: Success message with per-step timings, or error description
+    """
+    try:
+        full_path = get_pdf_path(input_path)
+        full_output_path = get_pdf_path(output_path)
+        from spire_pdf_mcp.core.pipeline import run_pipeline as run_pipeline_impl
+        result = await run_in_worker(run_pipeline_impl, full_path, full_output_path, steps, password)
+        return result["message"]
+    except PipelineError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Run pipeline :{e}")
+        raise
+
+@mcp.tool()
+async def run_pipeline_data(data: str, steps: List[Dict[str, Any]],
+                       password: str = None) -> str:
+    """
+    Apply several operations to a Pdf given as base64 and return the result as base64.
+
+    Works like run_pipeline without touching the files directory: the
+    document is parsed from and saved to memory (large documents pass
+    through a tmpfs spool file). A single step gives any one operation,
+    e.g. [{"operation": "encrypt_document", "options": {"userpsw": "u", "ownerpsw": "o"}}].
+
+    Args:
+        data (str): The Pdf as base64 (a data: URI is accepted)
+        steps (list): Ordered list of steps, as for run_pipeline
+        password (str, optional): Password of an encrypted Pdf
+
+    Returns:
+        str: JSON {"data": base64, "bytes": size, "timings": [...]}, or error description
+    """
+    try:
+        from spire_pdf_mcp.core.pipeline import run_pipeline_data as run_pipeline_data_impl
+        result = await run_in_worker(run_pipeline_data_impl, data, steps, password)
+        return pdf_data_reply(result["data"], timings=result["timings"])
+    except PipelineError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error(f"Run pipeline data :{e}")
+        raise
+
+if PDF_METRICS_PATH:
+    @mcp.custom_route(PDF_METRICS_PATH, methods=["GET"], include_in_schema=False)
+    async def metrics_endpoint(request: Any) -> Any:
+        """Tool, phase, worker pool and memory metrics in the Prometheus text format"""
+        from starlette.responses import Response
+        return Response(get_registry().render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 async def run_server():
     """Run the Pdf MCP server."""
     try:
-        logger.info(f"Starting Pdf MCP server (files directory: {PDF_FILES_PATH})")
+        logger.info(f"Starting Pdf MCP server (files directory: {PDF_FILES_PATH}, workers: {PDF_MAX_WORKERS} {PDF_EXECUTOR})")
+        start_executor()
         await mcp.run_sse_async()
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
@@ -467,4 +1355,7 @@ async def run_server():
         logger.error(f"Server failed: {e}")
         raise
     finally:
+        from spire_pdf_mcp.core.sessions import get_session_store
+        get_session_store().close_all()
+        shutdown_executor(wait=False)
         logger.info("Server shutdown complete")
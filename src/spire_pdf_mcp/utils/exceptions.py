@@ -25,6 +25,18 @@ class FormsError(PdfMCPError):
     """Exception raised for errors during file operate forms."""
     pass
 
+class SessionError(PdfMCPError):
+    """Exception raised for errors during operate document sessions."""
+    pass
+
+class PipelineError(PdfMCPError):
+    """Exception raised for errors during run pipeline."""
+    pass
+
+class SearchError(PdfMCPError):
+    """Exception raised for errors during search text."""
+    pass
+
 class UtilsError(PdfMCPError):
     """Exception raised for errors during Utils."""
     pass
@@ -0,0 +1,349 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from spire_pdf_mcp.utils.metrics import Gauge, capture_phases, get_registry, operation_scope, replay_phases
+from spire_pdf_mcp.utils.tracing import current_context, run_traced
+from spire_pdf_mcp.utils.utils import current_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_MODES = ("thread", "process")
+
+
+def default_max_workers() -> int:
+    """Default size of the worker pool (same heuristic as ThreadPoolExecutor)."""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+# Processes used by the page render pool; PDF_RENDER_WORKERS=1 renders in the calling worker
+RENDER_WORKERS = int(os.environ.get("PDF_RENDER_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Set in processes started by a RecyclingProcessPool
+_in_worker_process = False
+
+
+def in_worker_process() -> bool:
+    """Whether this is a pool worker process rather than the server process"""
+    return _in_worker_process
+
+
+def _init_process_worker() -> None:
+    """Warm up a worker process so the first task does not pay for the Spire import"""
+    global _in_worker_process
+    _in_worker_process = True
+    import spire.pdf  # noqa: F401
+
+
+def _run_observed(func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any],
+                  context: Optional[Dict[str, Any]] = None) -> Any:
+    """Run func with its load/process/save phases attributed to its name.
+
+    context is the submitting request's trace context (see
+    tracing.current_context): the call is traced, and profiled if asked.
+    """
+    name = getattr(func, "__name__", "unknown")
+    with operation_scope(name):
+        return run_traced(context, name, lambda: func(*args, **kwargs))
+
+
+def _run_process_task(func: Callable[..., Any], args: Tuple[Any, ...],
+                      kwargs: Dict[str, Any], max_rss_bytes: int,
+                      context: Optional[Dict[str, Any]] = None) -> Tuple[Any, bool, List[Any]]:
+    """Run func inside a worker process.
+
+    Returns:
+        (result, recycle, phases) where recycle is True when the worker's
+        resident memory is above max_rss_bytes after the task, and phases
+        are the task's phase timings for the server process to record
+    """
+    with capture_phases() as phases:
+        result = _run_observed(func, args, kwargs, context)
+    recycle = bool(max_rss_bytes) and current_rss_bytes() > max_rss_bytes
+    return result, recycle, phases
+
+
+class RecyclingProcessPool:
+    """Process pool that is replaced by a fresh one when its workers grow too large.
+
+    Spire keeps native memory alive for as long as a worker process lives, so
+    the workers are recycled once the pool has run max_tasks_per_child tasks
+    per worker and whenever a worker reports an RSS above max_rss_mb. Retiring a pool lets its in-flight tasks
+    finish; new tasks go to the replacement pool.
+    """
+
+    def __init__(self, max_workers: int, max_tasks_per_child: int = 0, max_rss_mb: int = 0):
+        self.max_workers = max_workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._generation = 0
+        self._submitted = 0
+        self.recycled = 0
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # ProcessPoolExecutor's own max_tasks_per_child (3.11+) is not used:
+        # on 3.12.1 a pool that replaces workers can leave tasks pending
+        # forever. The whole pool is retired after max_workers *
+        # max_tasks_per_child tasks instead (see submit).
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self._context,
+            initializer=_init_process_worker
+        )
+
+    def _retire(self, generation: int, reason: str) -> None:
+        with self._lock:
+            if generation != self._generation or self._pool is None:
+                # Already replaced by another task's report
+                return
+            logger.info(f"Recycling worker processes (generation {generation}): {reason}")
+            old_pool, self._pool = self._pool, None
+            self._generation += 1
+            self._submitted = 0
+            self.recycled += 1
+        old_pool.shutdown(wait=False)
+
+    def start(self) -> None:
+        """Spawn all worker processes up front"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._new_pool()
+            pool = self._pool
+        # Submitted to the pool directly: warm-up tasks are not counted or timed
+        futures = [pool.submit(os.getpid) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._new_pool()
+            pool, generation = self._pool, self._generation
+            self._submitted += 1
+            exhausted = (
+                self.max_tasks_per_child > 0
+                and self._submitted >= self.max_workers * self.max_tasks_per_child
+            )
+
+        outer: Future = Future()
+        inner = pool.submit(_run_process_task, func, args, kwargs, self.max_rss_bytes, current_context())
+
+        def _done(f: Future) -> None:
+            try:
+                result, recycle, phases = f.result()
+            except BrokenProcessPool as e:
+                self._retire(generation, f"worker process died: {e}")
+                outer.set_exception(e)
+                return
+            except BaseException as e:
+                outer.set_exception(e)
+                return
+            replay_phases(phases)
+            if recycle:
+                self._retire(generation, f"worker RSS above {self.max_rss_bytes // (1024 * 1024)} MB")
+            outer.set_result(result)
+
+        inner.add_done_callback(_done)
+        if exhausted:
+            self._retire(generation, f"{self.max_tasks_per_child} tasks per worker reached")
+        return outer
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+_max_workers: int = default_max_workers()
+_mode: str = "thread"
+_max_tasks_per_child: int = 0
+_max_rss_mb: int = 0
+_executor: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[RecyclingProcessPool] = None
+_render_pool: Optional[RecyclingProcessPool] = None
+_executor_lock = threading.Lock()
+# Tasks submitted to each pool and not finished yet
+_outstanding: Dict[str, int] = {"thread": 0, "process": 0}
+_outstanding_lock = threading.Lock()
+
+
+def _queue_depths() -> Dict[Tuple[str, ...], float]:
+    """Tasks waiting for a worker, per pool: those outstanding beyond the pool size"""
+    with _outstanding_lock:
+        outstanding = dict(_outstanding)
+    pools = ["thread", "process"] if _mode == "process" else ["thread"]
+    return {(pool,): float(max(0, outstanding[pool] - _max_workers)) for pool in pools}
+
+
+get_registry().register(Gauge(
+    "spire_pdf_worker_queue_depth", "Tasks waiting for a free worker, by pool", ("pool",),
+    collect=_queue_depths))
+get_registry().register(Gauge(
+    "spire_pdf_worker_pool_size", "Workers in the pool, by pool", ("pool",),
+    collect=lambda: {(pool,): float(_max_workers)
+                     for pool in (["thread", "process"] if _mode == "process" else ["thread"])}))
+
+
+async def _tracked(pool: str, awaitable: Any) -> Any:
+    with _outstanding_lock:
+        _outstanding[pool] += 1
+    try:
+        return await awaitable
+    finally:
+        with _outstanding_lock:
+            _outstanding[pool] -= 1
+
+
+def configure_executor(max_workers: int, mode: str = "thread",
+                       max_tasks_per_child: int = 0, max_rss_mb: int = 0) -> None:
+    """Configure the worker pool used for blocking Spire calls.
+
+    Must be called before the first task is dispatched; later calls only
+    take effect after shutdown_executor().
+
+    Args:
+        max_workers: Number of worker threads or processes
+        mode: "thread" to run in this process, "process" to run in worker processes
+        max_tasks_per_child: Recycle a worker process after this many tasks (0 = never)
+        max_rss_mb: Recycle worker processes once one exceeds this RSS in MB (0 = never)
+    """
+    global _max_workers, _mode, _max_tasks_per_child, _max_rss_mb
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+    mode = mode.lower()
+    if mode not in EXECUTOR_MODES:
+        raise ValueError(f"Unsupported executor mode: {mode} (expected one of {', '.join(EXECUTOR_MODES)})")
+    if max_tasks_per_child < 0 or max_rss_mb < 0:
+        raise ValueError("max_tasks_per_child and max_rss_mb must not be negative")
+    _max_workers = max_workers
+    _mode = mode
+    _max_tasks_per_child = max_tasks_per_child
+    _max_rss_mb = max_rss_mb
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the shared worker thread pool, creating it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            logger.info(f"Starting worker pool with {_max_workers} threads")
+            _executor = ThreadPoolExecutor(
+                max_workers=_max_workers,
+                thread_name_prefix="spire-pdf-worker"
+            )
+        return _executor
+
+
+def get_process_pool() -> RecyclingProcessPool:
+    """Get the shared worker process pool, creating it on first use"""
+    global _process_pool
+    with _executor_lock:
+        if _process_pool is None:
+            logger.info(
+                f"Starting worker pool with {_max_workers} processes "
+                f"(max tasks per child: {_max_tasks_per_child or 'unlimited'}, "
+                f"max RSS: {f'{_max_rss_mb} MB' if _max_rss_mb else 'unlimited'})"
+            )
+            _process_pool = RecyclingProcessPool(_max_workers, _max_tasks_per_child, _max_rss_mb)
+        return _process_pool
+
+
+def get_render_pool() -> Optional[RecyclingProcessPool]:
+    """Get the process pool shared by every parallel page render.
+
+    One pool of RENDER_WORKERS processes bounds rendering across concurrent
+    conversions, with the same recycling limits as the worker pool. Returns
+    None where rendering must stay in the calling process: inside a worker
+    process (process mode already spreads requests over processes), or when
+    RENDER_WORKERS is 1.
+    """
+    global _render_pool
+    if _in_worker_process or RENDER_WORKERS <= 1:
+        return None
+    with _executor_lock:
+        if _render_pool is None:
+            logger.info(f"Starting render pool with {RENDER_WORKERS} processes")
+            _render_pool = RecyclingProcessPool(RENDER_WORKERS, _max_tasks_per_child, _max_rss_mb)
+        return _render_pool
+
+
+def start_executor() -> None:
+    """Pre-start the configured worker pool so the first requests do not pay for it"""
+    if _mode == "process":
+        get_process_pool().start()
+    else:
+        get_executor()
+
+
+async def run_in_worker(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking function on the worker pool without blocking the event loop.
+
+    In process mode func and its arguments must be picklable and func must not
+    rely on state held by the server process.
+
+    Args:
+        func: Blocking callable (usually a core/* implementation)
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns; exceptions raised by func propagate unchanged
+    """
+    if _mode == "process":
+        return await _tracked("process", asyncio.wrap_future(get_process_pool().submit(func, *args, **kwargs)))
+    loop = asyncio.get_running_loop()
+    return await _tracked("thread", loop.run_in_executor(
+        get_executor(), functools.partial(_run_observed, func, args, kwargs, current_context())))
+
+
+async def run_in_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking function on the worker thread pool, even in process mode.
+
+    Use this for work that needs state living in the server process, such as
+    open document sessions.
+    """
+    loop = asyncio.get_running_loop()
+    return await _tracked("thread", loop.run_in_executor(
+        get_executor(), functools.partial(_run_observed, func, args, kwargs, current_context())))
+
+
+async def map_in_worker(func: Callable[..., Any], arg_list: List[Tuple[Any, ...]],
+                        limit: int = 0) -> List[Any]:
+    """Run func(*args) for every args tuple on the worker pool.
+
+    At most limit calls are queued at once (default: the pool size), so a
+    large batch does not starve other requests of workers.
+
+    Returns:
+        Results in the order of arg_list; a call that raised contributes its
+        exception instead of a result
+    """
+    semaphore = asyncio.Semaphore(limit if limit > 0 else _max_workers)
+
+    async def _run(args: Tuple[Any, ...]) -> Any:
+        async with semaphore:
+            return await run_in_worker(func, *args)
+
+    return await asyncio.gather(*(_run(args) for args in arg_list), return_exceptions=True)
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Shut down the worker pools, if they were started"""
+    global _executor, _process_pool, _render_pool
+    with _executor_lock:
+        pools = [p for p in (_executor, _process_pool, _render_pool) if p is not None]
+        _executor = None
+        _process_pool = None
+        _render_pool = None
+    for pool in pools:
+        pool.shutdown(wait=wait)
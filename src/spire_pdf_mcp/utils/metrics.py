@@ -0,0 +1,310 @@
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from spire_pdf_mcp.utils.utils import current_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+# Seconds; spans cached lookups (~1 ms) up to large conversions
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric:
+    """A named metric family with optional labels, rendered in the Prometheus text format"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _check(self, labels: Labels) -> Labels:
+        labels = tuple(str(value) for value in labels)
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {labels}")
+        return labels
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self.samples())
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        labels = self._check(labels)
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        with self._lock:
+            return self._values.get(tuple(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(v)}" for labels, v in values]
+
+
+class Gauge(Metric):
+    """A value that goes up and down; with collect, it is read at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 collect: Optional[Callable[[], Dict[Labels, float]]] = None):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._collect = collect
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        labels = self._check(labels)
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        labels = self._check(labels)
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+    def value(self, labels: Labels = ()) -> float:
+        with self._lock:
+            return self._values.get(tuple(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        if self._collect is not None:
+            try:
+                values = sorted(self._collect().items())
+            except Exception as e:
+                logger.warning(f"Failed to collect {self.name}: {e}")
+                values = []
+        else:
+            with self._lock:
+                values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(v)}" for labels, v in values]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # labels -> (count per bucket, sum)
+        self._values: Dict[Labels, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        labels = self._check(labels)
+        with self._lock:
+            counts, total = self._values.get(labels) or ([0] * len(self.buckets), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[labels] = (counts, total + value)
+
+    def count(self, labels: Labels = ()) -> int:
+        with self._lock:
+            entry = self._values.get(tuple(labels))
+            return sum(entry[0]) if entry else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+        lines = []
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """The metrics exposed by the server"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry"""
+    return _registry
+
+
+TOOL_REQUESTS = _registry.register(Counter(
+    "spire_pdf_tool_requests_total", "Tool calls, by tool", ("tool",)))
+TOOL_ERRORS = _registry.register(Counter(
+    "spire_pdf_tool_errors_total", "Tool calls that failed or returned an error, by tool", ("tool",)))
+TOOL_DURATION = _registry.register(Histogram(
+    "spire_pdf_tool_duration_seconds", "Tool call latency, by tool", ("tool",)))
+PHASE_DURATION = _registry.register(Histogram(
+    "spire_pdf_phase_duration_seconds",
+    "Time spent loading, processing and saving documents, by core function and phase",
+    ("function", "phase")))
+REQUESTS_IN_FLIGHT = _registry.register(Gauge(
+    "spire_pdf_requests_in_flight", "Tool calls in progress"))
+_registry.register(Gauge(
+    "spire_pdf_process_resident_memory_bytes", "Resident memory of the server process",
+    collect=lambda: {(): float(current_rss_bytes())}))
+
+
+@contextmanager
+def observe_tool(tool: str) -> Iterator[Dict[str, bool]]:
+    """Count and time one tool call.
+
+    Yields a dict whose "error" entry the caller sets when the call reports
+    an error without raising.
+    """
+    outcome = {"error": False}
+    TOOL_REQUESTS.inc((tool,))
+    REQUESTS_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    try:
+        yield outcome
+    except BaseException:
+        outcome["error"] = True
+        raise
+    finally:
+        TOOL_DURATION.observe(time.perf_counter() - started, (tool,))
+        REQUESTS_IN_FLIGHT.dec()
+        if outcome["error"]:
+            TOOL_ERRORS.inc((tool,))
+
+
+# Phase timing. A worker task runs inside an operation scope named after its
+# core function; load_document/save_document and friends add their time to
+# the innermost scope, and the rest of the scope counts as "process". Scopes
+# are per thread: work a core function hands to threads of its own counts as
+# processing.
+_local = threading.local()
+
+
+def _scopes() -> List[Dict[str, float]]:
+    scopes = getattr(_local, "scopes", None)
+    if scopes is None:
+        scopes = _local.scopes = []
+    return scopes
+
+
+def _record_phase(function: str, phase: str, seconds: float) -> None:
+    captured = getattr(_local, "captured", None)
+    if captured is not None:
+        captured.append((function, phase, seconds))
+    else:
+        PHASE_DURATION.observe(seconds, (function, phase))
+
+
+@contextmanager
+def operation_scope(name: str) -> Iterator[None]:
+    """Attribute the phases timed in this block to the core function name.
+
+    A scope that only wraps another scope (such as a batch item runner)
+    records no processing time of its own.
+    """
+    scopes = _scopes()
+    if scopes:
+        scopes[-1]["nested"] = True
+    scope = {"name": name, "load": 0.0, "save": 0.0, "nested": False}
+    scopes.append(scope)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        scopes.pop()
+        if not scope["nested"]:
+            _record_phase(name, "process", max(0.0, elapsed - scope["load"] - scope["save"]))
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a "load" or "save" step of the current operation scope (no-op outside one)"""
+    scopes = _scopes()
+    if not scopes:
+        yield
+        return
+    scope = scopes[-1]
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        scope[name] = scope.get(name, 0.0) + elapsed
+        _record_phase(scope["name"], name, elapsed)
+
+
+@contextmanager
+def capture_phases() -> Iterator[List[Tuple[str, str, float]]]:
+    """Collect phase timings of this thread instead of recording them.
+
+    Worker processes use this to send their timings back to the server
+    process, which records them with replay_phases().
+    """
+    _local.captured = captured = []
+    try:
+        yield captured
+    finally:
+        _local.captured = None
+
+
+def replay_phases(observations: Sequence[Tuple[str, str, float]]) -> None:
+    for function, phase_name, seconds in observations:
+        PHASE_DURATION.observe(seconds, (function, phase_name))
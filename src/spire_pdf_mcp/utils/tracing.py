@@ -0,0 +1,220 @@
+import contextvars
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Spans are written as JSON lines to this file (empty = tracing disabled).
+# Field names follow the OpenTelemetry span data model so the file can be
+# fed to an OTLP/JSON converter or loaded as is.
+TRACE_PATH = os.environ.get("PDF_TRACE_PATH", "")
+
+# Tool calls to profile: comma-separated tool names, or "*" for every call
+PROFILE_TOOLS = {name.strip() for name in os.environ.get("PDF_PROFILE_TOOLS", "").split(",") if name.strip()}
+PROFILE_DIR = os.environ.get("PDF_PROFILE_DIR", "")
+# "cprofile" (.prof files for pstats/snakeviz) or "pyinstrument" (.html, if installed)
+PROFILER = os.environ.get("PDF_PROFILER", "cprofile").lower()
+
+SERVICE_NAME = "spire-pdf-mcp"
+
+# The request being served: {"trace_id", "span_id", "tool", "profile"}.
+# Worker tasks do not inherit context variables, so run_in_worker passes a
+# snapshot (see current_context) and the worker installs it with
+# run_traced.
+_context: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "spire_pdf_trace_context", default=None)
+
+_trace_fd: Optional[int] = None
+_trace_pid: Optional[int] = None
+_trace_lock = threading.Lock()
+
+
+def profile_dir() -> str:
+    """Directory receiving profile dumps"""
+    if PROFILE_DIR:
+        return PROFILE_DIR
+    return os.path.join(os.environ.get("PDF_FILES_PATH", "./pdf_files"), ".spire-pdf-profiles")
+
+
+def should_profile(tool: str) -> bool:
+    """Whether PDF_PROFILE_TOOLS asks for every call of tool to be profiled"""
+    return "*" in PROFILE_TOOLS or tool in PROFILE_TOOLS
+
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+def _write_span(record: Dict[str, Any]) -> None:
+    global _trace_fd, _trace_pid
+    line = (json.dumps(record, default=str, separators=(",", ":")) + "\n").encode("utf-8")
+    try:
+        with _trace_lock:
+            # Worker processes open their own descriptor; O_APPEND keeps
+            # lines from different processes whole
+            if _trace_fd is None or _trace_pid != os.getpid():
+                parent = os.path.dirname(os.path.abspath(TRACE_PATH))
+                os.makedirs(parent, exist_ok=True)
+                _trace_fd = os.open(TRACE_PATH, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                _trace_pid = os.getpid()
+            os.write(_trace_fd, line)
+    except OSError as e:
+        logger.warning(f"Failed to write trace span to {TRACE_PATH}: {e}")
+
+
+class Span:
+    """The span of a traced block; the block may add attributes or report an error"""
+
+    __slots__ = ("name", "attributes", "status")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.status: Dict[str, str] = {"code": "OK"}
+
+    def set_error(self, message: str) -> None:
+        self.status = {"code": "ERROR", "message": message}
+
+
+def _first_line(e: BaseException) -> str:
+    lines = str(e).strip().splitlines()
+    return lines[0] if lines else type(e).__name__
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Time a block as a trace span, child of the current span.
+
+    A no-op (yielding a throwaway Span) when tracing is disabled.
+    """
+    current = Span(name, attributes)
+    if not TRACE_PATH:
+        yield current
+        return
+    parent = _context.get()
+    context = {
+        "trace_id": parent["trace_id"] if parent else _new_id(16),
+        "span_id": _new_id(8),
+        "tool": parent["tool"] if parent else None,
+        "profile": False
+    }
+    token = _context.set(context)
+    start_ns = time.time_ns()
+    started = time.perf_counter_ns()
+    try:
+        yield current
+    except BaseException as e:
+        current.set_error(_first_line(e))
+        raise
+    finally:
+        duration_ns = time.perf_counter_ns() - started
+        _context.reset(token)
+        _write_span({
+            "name": name,
+            "trace_id": context["trace_id"],
+            "span_id": context["span_id"],
+            "parent_span_id": parent["span_id"] if parent else None,
+            "start_time_unix_nano": start_ns,
+            "end_time_unix_nano": start_ns + duration_ns,
+            "duration_ms": round(duration_ns / 1e6, 3),
+            "status": current.status,
+            "attributes": current.attributes,
+            "resource": {"service.name": SERVICE_NAME, "process.pid": os.getpid(),
+                         "thread.name": threading.current_thread().name}
+        })
+
+
+@contextmanager
+def request_scope(tool: str, profile: bool = False) -> Iterator[Span]:
+    """Trace one tool call and mark whether its worker tasks are profiled.
+
+    Worker tasks started inside the block become children of the tool span.
+    Without tracing or profiling the block runs untouched.
+    """
+    profile = profile or should_profile(tool)
+    if not TRACE_PATH and not profile:
+        yield Span(f"tool {tool}", {})
+        return
+    with span(f"tool {tool}", **{"mcp.tool": tool}) as tool_span:
+        context = dict(_context.get() or {}, tool=tool, profile=profile)
+        token = _context.set(context)
+        try:
+            yield tool_span
+        finally:
+            _context.reset(token)
+
+
+def current_context() -> Optional[Dict[str, Any]]:
+    """Snapshot of the request context to hand to a worker task (None when idle)"""
+    context = _context.get()
+    return dict(context) if context else None
+
+
+def _profile_path(context: Dict[str, Any], name: str, suffix: str) -> str:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    tool = re.sub(r"[^\w.-]+", "_", context.get("tool") or "task")
+    return os.path.join(profile_dir(), f"{stamp}-{tool}-{name}-{context.get('trace_id', _new_id(16))[:8]}{suffix}")
+
+
+def _run_profiled(context: Dict[str, Any], name: str, func: Callable[[], Any]) -> Any:
+    profiler_name = PROFILER
+    if profiler_name == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logger.warning("pyinstrument is not installed; profiling with cProfile instead")
+            profiler_name = "cprofile"
+    if profiler_name == "pyinstrument":
+        profiler = Profiler()
+        profiler.start()
+        try:
+            return func()
+        finally:
+            profiler.stop()
+            path = _profile_path(context, name, ".html")
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(profiler.output_html())
+                logger.info(f"Wrote profile of {name} to {path}")
+            except OSError as e:
+                logger.warning(f"Failed to write profile of {name}: {e}")
+
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return func()
+    finally:
+        profiler.disable()
+        path = _profile_path(context, name, ".prof")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            profiler.dump_stats(path)
+            logger.info(f"Wrote profile of {name} to {path}")
+        except OSError as e:
+            logger.warning(f"Failed to write profile of {name}: {e}")
+
+
+def run_traced(context: Optional[Dict[str, Any]], name: str, func: Callable[[], Any]) -> Any:
+    """Run a worker task under the request context it was submitted from.
+
+    The task becomes a span named after its core function, and is profiled
+    when the request asked for it.
+    """
+    if context is None:
+        return func()
+    token = _context.set(context)
+    try:
+        with span(name, **{"code.function": name}):
+            if context.get("profile"):
+                return _run_profiled(context, name, func)
+            return func()
+    finally:
+        _context.reset(token)
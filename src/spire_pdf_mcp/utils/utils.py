@@ -1,6 +1,7 @@
 import logging
 import re
 import os
+import sys
 from pathlib import Path
 from typing import Tuple, Optional, List,Any
 import datetime
@@ -28,4 +29,77 @@ def AppendAllText(fileName: str, text: List[str]) -> None:
                 file.write(f"{line}\n") 
     except Exception as e:
         logger.error(f"Text Write Failure: {e}")
-        raise UtilsError(f"Text Write Failure: {e!s}")
\ No newline at end of file
+        raise UtilsError(f"Text Write Failure: {e!s}")
+
+def current_rss_bytes() -> int:
+    """Resident set size of the current process in bytes (0 if unavailable)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # Peak rather than current RSS; reported in KB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+def parse_page_range(spec: Any, page_count: int) -> List[int]:
+    """Turn a page selection into sorted, de-duplicated 0-based page indices.
+
+    Args:
+        spec: None/"all" for every page, a string of 1-based pages and ranges
+            such as "1-3,5,10-" (open ranges run to the last page), or a list
+            of 1-based page numbers
+        page_count: Number of pages in the document
+
+    Raises:
+        ValueError: If the selection is malformed or outside the document
+    """
+    if spec is None or (isinstance(spec, str) and spec.strip().lower() in ("", "all")):
+        return list(range(page_count))
+    if isinstance(spec, int):
+        spec = [spec]
+    pages = set()
+    if isinstance(spec, (list, tuple)):
+        for page in spec:
+            pages.add(int(page))
+    else:
+        for part in str(spec).split(","):
+            part = part.strip()
+            if not part:
+                continue
+            match = re.fullmatch(r"(\d*)\s*-\s*(\d*)", part)
+            if match:
+                start = int(match.group(1)) if match.group(1) else 1
+                end = int(match.group(2)) if match.group(2) else page_count
+                if start > end:
+                    raise ValueError(f"Invalid page range: {part}")
+                pages.update(range(start, end + 1))
+            elif part.isdigit():
+                pages.add(int(part))
+            else:
+                raise ValueError(f"Invalid page range: {part}")
+    for page in pages:
+        if page < 1 or page > page_count:
+            raise ValueError(f"Page {page} is outside the document (1-{page_count})")
+    return sorted(page - 1 for page in pages)
+
+
+def safe_file_name(name: str) -> str:
+    """name with path separators, reserved characters and whitespace replaced, for use as a file name"""
+    name = re.sub(r'[\\/:*?"<>|\s]+', "_", name).strip("._")
+    return name[:100] or "untitled"
+
+
+def short_error(e: BaseException) -> str:
+    """One-line description of an exception for reports.
+
+    Spire errors carry the native stack trace after the message; only the
+    message is kept.
+    """
+    lines = str(e).strip().splitlines() or [type(e).__name__]
+    return lines[0].split("   at ")[0].strip().rstrip(":") or type(e).__name__
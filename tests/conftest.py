@@ -0,0 +1,57 @@
+import os
+import tempfile
+from typing import Callable, List, Optional
+
+import pytest
+from spire.pdf import *
+
+# Process-wide caches pick their location at import; keep them out of the tree
+_CACHE_DIR = tempfile.mkdtemp(prefix="spire-pdf-mcp-tests-")
+os.environ.setdefault("PDF_TEXT_CACHE_PATH", os.path.join(_CACHE_DIR, "text-cache.sqlite"))
+os.environ.setdefault("PDF_CONVERSION_CACHE_PATH", os.path.join(_CACHE_DIR, "conversion-cache"))
+
+
+def write_pdf(path: str, pages: List[str], size: Optional[SizeF] = None) -> str:
+    """Write a Pdf with one page per entry of pages, each showing that text"""
+    doc = PdfDocument()
+    try:
+        font = PdfFont(PdfFontFamily.Helvetica, 14.0)
+        for text in pages:
+            page = doc.Pages.Add(size) if size is not None else doc.Pages.Add()
+            page.Canvas.DrawString(text, font, PdfBrushes.get_Black(), 40.0, 40.0)
+        doc.SaveToFile(path)
+    finally:
+        doc.Close()
+    return path
+
+
+def write_form(path: str, field_names: List[str]) -> str:
+    """Write a one-page Pdf form with a text box per field name"""
+    doc = PdfDocument()
+    try:
+        page = doc.Pages.Add()
+        for n, name in enumerate(field_names):
+            field = PdfTextBoxField(page, name)
+            field.Bounds = RectangleF(40.0, 40.0 + 30.0 * n, 200.0, 20.0)
+            doc.Form.Fields.Add(field)
+        doc.SaveToFile(path)
+    finally:
+        doc.Close()
+    return path
+
+
+@pytest.fixture
+def files_dir(tmp_path, monkeypatch):
+    """A scratch files directory set as PDF_FILES_PATH"""
+    monkeypatch.setenv("PDF_FILES_PATH", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def make_pdf(files_dir) -> Callable[..., str]:
+    """Factory writing a Pdf into files_dir: make_pdf("a.pdf", ["Page 1", "Page 2"])"""
+    def _make(name: str, pages: List[str], size: Optional[SizeF] = None) -> str:
+        path = os.path.join(str(files_dir), name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return write_pdf(path, pages, size)
+    return _make
@@ -0,0 +1,58 @@
+import os
+
+from spire_pdf_mcp.core.conversioncache import ConversionCache
+
+
+def _write(path, content: bytes) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+    return str(path)
+
+
+def test_fetch_materializes_stored_outputs(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache"), 1024 * 1024)
+    out = tmp_path / "out"
+    outputs = [_write(str(out / f"report_{n}.svg"), f"page {n}".encode()) for n in (1, 2)]
+    cache.store("k1", str(out / "report.svg"), outputs)
+
+    fetched = cache.fetch("k1", str(tmp_path / "other" / "copy.svg"))
+
+    assert [os.path.basename(path) for path in fetched] == ["copy_1.svg", "copy_2.svg"]
+    assert open(fetched[1], "rb").read() == b"page 2"
+    assert cache.fetch("missing", str(out / "report.svg")) is None
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_release_only_touches_recorded_links(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache"), 1024 * 1024, link=True)
+    out = tmp_path / "out"
+    report = [_write(str(out / f"report_{n}.svg"), b"report") for n in (1, 2)]
+    cache.store("report", str(out / "report.svg"), report)
+    # Another conversion whose name starts with the same stem
+    other = _write(str(out / "reports-2023.docx"), b"other")
+    cache.store("other", other, [other])
+    assert os.stat(other).st_nlink > 1
+
+    cache.release_outputs(str(out / "report.svg"))
+
+    assert not any(os.path.exists(path) for path in report)
+    assert open(other, "rb").read() == b"other"
+    # The stored result survives the release and can be linked again
+    fetched = cache.fetch("report", str(out / "report.svg"))
+    assert sorted(fetched) == sorted(report)
+    cache.release_outputs(str(out / "report.svg"))
+    assert not any(os.path.exists(path) for path in report)
+
+
+def test_release_keeps_files_written_by_the_user(tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache"), 1024 * 1024, link=True)
+    out = tmp_path / "out"
+    report = _write(str(out / "report.docx"), b"cached")
+    cache.store("report", report, [report])
+    os.unlink(report)
+    _write(report, b"mine")
+
+    cache.release_outputs(report)
+
+    assert open(report, "rb").read() == b"mine"
@@ -0,0 +1,97 @@
+import os
+
+from conftest import write_pdf
+from spire_pdf_mcp.core.documentcache import DocumentCache
+
+
+def _page_count(cache: DocumentCache, path) -> int:
+    with cache.document(str(path)) as doc:
+        return doc.Pages.Count
+
+
+def test_second_borrow_is_a_hit(tmp_path):
+    path = write_pdf(str(tmp_path / "a.pdf"), ["One", "Two"])
+    cache = DocumentCache(64 * 1024 * 1024)
+
+    with cache.document(path) as first:
+        pass
+    with cache.document(path) as second:
+        assert second is first
+        assert second.Pages.Count == 2
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["bytes"] == os.path.getsize(path)
+
+
+def test_mtime_change_reparses(tmp_path):
+    path = write_pdf(str(tmp_path / "a.pdf"), ["One"])
+    cache = DocumentCache(64 * 1024 * 1024)
+    assert _page_count(cache, path) == 1
+
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert _page_count(cache, path) == 1
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (0, 2)
+    # The stale version is dropped, not kept alongside the new one
+    assert (stats["entries"], stats["evictions"]) == (1, 1)
+
+
+def test_size_change_reparses(tmp_path):
+    path = write_pdf(str(tmp_path / "a.pdf"), ["One"])
+    cache = DocumentCache(64 * 1024 * 1024)
+    assert _page_count(cache, path) == 1
+
+    # Same mtime, different content and size
+    st = os.stat(path)
+    write_pdf(path, ["One", "Two", "Three"])
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert os.path.getsize(path) != st.st_size
+    assert _page_count(cache, path) == 3
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (0, 2, 1)
+
+
+def test_invalidate_drops_the_file(tmp_path):
+    a = write_pdf(str(tmp_path / "a.pdf"), ["One"])
+    b = write_pdf(str(tmp_path / "b.pdf"), ["One", "Two"])
+    cache = DocumentCache(64 * 1024 * 1024)
+    _page_count(cache, a)
+    _page_count(cache, b)
+
+    cache.invalidate(a)
+    assert cache.stats()["entries"] == 1
+    _page_count(cache, a)
+    _page_count(cache, b)
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 3)
+
+
+def test_budget_evicts_least_recently_used(tmp_path):
+    a = write_pdf(str(tmp_path / "a.pdf"), ["One"])
+    b = write_pdf(str(tmp_path / "b.pdf"), ["Two"])
+    cache = DocumentCache(max(os.path.getsize(a), os.path.getsize(b)) + 1)
+    _page_count(cache, a)
+    _page_count(cache, b)
+
+    stats = cache.stats()
+    assert (stats["entries"], stats["evictions"]) == (1, 1)
+    assert stats["bytes"] <= stats["max_bytes"]
+    _page_count(cache, b)
+    assert cache.stats()["hits"] == 1
+
+
+def test_disabled_cache_loads_every_time(tmp_path):
+    path = write_pdf(str(tmp_path / "a.pdf"), ["One", "Two"])
+    cache = DocumentCache(0)
+    assert not cache.enabled
+
+    assert _page_count(cache, path) == 2
+    assert _page_count(cache, path) == 2
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (0, 0, 0)
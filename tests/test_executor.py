@@ -0,0 +1,18 @@
+import os
+from concurrent.futures import wait
+
+from spire_pdf_mcp.utils.executor import RecyclingProcessPool
+
+
+def test_process_pool_finishes_every_task_across_recycles():
+    pool = RecyclingProcessPool(2, max_tasks_per_child=2)
+    try:
+        futures = [pool.submit(os.getpid) for _ in range(2 * 2 * 3 + 1)]
+        done, pending = wait(futures, timeout=120)
+        assert not pending
+        pids = {future.result() for future in done}
+        assert os.getpid() not in pids
+        assert pool.recycled == 3
+    finally:
+        # Without waiting, so a hung pool fails the test instead of blocking it
+        pool.shutdown(wait=False)
@@ -0,0 +1,33 @@
+import os
+
+from conftest import write_form
+from spire_pdf_mcp.core.forms import fillforms, read_form_fields
+
+
+def test_fillforms_numbers_duplicate_names(files_dir):
+    template = write_form(str(files_dir / "letter.pdf"), ["name", "city"])
+    rows = [
+        {"name": "Ann", "city": "Oslo"},
+        {"name": "Bob", "city": "Rome"},
+        {"name": "Ann", "city": "Lima"},
+        {"name": "ann", "city": "Kyiv"},
+    ]
+
+    result = fillforms(template, rows, {"name_field": "name", "workers": 4})
+
+    names = [os.path.basename(r["file"]) for r in result["rows"]]
+    assert names == ["Ann.pdf", "Bob.pdf", "Ann-2.pdf", "ann-3.pdf"]
+    assert len(set(result["files"])) == len(rows)
+    assert all(os.path.exists(path) for path in result["files"])
+    assert "Ann.pdf already used, saved as Ann-2.pdf" in result["message"]
+    # Each row kept its own output
+    cities = [{f["name"]: f["value"] for f in read_form_fields(path)}["city"] for path in result["files"]]
+    assert cities == ["Oslo", "Rome", "Lima", "Kyiv"]
+
+
+def test_fillforms_default_names(files_dir):
+    template = write_form(str(files_dir / "letter.pdf"), ["name"])
+
+    result = fillforms(template, [{"name": "A"}, {"name": "B"}])
+
+    assert [os.path.basename(path) for path in result["files"]] == ["letter-1.pdf", "letter-2.pdf"]
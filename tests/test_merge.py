@@ -0,0 +1,52 @@
+import pytest
+
+from spire_pdf_mcp.core import pdfdocument
+from spire_pdf_mcp.core.documentcache import load_document
+from spire_pdf_mcp.core.pdfdocument import merge_pdfs
+from spire_pdf_mcp.core.text import iter_page_text
+
+
+def _page_texts(path):
+    doc = load_document(path)
+    try:
+        return [text.strip() for _, text in iter_page_text(doc, list(range(doc.Pages.Count)))]
+    finally:
+        doc.Close()
+
+
+def test_merge_keeps_page_content(make_pdf, files_dir):
+    paths = [make_pdf(f"in-{n}.pdf", [f"File {n} page {p}" for p in (1, 2)]) for n in range(3)]
+
+    result = merge_pdfs(paths, "merged.pdf", {"page_ranges": ["2", "2", None]})
+
+    assert [entry["pages"] for entry in result["inputs"]] == [1, 1, 2]
+    texts = _page_texts(str(files_dir / "merged.pdf"))
+    assert len(texts) == 4
+    # The free edition extracts the text of the first three pages only
+    for text, expected in zip(texts, ["File 0 page 2", "File 1 page 2", "File 2 page 1"]):
+        assert expected in text
+
+
+def test_hierarchical_merge_reports_failed_intermediate_files(make_pdf, files_dir, monkeypatch):
+    paths = [make_pdf(f"in-{n}.pdf", [f"File {n}"]) for n in range(6)]
+    real_load = pdfdocument.load_document
+
+    def load(filepath, password=None):
+        if filepath.endswith("level1-1.pdf"):
+            raise OSError("disk gone")
+        return real_load(filepath, password)
+
+    monkeypatch.setattr(pdfdocument, "load_document", load)
+    # batch_size 2: three batches, merged into two level files, then the result
+    result = merge_pdfs(paths, "merged.pdf", {"batch_size": 2, "workers": 2})
+
+    assert [entry["file"] for entry in result["inputs"]] == paths[:4]
+    assert [entry["file"] for entry in result["skipped"]] == paths[4:]
+    assert all("disk gone" in entry["error"] for entry in result["skipped"])
+    assert len(_page_texts(str(files_dir / "merged.pdf"))) == 4
+
+
+def test_merge_without_usable_inputs_fails(files_dir):
+    (files_dir / "notes.pdf").write_text("not a pdf")
+    with pytest.raises(pdfdocument.PdfDocumentError, match="None of the input files"):
+        merge_pdfs([str(files_dir / "notes.pdf"), str(files_dir / "missing.pdf")], "merged.pdf")
@@ -0,0 +1,96 @@
+import pytest
+
+from spire_pdf_mcp.utils.metrics import (PHASE_DURATION, REQUESTS_IN_FLIGHT, TOOL_ERRORS, TOOL_REQUESTS,
+                                         Counter, Gauge, Histogram, MetricsRegistry, capture_phases,
+                                         observe_tool, operation_scope, phase, replay_phases)
+
+
+def test_counter_and_gauge_text_format():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("test_calls_total", "Calls, by tool", ("tool",)))
+    gauge = registry.register(Gauge("test_queue_depth", "Queued tasks"))
+    counter.inc(("merge",))
+    counter.inc(("merge",), 2)
+    counter.inc(('say "hi"\\\n',))
+    gauge.set(2.5)
+
+    assert registry.render() == (
+        "# HELP test_calls_total Calls, by tool\n"
+        "# TYPE test_calls_total counter\n"
+        'test_calls_total{tool="merge"} 3\n'
+        'test_calls_total{tool="say \\"hi\\"\\\\\\n"} 1\n'
+        "# HELP test_queue_depth Queued tasks\n"
+        "# TYPE test_queue_depth gauge\n"
+        "test_queue_depth 2.5\n"
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_seconds", "Latency", ("tool",), buckets=(0.5, 0.1, 1.0))
+    for value in (0.05, 0.2, 0.3, 3.0):
+        histogram.observe(value, ("split",))
+
+    assert histogram.render().splitlines() == [
+        "# HELP test_seconds Latency",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{tool="split",le="0.1"} 1',
+        'test_seconds_bucket{tool="split",le="0.5"} 3',
+        'test_seconds_bucket{tool="split",le="1"} 3',
+        'test_seconds_bucket{tool="split",le="+Inf"} 4',
+        'test_seconds_sum{tool="split"} 3.55',
+        'test_seconds_count{tool="split"} 4',
+    ]
+    assert histogram.count(("split",)) == 4
+
+
+def test_gauge_collect_and_label_checks():
+    gauge = Gauge("test_rss_bytes", "Memory", collect=lambda: {(): 1024.0})
+    assert gauge.samples() == ["test_rss_bytes 1024"]
+
+    counter = Counter("test_labelled_total", "Labelled", ("tool",))
+    with pytest.raises(ValueError):
+        counter.inc()
+    registry = MetricsRegistry()
+    registry.register(counter)
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register(Counter("test_labelled_total", "Again"))
+
+
+def test_observe_tool_counts_errors():
+    tool = "test_observe_tool"
+    with observe_tool(tool):
+        assert REQUESTS_IN_FLIGHT.value() >= 1
+    with observe_tool(tool) as outcome:
+        outcome["error"] = True
+    with pytest.raises(RuntimeError):
+        with observe_tool(tool):
+            raise RuntimeError("boom")
+
+    assert TOOL_REQUESTS.value((tool,)) == 3
+    assert TOOL_ERRORS.value((tool,)) == 2
+
+
+def test_phases_are_attributed_to_the_innermost_scope():
+    with operation_scope("test_batch"):
+        with operation_scope("test_item"):
+            with phase("load"):
+                pass
+            with phase("save"):
+                pass
+
+    for name in ("load", "save", "process"):
+        assert PHASE_DURATION.count(("test_item", name)) == 1
+    # A scope that only wraps another records no processing of its own
+    assert PHASE_DURATION.count(("test_batch", "process")) == 0
+
+
+def test_captured_phases_are_replayed():
+    with capture_phases() as captured:
+        with operation_scope("test_worker"):
+            with phase("load"):
+                pass
+    assert [(f, p) for f, p, _ in captured] == [("test_worker", "load"), ("test_worker", "process")]
+    assert PHASE_DURATION.count(("test_worker", "load")) == 0
+
+    replay_phases(captured)
+    assert PHASE_DURATION.count(("test_worker", "load")) == 1
@@ -0,0 +1,135 @@
+import pytest
+from spire.pdf import *
+
+from conftest import write_pdf
+from spire_pdf_mcp.core.bookmarks import bookmark_tree
+from spire_pdf_mcp.core.documentcache import load_document
+from spire_pdf_mcp.core.operations import OPERATIONS, apply_operation, list_operations, operation_params
+from spire_pdf_mcp.core.pipeline import run_pipeline, run_pipeline_data
+from spire_pdf_mcp.utils.exceptions import PipelineError
+
+BOOKMARKS = [{"title": "Intro", "page": 1}, {"title": "Body", "page": 2}]
+
+
+def test_operation_registry():
+    assert list_operations() == sorted(OPERATIONS)
+    for name in ("set_bookmarks", "add_text_watermark", "encrypt_document",
+                 "decrypt_document", "compress_document"):
+        assert name in OPERATIONS
+    assert all(callable(func) for func in OPERATIONS.values())
+
+
+def test_apply_operation_validates(tmp_path):
+    doc = load_document(write_pdf(str(tmp_path / "a.pdf"), ["One"]))
+    try:
+        with pytest.raises(ValueError, match="Unsupported operation"):
+            apply_operation(doc, "rotate_everything")
+        with pytest.raises(ValueError, match="watermark_text"):
+            apply_operation(doc, "add_text_watermark", {})
+        assert apply_operation(doc, "set_bookmarks", {"bookmarks": BOOKMARKS[:1]}) is doc
+        assert [node["title"] for node in bookmark_tree(doc)] == ["Intro"]
+    finally:
+        doc.Close()
+
+
+def test_options_sit_next_to_parameters(tmp_path):
+    doc = load_document(write_pdf(str(tmp_path / "a.pdf"), ["One", "Two"]))
+    try:
+        apply_operation(doc, "set_bookmarks", {"bookmarks": BOOKMARKS[:1]})
+        apply_operation(doc, "set_bookmarks", {"bookmarks": BOOKMARKS[1:], "mode": "append"})
+        assert [node["title"] for node in bookmark_tree(doc)] == ["Intro", "Body"]
+        with pytest.raises(ValueError, match="Unsupported mode"):
+            apply_operation(doc, "set_bookmarks", {"bookmarks": BOOKMARKS, "mode": "merge"})
+        with pytest.raises(ValueError, match="compression profile"):
+            apply_operation(doc, "compress_document", {"profile": "bogus"})
+        # The nested form is still merged in
+        with pytest.raises(ValueError, match="compression profile"):
+            apply_operation(doc, "compress_document", {"options": {"profile": "bogus"}})
+    finally:
+        doc.Close()
+
+
+def test_operation_params():
+    assert operation_params(None) == {}
+    assert operation_params({"watermark_text": "A", "options": {"font_size": 30, "opacity": 0.5},
+                             "opacity": 0.2}) == {"watermark_text": "A", "font_size": 30, "opacity": 0.2}
+    with pytest.raises(ValueError):
+        operation_params({"options": "profile=web"})
+
+
+@pytest.mark.parametrize("steps", [
+    [],
+    [{"options": {}}],
+    [{"operation": "set_bookmarks"}, {"operation": "rotate_everything"}],
+])
+def test_invalid_steps_are_rejected_before_loading(tmp_path, steps):
+    with pytest.raises(PipelineError):
+        run_pipeline(str(tmp_path / "missing.pdf"), str(tmp_path / "out.pdf"), steps)
+
+
+def test_run_pipeline_applies_steps_in_order(tmp_path):
+    source = write_pdf(str(tmp_path / "a.pdf"), ["One", "Two"])
+    output = str(tmp_path / "out" / "result.pdf")
+
+    result = run_pipeline(source, output, [
+        {"operation": "set_bookmarks", "options": {"bookmarks": BOOKMARKS}},
+        {"operation": "add_text_watermark", "options": {"watermark_text": "DRAFT"}},
+        {"operation": "delete_all_bookmarks"},
+        {"operation": "set_bookmarks", "options": {"bookmarks": BOOKMARKS[1:]}},
+    ])
+
+    assert [t["step"] for t in result["timings"]] == [
+        "load", "set_bookmarks", "add_text_watermark", "delete_all_bookmarks", "set_bookmarks", "save"]
+    doc = load_document(output)
+    try:
+        assert doc.Pages.Count == 2
+        assert [(node["title"], node["page"]) for node in bookmark_tree(doc)] == [("Body", 2)]
+    finally:
+        doc.Close()
+
+
+def test_trailing_compress_saves_directly(tmp_path):
+    source = write_pdf(str(tmp_path / "a.pdf"), ["One"])
+    output = str(tmp_path / "small.pdf")
+
+    result = run_pipeline(source, output, [
+        {"operation": "set_bookmarks", "options": {"bookmarks": BOOKMARKS[:1]}},
+        {"operation": "compress_document"},
+    ])
+
+    assert [t["step"] for t in result["timings"]] == ["load", "set_bookmarks", "compress_document+save"]
+    doc = load_document(output)
+    try:
+        assert [node["title"] for node in bookmark_tree(doc)] == ["Intro"]
+    finally:
+        doc.Close()
+
+
+def test_run_pipeline_data_round_trip(tmp_path):
+    with open(write_pdf(str(tmp_path / "a.pdf"), ["One", "Two"]), "rb") as f:
+        data = f.read()
+
+    result = run_pipeline_data(data, [{"operation": "set_bookmarks", "options": {"bookmarks": BOOKMARKS}}])
+
+    assert result["data"].startswith(b"%PDF")
+    with open(tmp_path / "out.pdf", "wb") as f:
+        f.write(result["data"])
+    doc = load_document(str(tmp_path / "out.pdf"))
+    try:
+        assert [node["title"] for node in bookmark_tree(doc)] == ["Intro", "Body"]
+    finally:
+        doc.Close()
+
+
+@pytest.mark.parametrize("position", ["middle", "last"])
+def test_compress_options_are_applied_in_any_position(tmp_path, position):
+    source = write_pdf(str(tmp_path / "a.pdf"), ["One"])
+    steps = [{"operation": "compress_document", "options": {"profile": "bogus"}}]
+    if position == "middle":
+        steps.append({"operation": "delete_all_bookmarks"})
+
+    with pytest.raises(PipelineError, match="compression profile"):
+        run_pipeline(source, str(tmp_path / "out.pdf"), steps)
+    with open(source, "rb") as f:
+        with pytest.raises(PipelineError, match="compression profile"):
+            run_pipeline_data(f.read(), steps)
@@ -0,0 +1,144 @@
+import os
+
+import pytest
+
+from spire_pdf_mcp.core.search import SearchIndex, refresh_search_index, search_text, tokenize
+
+
+@pytest.fixture
+def index(files_dir):
+    return SearchIndex(str(files_dir), str(files_dir / ".index.sqlite"))
+
+
+def _touch(path, offset_ns: int) -> None:
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + offset_ns))
+
+
+def test_tokenize():
+    assert tokenize("Hello, World-wide 2024") == ["hello", "world", "wide", "2024"]
+    assert tokenize("中文") == ["中", "文"]
+
+
+def test_search_after_refresh(index, make_pdf):
+    make_pdf("a.pdf", ["alpha bravo", "charlie"])
+    make_pdf("sub/b.pdf", ["bravo delta"])
+
+    assert index.refresh(force=True) == {"indexed": 2, "removed": 0, "failed": 0}
+
+    assert index.search("bravo") == [
+        {"file": "a.pdf", "pages": [1], "hits": 1},
+        {"file": os.path.join("sub", "b.pdf"), "pages": [1], "hits": 1},
+    ]
+    assert [r["file"] for r in index.search("alpha bravo")] == ["a.pdf"]
+    assert index.search("charlie")[0]["pages"] == [2]
+    assert index.search("missing") == []
+
+
+def test_refresh_is_incremental(index, make_pdf, files_dir):
+    make_pdf("a.pdf", ["alpha"])
+    make_pdf("b.pdf", ["bravo"])
+    index.refresh(force=True)
+
+    assert index.refresh(force=True) == {"indexed": 0, "removed": 0, "failed": 0}
+
+    # A changed file is re-indexed, a deleted one dropped
+    make_pdf("a.pdf", ["echo"])
+    _touch(files_dir / "a.pdf", 1_000_000_000)
+    os.remove(files_dir / "b.pdf")
+    assert index.refresh(force=True) == {"indexed": 1, "removed": 1, "failed": 0}
+    assert index.search("alpha") == []
+    assert index.search("bravo") == []
+    assert [r["file"] for r in index.search("echo")] == ["a.pdf"]
+
+
+def test_refresh_interval(index, make_pdf, monkeypatch):
+    monkeypatch.setattr("spire_pdf_mcp.core.search.SEARCH_REFRESH_INTERVAL", 3600)
+    make_pdf("a.pdf", ["alpha"])
+    index.refresh()
+    make_pdf("b.pdf", ["alpha"])
+
+    assert index.refresh() == {"indexed": 0, "removed": 0, "failed": 0}
+    assert index.refresh(force=True)["indexed"] == 1
+
+
+def test_failed_files_are_not_retried_until_changed(index, make_pdf, files_dir, caplog):
+    make_pdf("good.pdf", ["alpha"])
+    broken = files_dir / "broken.pdf"
+    broken.write_bytes(b"%PDF-1.4\nnot really a pdf\n")
+
+    assert index.refresh(force=True) == {"indexed": 1, "removed": 0, "failed": 1}
+    failures = index.failures()
+    assert [f["file"] for f in failures] == ["broken.pdf"]
+    # Only the first line of the native error is kept
+    assert "\n" not in failures[0]["error"]
+
+    caplog.clear()
+    assert index.refresh(force=True) == {"indexed": 0, "removed": 0, "failed": 0}
+    assert not [r for r in caplog.records if "broken.pdf" in r.getMessage()]
+
+    # Fixing the file gets it indexed and clears the failure
+    make_pdf("broken.pdf", ["repaired"])
+    _touch(broken, 1_000_000_000)
+    assert index.refresh(force=True) == {"indexed": 1, "removed": 0, "failed": 0}
+    assert index.failures() == []
+    assert [r["file"] for r in index.search("repaired")] == ["broken.pdf"]
+
+
+def test_search_text_reports_failures(make_pdf, files_dir, monkeypatch):
+    monkeypatch.setenv("PDF_SEARCH_INDEX_PATH", str(files_dir / ".search.sqlite"))
+    make_pdf("a.pdf", ["alpha"])
+    (files_dir / "broken.pdf").write_bytes(b"%PDF-1.4\n")
+
+    result = search_text(str(files_dir), "alpha", {"refresh": True})
+
+    assert [r["file"] for r in result["results"]] == ["a.pdf"]
+    assert [f["file"] for f in result["failed"]] == ["broken.pdf"]
+    assert "1 files could not be indexed: broken.pdf" in result["message"]
+
+
+def test_search_text_does_not_index_inline(make_pdf, files_dir, monkeypatch):
+    monkeypatch.setenv("PDF_SEARCH_INDEX_PATH", str(files_dir / ".search.sqlite"))
+    make_pdf("a.pdf", ["alpha"])
+
+    result = search_text(str(files_dir), "alpha")
+    assert result["results"] == []
+    assert result["stale"]
+    assert "updated in the background" in result["message"]
+
+    updated = refresh_search_index(str(files_dir))
+    assert updated["indexed"] == 1
+    result = search_text(str(files_dir), "alpha")
+    assert [r["file"] for r in result["results"]] == ["a.pdf"]
+    assert not result["stale"]
+
+
+def test_refresh_search_index_respects_interval(make_pdf, files_dir, monkeypatch):
+    monkeypatch.setenv("PDF_SEARCH_INDEX_PATH", str(files_dir / ".search.sqlite"))
+    monkeypatch.setattr("spire_pdf_mcp.core.search.SEARCH_REFRESH_INTERVAL", 3600)
+    refresh_search_index(str(files_dir))
+    make_pdf("a.pdf", ["alpha"])
+
+    assert refresh_search_index(str(files_dir), {"force": False})["indexed"] == 0
+    assert refresh_search_index(str(files_dir))["indexed"] == 1
+
+
+def test_concurrent_writers_upsert_file_rows(index, make_pdf, files_dir):
+    # Another process indexing the same file between our scan and our write
+    make_pdf("a.pdf", ["alpha"])
+    other = SearchIndex(str(files_dir), index.path)
+    st = os.stat(files_dir / "a.pdf")
+    conn = index._connect()
+    other_conn = other._connect()
+    try:
+        other._index_file(other_conn, "a.pdf", st.st_size, st.st_mtime_ns)
+        index._index_file(conn, "a.pdf", st.st_size, st.st_mtime_ns)
+        assert [r["file"] for r in index.search("alpha")] == ["a.pdf"]
+
+        other._record_failure(other_conn, "a.pdf", st.st_size, st.st_mtime_ns, "locked")
+        assert index.search("alpha") == []
+        assert index.failures() == [{"file": "a.pdf", "error": "locked"}]
+        assert conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 1
+    finally:
+        conn.close()
+        other_conn.close()
@@ -0,0 +1,36 @@
+import os
+
+from spire_pdf_mcp.core.documentcache import load_document
+from spire_pdf_mcp.core.security import encryptbatch
+
+
+def test_encrypt_batch_numbers_duplicate_names(make_pdf, files_dir):
+    source = make_pdf("doc.pdf", ["Secret"])
+    recipients = [
+        {"name": "Bob", "userpsw": "p1"},
+        {"name": "bob", "userpsw": "p2"},
+        {"name": "Bob-2", "userpsw": "p3"},
+        {"name": "Ann", "userpsw": "p4"},
+    ]
+
+    result = encryptbatch(source, recipients, {"ownerpsw": "owner"})
+
+    names = [os.path.basename(r["file"]) for r in result["recipients"]]
+    assert names == ["doc-Bob.pdf", "doc-bob-2.pdf", "doc-Bob-2-2.pdf", "doc-Ann.pdf"]
+    assert "2 duplicate file names were numbered" in result["message"]
+    for recipient, entry in zip(recipients, result["recipients"]):
+        doc = load_document(entry["file"], recipient["userpsw"])
+        try:
+            assert doc.Pages.Count == 1
+        finally:
+            doc.Close()
+
+
+def test_encrypt_batch_numbers_unnamed_recipients(make_pdf, files_dir):
+    source = make_pdf("doc.pdf", ["Secret"])
+
+    result = encryptbatch(source, ["a", "b"], {"ownerpsw": "owner", "output_dir": "out"})
+
+    assert [os.path.basename(f) for f in result["files"]] == ["doc-1.pdf", "doc-2.pdf"]
+    assert result["output_path"] == os.path.join(str(files_dir), "out")
+    assert "numbered" not in result["message"]
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+from spire.pdf import *
+
+from spire_pdf_mcp.core.pdfdocument import splitdocument
+
+
+def _page_counts(paths):
+    counts = []
+    for path in paths:
+        doc = PdfDocument()
+        doc.LoadFromFile(path)
+        counts.append(doc.Pages.Count)
+        doc.Close()
+    return counts
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_split_ranges(make_pdf, workers):
+    source = make_pdf("doc.pdf", [f"Page {n}" for n in range(1, 9)])
+
+    result = splitdocument(source, {"ranges": "1-3;4-5;6-", "workers": workers})
+
+    files = [part["file"] for part in result["parts"]]
+    assert [os.path.basename(f) for f in files] == ["doc-part1.pdf", "doc-part2.pdf", "doc-part3.pdf"]
+    assert _page_counts(files) == [3, 2, 3]
+
+
+def test_split_every_into_output_dir(make_pdf, files_dir):
+    source = make_pdf("doc.pdf", [f"Page {n}" for n in range(1, 8)])
+
+    result = splitdocument(source, {"every": 3, "output_dir": "parts", "workers": 2})
+
+    assert result["output_path"] == str(files_dir / "parts")
+    assert _page_counts(part["file"] for part in result["parts"]) == [3, 3, 1]
+
+
+def test_split_at_bookmarks_sanitises_titles(files_dir):
+    doc = PdfDocument()
+    font = PdfFont(PdfFontFamily.Helvetica, 14.0)
+    for n in range(4):
+        doc.Pages.Add().Canvas.DrawString(f"Page {n + 1}", font, PdfBrushes.get_Black(), 40.0, 40.0)
+    for title, page in (("Intro: a/b", 1), ("Appendix", 3)):
+        bookmark = doc.Bookmarks.Add(title)
+        bookmark.Destination = PdfDestination(doc.Pages.get_Item(page))
+    doc.SaveToFile(str(files_dir / "book.pdf"))
+    doc.Close()
+
+    result = splitdocument(str(files_dir / "book.pdf"), {"at_bookmarks": True})
+
+    assert [os.path.basename(part["file"]) for part in result["parts"]] == [
+        "book-1-front.pdf", "book-2-Intro_a_b.pdf", "book-3-Appendix.pdf"]
+    assert [part["pages"] for part in result["parts"]] == [1, 2, 1]
+
+
+def test_split_rejects_two_specs(make_pdf):
+    source = make_pdf("doc.pdf", ["Page 1", "Page 2"])
+
+    with pytest.raises(Exception, match="only one of"):
+        splitdocument(source, {"ranges": "1", "every": 1})
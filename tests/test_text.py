@@ -0,0 +1,50 @@
+import pytest
+
+from spire_pdf_mcp.core.text import page_targets, replacement_pairs
+
+
+def test_replacement_pairs_order():
+    assert replacement_pairs("ACME", "Contoso", {"replacements": {"2023": "2024", "draft": None}}) == [
+        ("ACME", "Contoso"), ("2023", "2024"), ("draft", "")]
+    assert replacement_pairs(None, None, {"replacements": [["a", "b"], ("c", 1)]}) == [("a", "b"), ("c", "1")]
+    assert replacement_pairs("gone", None) == [("gone", "")]
+
+
+def test_replacement_pairs_rejects_nothing_to_do():
+    with pytest.raises(ValueError, match="Nothing to replace"):
+        replacement_pairs(None, "x")
+    with pytest.raises(ValueError, match="must not be empty"):
+        replacement_pairs(None, None, {"replacements": {"": "x"}})
+
+
+def test_page_targets_skips_absent_targets():
+    pairs = [("ACME", "Contoso"), ("2023", "2024")]
+    assert page_targets("ACME  Corp\nannual report", pairs, "whole_word") == [("ACME", "Contoso")]
+    assert page_targets("nothing here", pairs, "exact") == []
+    # Extraction reflows whitespace
+    assert page_targets("ACME\n  Corp", [("ACME Corp", "X")], "exact") == [("ACME Corp", "X")]
+
+
+def test_page_targets_ignore_case():
+    assert page_targets("Acme corp", [("ACME", "x")], "ignore_case") == [("ACME", "x")]
+    assert page_targets("Acme corp", [("ACME", "x")], "exact") == []
+
+
+def test_page_targets_keeps_every_pair_when_text_cannot_tell():
+    pairs = [("A+", "B")]
+    assert page_targets("nothing", pairs, "regex") == pairs
+    assert page_targets("  \n", pairs, "exact") == pairs
+
+
+@pytest.mark.parametrize("text", ["only A", "A and B"])
+def test_page_targets_follow_chained_pairs(text):
+    pairs = [("A", "B"), ("B", "C")]
+    assert page_targets(text, pairs, "exact") == pairs
+
+
+def test_page_targets_chain_through_removed_text():
+    pairs = [("draft ", ""), ("final report", "report")]
+    assert page_targets("final draft report", pairs, "exact") == pairs
+    # A whole word replacement does not hide a longer word from later pairs
+    pairs = [("cat", "dog"), ("category", "kind")]
+    assert page_targets("category", pairs, "whole_word") == pairs
@@ -0,0 +1,42 @@
+import re
+
+import pytest
+from spire.pdf import *
+
+from spire_pdf_mcp.core.pdfdocument import add_text_watermark, watermark_settings
+
+
+def _count(data: bytes, pattern: bytes) -> int:
+    return len(re.findall(pattern, data))
+
+
+def test_watermark_is_one_shared_xobject(make_pdf, files_dir):
+    source = make_pdf("doc.pdf", [f"Page {n}" for n in range(1, 9)])
+
+    add_text_watermark(source, "marked.pdf", "CONFIDENTIAL")
+
+    data = (files_dir / "marked.pdf").read_bytes()
+    assert _count(data, rb"/PatternType") == 0
+    assert _count(data, rb"/Subtype\s*/Form") == 1
+
+
+def test_watermark_template_per_page_size(files_dir):
+    doc = PdfDocument()
+    font = PdfFont(PdfFontFamily.Helvetica, 14.0)
+    for size in (PdfPageSize.A4(), PdfPageSize.A4(), SizeF(800.0, 400.0)):
+        doc.Pages.Add(size).Canvas.DrawString("Page", font, PdfBrushes.get_Black(), 40.0, 40.0)
+    doc.SaveToFile(str(files_dir / "mixed.pdf"))
+    doc.Close()
+
+    add_text_watermark(str(files_dir / "mixed.pdf"), "mixed-marked.pdf", "DRAFT")
+
+    data = (files_dir / "mixed-marked.pdf").read_bytes()
+    assert _count(data, rb"/Subtype\s*/Form") == 2
+
+
+def test_watermark_settings_validation():
+    assert watermark_settings()["opacity"] == 0.3
+    with pytest.raises(ValueError):
+        watermark_settings({"opacity": 1.5})
+    with pytest.raises(ValueError):
+        watermark_settings({"columns": 0})